@@ -0,0 +1,45 @@
+"""add partial index for expired reservation cleanup
+
+Revision ID: b7e2c9d41a3f
+Revises: a1b2c3d4e5f6
+Create Date: 2026-10-15 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e2c9d41a3f'
+down_revision: Union[str, Sequence[str], None] = 'a1b2c3d4e5f6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema: add partial index on expired_at for RESERVED rows."""
+    # 清理任务按 status='RESERVED' AND expired_at <= now() ORDER BY expired_at 扫描
+    # CONCURRENTLY 建索引不阻塞写入，但不能在事务内执行
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'idx_reservation_expired_active',
+            'inventory_reservations',
+            ['expired_at'],
+            unique=False,
+            postgresql_where=sa.text("status = 'RESERVED'"),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema: drop partial index."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'idx_reservation_expired_active',
+            table_name='inventory_reservations',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
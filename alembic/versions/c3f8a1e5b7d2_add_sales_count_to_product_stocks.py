@@ -0,0 +1,32 @@
+"""add sales_count to product_stocks
+
+Revision ID: c3f8a1e5b7d2
+Revises: b7e2c9d41a3f
+Create Date: 2026-10-15 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3f8a1e5b7d2'
+down_revision: Union[str, Sequence[str], None] = 'b7e2c9d41a3f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema: add sales_count column."""
+    # 带常量默认值的 NOT NULL 列在 PostgreSQL 11+ 只改元数据，不重写表
+    op.add_column(
+        'product_stocks',
+        sa.Column('sales_count', sa.Integer(), server_default='0', nullable=False, comment='累计销量（确认出库数量）'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema: drop sales_count column."""
+    op.drop_column('product_stocks', 'sales_count')
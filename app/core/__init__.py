@@ -1,7 +1,7 @@
 """核心模块"""
 
 from app.core.config import settings
-from app.core.redis import redis_client, async_redis, sync_redis, REDIS_URL
+from app.core.redis import redis_client, async_redis, sync_redis, redis_lock, FastLock, REDIS_URL
 from app.core.aspects import (
     performance_monitor,
     log_operation,
@@ -18,6 +18,8 @@ __all__ = [
     "redis_client",
     "async_redis",
     "sync_redis",
+    "redis_lock",
+    "FastLock",
     "REDIS_URL",
     "performance_monitor",
     "log_operation",
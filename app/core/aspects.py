@@ -166,11 +166,7 @@ class CacheInvalidationAspect:
         if not self.cache_service or not items:
             return
         
-        for item in items:
-            warehouse_id = item.get("warehouse_id")
-            product_id = item.get("product_id")
-            if warehouse_id and product_id:
-                self.cache_service.invalidate_cache(warehouse_id, product_id)
+        self.cache_service.invalidate_caches(items)
     
     def invalidate_by_order(self, reservations: List[Any]):
         """根据预占记录批量失效缓存
@@ -181,11 +177,13 @@ class CacheInvalidationAspect:
         if not self.cache_service or not reservations:
             return
         
-        for r in reservations:
-            warehouse_id = getattr(r, 'warehouse_id', None)
-            product_id = getattr(r, 'product_id', None)
-            if warehouse_id and product_id:
-                self.cache_service.invalidate_cache(warehouse_id, product_id)
+        self.cache_service.invalidate_caches([
+            {
+                "warehouse_id": getattr(r, 'warehouse_id', None),
+                "product_id": getattr(r, 'product_id', None),
+            }
+            for r in reservations
+        ])
 
 
 class TransactionAspect:
@@ -0,0 +1,175 @@
+"""库存缓存失效通知模块
+
+基于 Redis 键空间通知（notify-keyspace-events）：Lua 脚本扣减、Kafka 消费者回写、
+启动预热、UNLINK 失效等任何对 stock:available:* 的写入都由 Redis 自己发布事件，
+不依赖业务代码在写入后手工广播，也就不存在"写入成功但进程崩溃、失效消息没发出"的窗口。
+
+每个 worker 订阅一次，收到事件后回调已注册的监听器（如进程内缓存）丢弃对应键。
+同一窗口内的事件按键去重后统一分发：单个商品连续写入只触发一次失效，
+避免每次写入后都让读请求穿透到 Redis。
+
+只有确认键空间通知已开启、且订阅已建立时才通知状态监听器"失效通知可用"；
+CONFIG 被禁用、订阅断开或进程内没有订阅者（如 Celery worker）时，依赖失效通知的缓存应直接绕过。
+"""
+
+import asyncio
+import logging
+from typing import Callable, List, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+STOCK_KEY_PREFIX = "stock:available:"
+
+# K: 键空间通道  $: 字符串命令（SET/INCRBY/DECRBY/MSET）  g: 通用命令（DEL/UNLINK/EXPIRE）  x: 过期
+KEYSPACE_EVENT_FLAGS = "K$gx"
+
+# 失效事件合并窗口（秒），0 表示逐条立即分发
+INVALIDATION_COALESCE_WINDOW = settings.STOCK_L1_INVALIDATION_COALESCE_MS / 1000.0
+
+# 订阅通道前缀：__keyspace@<db>__:<key>
+_KEYSPACE_CHANNEL_PREFIX = f"__keyspace@{settings.REDIS_DB}__:"
+
+# 监听器：参数为失效的缓存键；None 表示订阅刚建立/重连，期间可能漏掉事件，需要整体清空
+_listeners: List[Callable[[Optional[str]], None]] = []
+
+# 订阅状态监听器：参数为 True 表示订阅已建立、失效通知可用；False 表示订阅断开
+_state_listeners: List[Callable[[bool], None]] = []
+
+# 键空间通知是否已确认开启（enable_keyspace_notifications 成功后置位）
+_notifications_enabled = False
+
+
+def register_invalidation_listener(callback: Callable[[Optional[str]], None]):
+    """注册缓存失效监听器"""
+    _listeners.append(callback)
+
+
+def register_subscription_listener(callback: Callable[[bool], None]):
+    """注册订阅状态监听器（失效通知可用 / 不可用时回调）"""
+    _state_listeners.append(callback)
+
+
+def has_invalidation_listeners() -> bool:
+    """是否有已注册的监听器"""
+    return bool(_listeners)
+
+
+def enable_keyspace_notifications(client) -> bool:
+    """在现有配置基础上开启库存键所需的键空间通知
+
+    托管 Redis 可能禁用 CONFIG 命令，此时无法确认通知是否开启，失效通知订阅不会启动。
+    """
+    global _notifications_enabled
+    try:
+        current = client.config_get("notify-keyspace-events").get("notify-keyspace-events", "")
+        merged = "".join(dict.fromkeys(current + KEYSPACE_EVENT_FLAGS))
+        if set(merged) != set(current):
+            client.config_set("notify-keyspace-events", merged)
+        logger.info("Redis 键空间通知已开启: %s", merged)
+        _notifications_enabled = True
+        return True
+    except Exception as e:
+        logger.warning("开启 Redis 键空间通知失败（需在服务端配置 notify-keyspace-events=%s）: %s", KEYSPACE_EVENT_FLAGS, e)
+        _notifications_enabled = False
+        return False
+
+
+def _dispatch(key: Optional[str]):
+    """通知所有监听器，单个监听器异常不影响其他监听器"""
+    for callback in _listeners:
+        try:
+            callback(key)
+        except Exception as e:
+            logger.warning("缓存失效监听器执行失败: %s", e)
+
+
+def _notify_state(active: bool):
+    """通知所有订阅状态监听器"""
+    for callback in _state_listeners:
+        try:
+            callback(active)
+        except Exception as e:
+            logger.warning("订阅状态监听器执行失败: %s", e)
+
+
+async def run_invalidation_subscriber(
+    client=None,
+    retry_delay: float = 1.0,
+    coalesce_window: float = INVALIDATION_COALESCE_WINDOW,
+):
+    """订阅库存键的键空间通知并分发给监听器（后台任务，断线自动重连）
+
+    Args:
+        client: 异步 Redis 客户端，默认使用全局 async_redis
+        retry_delay: 断线重连间隔（秒）
+        coalesce_window: 失效事件合并窗口（秒），窗口内同一个键只分发一次
+    """
+    if not _listeners:
+        logger.info("没有缓存失效监听器，跳过键空间通知订阅")
+        return
+
+    if not _notifications_enabled:
+        logger.warning("键空间通知未确认开启，跳过失效订阅，进程内缓存保持关闭")
+        return
+
+    if client is None:
+        from app.core.redis import async_redis
+        client = async_redis
+
+    pattern = f"{_KEYSPACE_CHANNEL_PREFIX}{STOCK_KEY_PREFIX}*"
+    prefix_length = len(_KEYSPACE_CHANNEL_PREFIX)
+    loop = asyncio.get_running_loop()
+
+    while True:
+        pubsub = client.pubsub(ignore_subscribe_messages=True)
+        pending = set()  # 当前窗口内待分发的键
+        flush_at = None  # 当前窗口的分发时间
+        try:
+            await pubsub.psubscribe(pattern)
+            # 订阅建立前的变更收不到通知，先整体清空，再启用依赖失效通知的缓存
+            _dispatch(None)
+            _notify_state(True)
+            logger.info("已订阅库存缓存失效通知: %s", pattern)
+
+            while True:
+                # 显式传入 timeout，避免空闲时触发连接池的 socket_timeout
+                timeout = 1.0 if flush_at is None else max(flush_at - loop.time(), 0.0)
+                message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=timeout)
+                if message:
+                    key = message["channel"][prefix_length:]
+                    if coalesce_window <= 0:
+                        _dispatch(key)
+                    else:
+                        pending.add(key)
+                        if flush_at is None:
+                            flush_at = loop.time() + coalesce_window
+
+                if flush_at is not None and loop.time() >= flush_at:
+                    for key in pending:
+                        _dispatch(key)
+                    pending.clear()
+                    flush_at = None
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning("缓存失效订阅中断，%s 秒后重连: %s", retry_delay, e)
+            await asyncio.sleep(retry_delay)
+        finally:
+            # 断开期间收不到失效通知，先停用依赖它的缓存，重新订阅后再启用
+            _notify_state(False)
+            try:
+                await pubsub.aclose()
+            except Exception:
+                pass
+
+
+__all__ = [
+    "STOCK_KEY_PREFIX",
+    "register_invalidation_listener",
+    "register_subscription_listener",
+    "has_invalidation_listeners",
+    "enable_keyspace_notifications",
+    "run_invalidation_subscriber",
+]
@@ -2,47 +2,82 @@ import os
 import re
 from dotenv import load_dotenv
 import socket
-from pydantic_settings import BaseSettings
-from pydantic import field_validator
+from typing import List
+from pydantic_settings import BaseSettings, SettingsConfigDict
+from pydantic import Field, field_validator
 
-# 加载 .env 文件
-load_dotenv()
+# 项目根目录下的 .env 文件
+ENV_FILE = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '.env'))
+
+# 加载 .env 文件（Kafka、日志等模块仍通过 os.getenv 读取配置）
+load_dotenv(ENV_FILE)
 
 class Settings(BaseSettings):
+    """应用配置（由 pydantic-settings 统一从环境变量和 .env 读取，全局只构建一次）"""
+
+    model_config = SettingsConfigDict(
+        env_file=ENV_FILE,
+        env_file_encoding="utf-8",
+        extra="ignore",
+    )
+
     # 应用配置
-    HOST: str = os.getenv("HOST", "0.0.0.0")
-    PORT: int = int(os.getenv("PORT", "8000"))
-    DEBUG: bool = os.getenv("DEBUG", "False").lower() == "true"
+    HOST: str = "0.0.0.0"
+    PORT: int = 8000
+    DEBUG: bool = False
+    ENABLE_DOCS: bool = True  # 是否开放 /docs、/redoc 与 /openapi.json
+    UVICORN_WORKERS: int = 0  # worker 进程数，0 表示按 CPU 核心数自动设置
     
     # 数据库配置（从环境变量读取）
     # ⚠️ Docker 环境：POSTGRES_HOST 默认为 "db"（Docker 服务名）
     # ⚠️ 本地环境：在 .env 文件中设置 POSTGRES_HOST=localhost
-    POSTGRES_USER: str = os.getenv("POSTGRES_USER", "postgres")
-    POSTGRES_PASSWORD: str = os.getenv("POSTGRES_PASSWORD")  # 必须从环境变量读取，不提供默认值
-    POSTGRES_HOST: str = os.getenv("POSTGRES_HOST", "db")  # Docker 环境默认使用 db
-    POSTGRES_PORT: int = int(os.getenv("POSTGRES_PORT", "5432"))
-    POSTGRES_DB: str = os.getenv("POSTGRES_DB", "mydb")
+    POSTGRES_USER: str = "postgres"
+    POSTGRES_PASSWORD: str = Field(default="", validate_default=True)  # 必须从环境变量读取，不提供默认值
+    POSTGRES_HOST: str = "db"  # Docker 环境默认使用 db
+    POSTGRES_PORT: int = 5432
+    POSTGRES_DB: str = "mydb"
     
     # Redis 配置（从环境变量读取）
     # ⚠️ Docker 环境：REDIS_HOST 默认为 "redis"（Docker 服务名）
     # ⚠️ 本地环境：在 .env 文件中设置 REDIS_HOST=localhost
-    REDIS_HOST: str = os.getenv("REDIS_HOST", "redis")  # Docker 环境默认使用 redis
-    REDIS_PORT: int = int(os.getenv("REDIS_PORT", "6379"))
-    REDIS_DB: int = int(os.getenv("REDIS_DB", "0"))
-    REDIS_PASSWORD: str = os.getenv("REDIS_PASSWORD", "")  # Redis 密码（可选）
+    REDIS_HOST: str = "redis"  # Docker 环境默认使用 redis
+    REDIS_PORT: int = 6379
+    REDIS_DB: int = 0
+    REDIS_PASSWORD: str = ""  # Redis 密码（可选）
     
     # 限流配置
-    RATE_LIMIT_REQUESTS_PER_SECOND: int = int(os.getenv("RATE_LIMIT_REQUESTS_PER_SECOND", "50"))
-    RATE_LIMIT_BURST_SIZE: int = int(os.getenv("RATE_LIMIT_BURST_SIZE", "100"))
-    RATE_LIMIT_ENABLED: bool = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
+    RATE_LIMIT_REQUESTS_PER_SECOND: int = 50
+    RATE_LIMIT_BURST_SIZE: int = 100
+    RATE_LIMIT_ENABLED: bool = True
+    
+    # CORS 配置：允许的域名列表，逗号分隔
+    # 示例：ALLOWED_ORIGINS="https://example.com,https://app.example.com"
+    ALLOWED_ORIGINS: str = ""
     
     # pgAdmin 配置
-    PGADMIN_EMAIL: str = os.getenv("PGADMIN_EMAIL", "admin@example.com")
-    PGADMIN_PASSWORD: str = os.getenv("PGADMIN_PASSWORD", "")  # 可选配置
+    PGADMIN_EMAIL: str = "admin@example.com"
+    PGADMIN_PASSWORD: str = ""  # 可选配置
+    
+    # 数据库连接池配置（单进程值，总连接数 = workers × (pool_size + max_overflow)，需小于 Postgres max_connections）
+    DB_POOL_SIZE: int = 20  # 常驻连接数
+    DB_MAX_OVERFLOW: int = 10  # 突发时额外连接数
+    DB_POOL_TIMEOUT: int = 10  # 获取连接超时（秒），快速失败而不是堆积请求
+    DB_POOL_RECYCLE: int = 1800  # 连接回收时间（秒）
+    DB_POOL_PRE_PING: bool = False  # 每次取连接前 SELECT 1（排查断连问题时开启，平时依赖 recycle + 后台保活）
+    DB_KEEPALIVE_INTERVAL: int = 60  # 后台保活 SELECT 1 间隔（秒）
     
-    # 数据库连接池配置
-    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "10"))  # 默认 10，根据 worker 数动态调整
-    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "20"))  # 默认 20
+    # Redis 连接池配置
+    REDIS_POOL_SIZE: int = 50  # 连接池大小
+    REDIS_POOL_MAX_OVERFLOW: int = 50  # 最大溢出连接数，限制最大连接总数
+    REDIS_POOL_TIMEOUT: int = 5  # 获取连接超时
+    REDIS_SOCKET_TIMEOUT: float = 5.0  # Socket 超时（秒）
+    REDIS_SOCKET_CONNECT_TIMEOUT: float = 2.0  # 连接超时
+    REDIS_HEALTH_CHECK_INTERVAL: int = 30  # 空闲连接健康检查间隔（秒）
+    
+    # 进程内库存缓存（L1，位于 Redis 之前，由键空间通知失效，TTL 兜底；失效订阅就绪后才启用）
+    STOCK_L1_CACHE_SIZE: int = 10000  # 最大缓存条数，0 表示关闭
+    STOCK_L1_CACHE_TTL: float = 30.0  # 过期时间（秒），失效通知丢失时的最长陈旧时间
+    STOCK_L1_INVALIDATION_COALESCE_MS: int = 250  # 失效事件合并窗口（毫秒），0 表示逐条立即失效
     
     @field_validator('POSTGRES_PASSWORD')
     @classmethod
@@ -62,13 +97,24 @@ class Settings(BaseSettings):
         # 允许空字符串
         return v if v else ""
     
-        @field_validator('REDIS_PASSWORD')
-        @classmethod
-        def validate_redis_password(cls, v):
-            """验证 Redis 密码（可选）"""
-            # 允许空字符串
-            return v if v else ""
+    @field_validator('REDIS_PASSWORD')
+    @classmethod
+    def validate_redis_password(cls, v):
+        """验证 Redis 密码（可选）"""
+        # 允许空字符串
+        return v if v else ""
         
+    @property
+    def cors_origins(self) -> List[str]:
+        """CORS 允许的域名列表
+        
+        未配置时：调试模式允许所有，生产环境使用安全的默认域名。
+        """
+        origins = [origin.strip() for origin in self.ALLOWED_ORIGINS.split(",") if origin.strip()]
+        if origins:
+            return origins
+        return ["*"] if self.DEBUG else ["https://example.com"]
+
     @property
     def database_url(self) -> str:
         return (
@@ -78,6 +124,16 @@ class Settings(BaseSettings):
             f"{self.POSTGRES_DB}"
         )
 
+    @property
+    def async_database_url(self) -> str:
+        """异步数据库连接地址（asyncpg 驱动，供 HTTP 接口使用）"""
+        return (
+            f"postgresql+asyncpg://"
+            f"{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}"
+            f"@{self.POSTGRES_HOST}:{self.POSTGRES_PORT}/"
+            f"{self.POSTGRES_DB}"
+        )
+
 settings = Settings()
 
 def is_port_available(host: str, port: int) -> bool:
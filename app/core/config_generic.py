@@ -9,7 +9,7 @@
 import os
 import importlib
 from typing import Dict, Any, Optional, List
-from pydantic_settings import BaseSettings
+from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import Field
 
 
@@ -87,9 +87,7 @@ class GenericConfig(BaseSettings):
     # 日志级别
     LOG_LEVEL: str = "INFO"
     
-    class Config:
-        env_file = ".env"
-        extra = "ignore"
+    model_config = SettingsConfigDict(env_file=".env", extra="ignore")
 
 
 # ==================== 内置模型配置示例 ====================
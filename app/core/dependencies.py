@@ -1,12 +1,17 @@
 """依赖注入配置模块 - Redis 优先架构"""
 
+from functools import lru_cache
+
 from fastapi import Depends
 
 # Redis 依赖
 from app.core.redis import redis_client, async_redis
 
 # 数据库依赖（仅用于日志查询、历史记录等特定场景）
-from app.db.session import SessionLocal
+from app.db.session import AsyncSessionLocal
+
+from app.services.inventory_service import InventoryService
+from app.services.inventory_query import AsyncInventoryQueryService
 
 
 def get_redis():
@@ -18,14 +23,27 @@ def get_async_redis():
     return async_redis
 
 
-def get_db():
-    """获取数据库会话（仅用于日志查询等特定场景）
+@lru_cache(maxsize=1)
+def get_inventory_service() -> InventoryService:
+    """获取库存服务单例
+    
+    InventoryService 及其子服务均为无状态对象（只持有 Redis 客户端），
+    进程内只创建一次，避免每个请求重复构造。
+    """
+    return InventoryService(redis_client)
+
+
+@lru_cache(maxsize=1)
+def get_async_query_service() -> AsyncInventoryQueryService:
+    """获取异步库存查询服务单例（只持有异步 Redis 客户端）"""
+    return AsyncInventoryQueryService(async_redis)
+
+
+async def get_db():
+    """获取异步数据库会话（仅用于日志查询等特定场景）
     
     注意：正常的库存查询和操作已迁移到纯 Redis 架构，
     此数据库会话仅用于日志查询、历史记录等审计功能。
     """
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
\ No newline at end of file
+    async with AsyncSessionLocal() as db:
+        yield db
\ No newline at end of file
@@ -0,0 +1,32 @@
+"""库存业务错误码
+
+错误码随错误响应一起返回（{"success": false, "message": ..., "code": 1001}），
+调用方和测试按错误码判断错误类型，不依赖提示文案。
+"""
+
+from enum import IntEnum
+
+from fastapi import HTTPException
+
+
+class InventoryErrorCode(IntEnum):
+    """库存业务错误码"""
+    INSUFFICIENT_STOCK = 1001         # 可用库存不足（预占 / 减少 / 冻结）
+    DUPLICATE_RESERVATION = 1002      # 同一订单重复预占同一商品
+    PRODUCT_NOT_FOUND = 1003          # 商品不存在
+    INSUFFICIENT_FROZEN_STOCK = 1004  # 冻结库存不足，无法解冻
+    RESERVATION_NOT_FOUND = 1005      # 订单没有待确认/释放的预占
+
+
+class InventoryError(HTTPException):
+    """携带业务错误码的 HTTP 异常
+
+    detail 仍为提示文案，现有响应格式和按 HTTPException 捕获的代码都不受影响。
+    """
+
+    def __init__(self, status_code: int, code: InventoryErrorCode, detail: str):
+        super().__init__(status_code=status_code, detail=detail)
+        self.code = code
+
+
+__all__ = ["InventoryErrorCode", "InventoryError"]
@@ -1,9 +1,10 @@
 """Kafka 生产者模块 - 用于发送库存变更消息"""
 
 import os
-import json
+import orjson
 import asyncio
 import logging
+import threading
 from typing import Optional
 from datetime import datetime
 from aiokafka import AIOKafkaProducer
@@ -19,6 +20,39 @@ INVENTORY_TOPIC = os.getenv("KAFKA_TOPIC", "inventory-changes")
 _producer: Optional[AIOKafkaProducer] = None
 _kafka_available = False
 
+# 应用主事件循环（生产者绑定在该循环上），由应用启动时注册
+_main_loop: Optional[asyncio.AbstractEventLoop] = None
+# 后台任务引用，防止任务执行完之前被垃圾回收
+_background_tasks = set()
+
+
+def bind_event_loop(loop: asyncio.AbstractEventLoop):
+    """注册应用主事件循环，供线程池中的同步代码投递后台协程"""
+    global _main_loop
+    _main_loop = loop
+
+
+def submit_background(coro):
+    """在后台执行协程，不等待结果
+    
+    - 当前线程有运行中的事件循环：直接创建任务
+    - 线程池线程（如 run_in_threadpool）：投递到应用主事件循环
+    - 没有可用的事件循环（Celery、脚本等）：在新线程中运行
+    """
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        loop = None
+    
+    if loop is not None:
+        task = loop.create_task(coro)
+        _background_tasks.add(task)
+        task.add_done_callback(_background_tasks.discard)
+    elif _main_loop is not None and _main_loop.is_running():
+        asyncio.run_coroutine_threadsafe(coro, _main_loop)
+    else:
+        threading.Thread(target=asyncio.run, args=(coro,), daemon=True).start()
+
 
 async def get_kafka_producer() -> Optional[AIOKafkaProducer]:
     """获取 Kafka 生产者单例"""
@@ -28,7 +62,7 @@ async def get_kafka_producer() -> Optional[AIOKafkaProducer]:
         try:
             _producer = AIOKafkaProducer(
                 bootstrap_servers=KAFKA_BOOTSTRAP_SERVERS,
-                value_serializer=lambda v: json.dumps(v, ensure_ascii=False).encode('utf-8'),
+                value_serializer=lambda v: orjson.dumps(v, option=orjson.OPT_NON_STR_KEYS),
                 key_serializer=lambda k: k.encode('utf-8') if k else None
             )
             await asyncio.wait_for(_producer.start(), timeout=5.0)
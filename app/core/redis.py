@@ -1,20 +1,12 @@
 """Redis 客户端配置模块"""
 
-import os
+import uuid
 import logging
+from contextlib import contextmanager
+from typing import Iterator, Optional
 
 logger = logging.getLogger(__name__)
 
-# 确保加载 .env 文件
-try:
-    from dotenv import load_dotenv
-    project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
-    env_file = os.path.join(project_root, '.env')
-    if os.path.exists(env_file):
-        load_dotenv(env_file)
-except Exception:
-    pass  # 静默失败，使用默认值
-
 try:
     # redis >= 4.0.0
     import redis
@@ -36,11 +28,12 @@ except ImportError:
 from app.core.config import settings
 
 # Redis 连接池配置（提升高并发性能）
-REDIS_POOL_SIZE = int(os.getenv("REDIS_POOL_SIZE", "50"))  # 连接池大小
-REDIS_POOL_MAX_OVERFLOW = int(os.getenv("REDIS_POOL_MAX_OVERFLOW", "50"))  # 最大溢出连接数，限制最大连接总数
-REDIS_POOL_TIMEOUT = int(os.getenv("REDIS_POOL_TIMEOUT", "5"))  # 获取连接超时
-REDIS_SOCKET_TIMEOUT = float(os.getenv("REDIS_SOCKET_TIMEOUT", "5.0"))  # Socket 超时（秒）
-REDIS_SOCKET_CONNECT_TIMEOUT = float(os.getenv("REDIS_SOCKET_CONNECT_TIMEOUT", "2.0"))  # 连接超时
+REDIS_POOL_SIZE = settings.REDIS_POOL_SIZE  # 连接池大小
+REDIS_POOL_MAX_OVERFLOW = settings.REDIS_POOL_MAX_OVERFLOW  # 最大溢出连接数，限制最大连接总数
+REDIS_POOL_TIMEOUT = settings.REDIS_POOL_TIMEOUT  # 获取连接超时
+REDIS_SOCKET_TIMEOUT = settings.REDIS_SOCKET_TIMEOUT  # Socket 超时（秒）
+REDIS_SOCKET_CONNECT_TIMEOUT = settings.REDIS_SOCKET_CONNECT_TIMEOUT  # 连接超时
+REDIS_HEALTH_CHECK_INTERVAL = settings.REDIS_HEALTH_CHECK_INTERVAL  # 空闲连接健康检查间隔（秒）
 
 # 构建 Redis URL（支持密码）
 if settings.REDIS_PASSWORD:
@@ -57,17 +50,93 @@ redis_connection_pool = redis.ConnectionPool.from_url(
     socket_connect_timeout=REDIS_SOCKET_CONNECT_TIMEOUT,
     socket_keepalive=True,  # 启用 TCP keepalive，减少重连开销
     retry_on_timeout=False,  # 超时时不重试，直接报错（避免长时间阻塞）
+    health_check_interval=REDIS_HEALTH_CHECK_INTERVAL,  # 复用空闲连接前先 PING，避免拿到已断开的连接
+)
+
+# 异步连接池（阻塞式：连接耗尽时等待 REDIS_POOL_TIMEOUT 秒，而不是直接抛错）
+async_redis_connection_pool = redis.asyncio.BlockingConnectionPool.from_url(
+    REDIS_URL,
+    decode_responses=True,
+    max_connections=REDIS_POOL_SIZE + REDIS_POOL_MAX_OVERFLOW,  # 最大总连接数
+    timeout=REDIS_POOL_TIMEOUT,
+    socket_timeout=REDIS_SOCKET_TIMEOUT,
+    socket_connect_timeout=REDIS_SOCKET_CONNECT_TIMEOUT,
+    socket_keepalive=True,
+    retry_on_timeout=False,
+    health_check_interval=REDIS_HEALTH_CHECK_INTERVAL,
 )
 
 # 基础 Redis 客户端（使用连接池）
 redis_client = Redis(connection_pool=redis_connection_pool)
-async_redis = AsyncRedis.from_url(
-    REDIS_URL, 
-    decode_responses=True, 
-    max_connections=REDIS_POOL_SIZE + REDIS_POOL_MAX_OVERFLOW  # 最大总连接数
-)
-sync_redis = Redis(connection_pool=redis_connection_pool)
+async_redis = AsyncRedis(connection_pool=async_redis_connection_pool)
+# 兼容旧代码的别名，与 redis_client 为同一对象
+sync_redis = redis_client
+
+# 协议解析器：安装 hiredis 后 redis-py 自动使用 C 实现的解析器
+if redis.utils.HIREDIS_AVAILABLE:
+    logger.info("Redis 使用 hiredis 协议解析器")
+else:
+    logger.warning("未安装 hiredis，Redis 使用纯 Python 协议解析器（pip install hiredis）")
+
+
+# 释放锁 Lua 脚本：只有持有者（token 匹配）才能删除，避免误删他人的锁
+RELEASE_LOCK_LUA = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
+class FastLock:
+    """单节点 Redis 分布式锁
+    
+    加锁：SET key token NX PX ttl（一次往返）
+    解锁：Lua 脚本校验 token 后删除（一次往返）
+    """
+
+    def __init__(self, client: Redis, release_script=None):
+        self.client = client
+        self._release_script = release_script or client.register_script(RELEASE_LOCK_LUA)
+
+    def acquire(self, resource: str, ttl: int) -> Optional[str]:
+        """尝试获取锁，成功返回 token，失败返回 None
+        
+        Args:
+            resource: 锁的键名
+            ttl: 锁过期时间（毫秒）
+        """
+        token = uuid.uuid4().hex
+        if self.client.set(resource, token, nx=True, px=ttl):
+            return token
+        return None
+
+    def release(self, resource: str, token: str) -> bool:
+        """释放锁（仅当 token 匹配时）"""
+        return bool(self._release_script(keys=[resource], args=[token], client=self.client))
+
+    @contextmanager
+    def hold(self, resource: str, ttl: int) -> Iterator[Optional[str]]:
+        """非阻塞加锁的上下文管理器，产出 token（未抢到锁时为 None），退出时释放
+        
+        用法:
+            with redis_lock.hold("some:lock", 10_000) as token:
+                if token:
+                    ...
+        """
+        token = self.acquire(resource, ttl)
+        try:
+            yield token
+        finally:
+            if token:
+                self.release(resource, token)
+
+
+# 预注册的释放锁脚本（调用时走 EVALSHA）
+release_lock_script = redis_client.register_script(RELEASE_LOCK_LUA)
 
+# 全局锁实例（单节点部署）
+redis_lock = FastLock(redis_client, release_lock_script)
 
 
 # 导出
@@ -75,5 +144,7 @@ __all__ = [
     "redis_client",
     "async_redis", 
     "sync_redis",
+    "redis_lock",
+    "FastLock",
     "REDIS_URL"
 ]
\ No newline at end of file
@@ -0,0 +1,15 @@
+"""自定义响应类"""
+
+import orjson
+from fastapi.responses import ORJSONResponse
+
+
+class FastBatchResponse(ORJSONResponse):
+    """批量结果响应：orjson 直接序列化整数键字典
+
+    handler 直接返回该响应时 FastAPI 跳过 response_model 的校验与 key 转换，
+    response_model 仅用于生成文档。
+    """
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
@@ -5,7 +5,7 @@ import logging
 from typing import Callable, Optional
 from fastapi import Request, HTTPException, Response
 from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from redis import Redis
 
 from app.core.config import settings
@@ -163,7 +163,7 @@ class SecurityMiddleware(BaseHTTPMiddleware):
             is_allowed, info = self.rate_limiter.is_allowed(request)
             
             if not is_allowed:
-                return JSONResponse(
+                return ORJSONResponse(
                     status_code=429,
                     content={
                         "success": False,
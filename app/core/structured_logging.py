@@ -98,8 +98,11 @@ class StructuredLogger:
         self.logger = logging.getLogger(name)
         self.logger.setLevel(getattr(logging, LOG_LEVEL))
     
-    def _log(self, level: int, message: str, extra_data: Optional[Dict[str, Any]] = None, **kwargs):
-        """通用日志方法"""
+    def _log(self, level: int, message: str, *args, extra_data: Optional[Dict[str, Any]] = None, **kwargs):
+        """通用日志方法（支持 % 风格参数，级别未启用时不做格式化）"""
+        if not self.logger.isEnabledFor(level):
+            return
+        
         extra = {}
         if extra_data:
             extra["extra_data"] = extra_data
@@ -109,22 +112,22 @@ class StructuredLogger:
             if value is not None:
                 extra[key] = value
         
-        self.logger.log(level, message, extra=extra, stacklevel=3)
+        self.logger.log(level, message, *args, extra=extra, stacklevel=3)
     
-    def debug(self, message: str, extra_data: Optional[Dict[str, Any]] = None, **kwargs):
-        self._log(logging.DEBUG, message, extra_data, **kwargs)
+    def debug(self, message: str, *args, extra_data: Optional[Dict[str, Any]] = None, **kwargs):
+        self._log(logging.DEBUG, message, *args, extra_data=extra_data, **kwargs)
     
-    def info(self, message: str, extra_data: Optional[Dict[str, Any]] = None, **kwargs):
-        self._log(logging.INFO, message, extra_data, **kwargs)
+    def info(self, message: str, *args, extra_data: Optional[Dict[str, Any]] = None, **kwargs):
+        self._log(logging.INFO, message, *args, extra_data=extra_data, **kwargs)
     
-    def warning(self, message: str, extra_data: Optional[Dict[str, Any]] = None, **kwargs):
-        self._log(logging.WARNING, message, extra_data, **kwargs)
+    def warning(self, message: str, *args, extra_data: Optional[Dict[str, Any]] = None, **kwargs):
+        self._log(logging.WARNING, message, *args, extra_data=extra_data, **kwargs)
     
-    def error(self, message: str, extra_data: Optional[Dict[str, Any]] = None, exc_info: bool = False, **kwargs):
-        self.logger.error(message, extra={"extra_data": extra_data, **kwargs}, exc_info=exc_info, stacklevel=3)
+    def error(self, message: str, *args, extra_data: Optional[Dict[str, Any]] = None, exc_info: bool = False, **kwargs):
+        self.logger.error(message, *args, extra={"extra_data": extra_data, **kwargs}, exc_info=exc_info, stacklevel=3)
     
-    def critical(self, message: str, extra_data: Optional[Dict[str, Any]] = None, **kwargs):
-        self._log(logging.CRITICAL, message, extra_data, **kwargs)
+    def critical(self, message: str, *args, extra_data: Optional[Dict[str, Any]] = None, **kwargs):
+        self._log(logging.CRITICAL, message, *args, extra_data=extra_data, **kwargs)
     
     def log_performance(self, operation: str, duration_ms: float, extra_data: Optional[Dict[str, Any]] = None, **kwargs):
         """记录性能日志"""
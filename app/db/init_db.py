@@ -0,0 +1,12 @@
+"""建表工具（按需导入，避免 app.db 导入时加载全部 ORM 模型）"""
+
+from app.db.base import Base
+from app.db.session import engine
+
+
+def init_db():
+    """创建所有数据表（幂等：已存在的表会跳过）"""
+    # 导入模型以注册到 Base.metadata
+    import app.models  # noqa: F401
+
+    Base.metadata.create_all(bind=engine, checkfirst=True)
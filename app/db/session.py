@@ -1,26 +1,29 @@
-"""数据库会话管理 - 支持HTTP接口和Kafka消费者"""
+"""数据库会话管理 - 支持HTTP接口和Kafka消费者
 
-from sqlalchemy import create_engine
+- HTTP 接口：使用异步引擎（asyncpg），不阻塞事件循环
+- Kafka 消费者 / Celery / 启动预热：使用同步引擎（psycopg2）
+
+连接池参数通过环境变量 DB_POOL_SIZE / DB_MAX_OVERFLOW / DB_POOL_TIMEOUT / DB_POOL_RECYCLE 配置。
+"""
+
+import asyncio
+import logging
+
+from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from app.core.config import settings
-import multiprocessing
-import os
-
-print("数据库模块已加载...")
 
-# 强制使用高连接池配置（确保支持高并发）
-# 如果环境变量设置了较低的值，这里强制覆盖
-DB_POOL_SIZE = 50  # 强制使用50
-DB_MAX_OVERFLOW = 100  # 强制使用100
+logger = logging.getLogger(__name__)
 
-# 创建主数据库引擎（HTTP接口和启动预热使用）
-print(f"创建主数据库连接池: pool_size={DB_POOL_SIZE}, max_overflow={DB_MAX_OVERFLOW}")
+# 创建主数据库引擎（启动预热、Celery 任务等同步场景使用）
 engine = create_engine(
     settings.database_url,
-    pool_size=DB_POOL_SIZE,
-    max_overflow=DB_MAX_OVERFLOW,
-    pool_pre_ping=True,
-    pool_recycle=1800,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_pre_ping=settings.DB_POOL_PRE_PING,
+    pool_recycle=settings.DB_POOL_RECYCLE,
 )
 SessionLocal = sessionmaker(
     bind=engine,
@@ -28,4 +31,39 @@ SessionLocal = sessionmaker(
     autocommit=False,
     expire_on_commit=False,
 )
-print(f"✅ 主数据库连接池已初始化：pool_size={DB_POOL_SIZE}, max_overflow={DB_MAX_OVERFLOW}")
\ No newline at end of file
+
+# 创建异步数据库引擎（HTTP 接口使用，asyncpg 驱动）
+async_engine = create_async_engine(
+    settings.async_database_url,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_pre_ping=settings.DB_POOL_PRE_PING,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+)
+AsyncSessionLocal = async_sessionmaker(
+    async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
+logger.info(
+    f"数据库连接池已初始化：pool_size={settings.DB_POOL_SIZE}, "
+    f"max_overflow={settings.DB_MAX_OVERFLOW}, pool_timeout={settings.DB_POOL_TIMEOUT}s, "
+    f"pool_recycle={settings.DB_POOL_RECYCLE}s, pool_pre_ping={settings.DB_POOL_PRE_PING}"
+)
+
+
+async def db_keepalive(interval: int = settings.DB_KEEPALIVE_INTERVAL):
+    """后台保活任务：定期执行 SELECT 1
+    
+    关闭 pool_pre_ping 后，用它代替每次取连接时的探测，及早发现数据库断连。
+    """
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            async with async_engine.connect() as connection:
+                await connection.execute(text("SELECT 1"))
+        except Exception as e:
+            logger.warning(f"数据库保活检查失败：{e}")
@@ -41,7 +41,7 @@ def init_test_data() -> bool:
     db: Session = SessionLocal()
     try:
         # 检查是否已有产品数据
-        existing_count = db.execute(select(Product).limit(1)).scalar_one_or_none()
+        existing_count = db.execute(select(Product.id).limit(1)).scalar_one_or_none()
         if existing_count is not None:
             logger.info("产品数据已存在，跳过初始化")
             return True
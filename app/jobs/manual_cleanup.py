@@ -3,7 +3,8 @@
 import argparse
 import logging
 from app.db.session import SessionLocal
-from app.services.inventory_service import InventoryService
+from app.services.inventory_log import InventoryLogService
+from app.services.inventory_service import get_global_cache_service
 from app.core.redis import redis_client
 
 # 配置日志
@@ -24,25 +25,25 @@ def run_cleanup(batch_size: int = 500, dry_run: bool = False):
     try:
         if dry_run:
             # 试运行模式：只统计待清理记录数量
-            from sqlalchemy import select
+            from sqlalchemy import func, select
             from app.models.inventory_reservations import InventoryReservation, ReservationStatus
-            from datetime import datetime
+            from datetime import datetime, timezone
             
             expired_count = db.execute(
-                select(InventoryReservation)
+                select(func.count())
+                .select_from(InventoryReservation)
                 .where(
                     InventoryReservation.status == ReservationStatus.RESERVED,
-                    InventoryReservation.expired_at <= datetime.utcnow()
+                    InventoryReservation.expired_at <= datetime.now(timezone.utc)
                 )
-            ).count()
+            ).scalar_one()
             
             logger.info(f"试运行模式：发现 {expired_count} 条过期预占记录待清理")
             return expired_count
         else:
             # 实际执行清理
-            service = InventoryService(db, redis_client)
+            service = InventoryLogService(db, get_global_cache_service(redis_client))
             count = service.cleanup_expired_reservations(batch_size)
-            db.commit()
             logger.info(f"清理完成：成功清理 {count} 条过期预占记录")
             return count
             
@@ -1,5 +1,8 @@
 import sys
 import os
+import hashlib
+from functools import lru_cache
+import orjson
 from contextlib import asynccontextmanager
 import logging
 from fastapi import FastAPI
@@ -7,7 +10,8 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.exceptions import RequestValidationError
 from starlette.exceptions import HTTPException
 from starlette.requests import Request
-from starlette.responses import JSONResponse
+from fastapi.responses import ORJSONResponse, Response
+from fastapi.encoders import jsonable_encoder
 from sqlalchemy import text
 
 # 添加项目根目录到 Python 路径
@@ -28,12 +32,11 @@ except ImportError:
 
 # 配置结构化日志（在导入其他模块之前）
 from app.core.structured_logging import setup_logging, get_structured_logger
-import os
 log_format = os.getenv("LOG_FORMAT", "json")  # json 或 plain
 log_file = os.getenv("LOG_FILE", None)  # 可选的日志文件路径
 setup_logging(log_format=log_format, log_file=log_file)
 
-from app.db.session import engine
+from app.db.session import engine, async_engine, db_keepalive
 from app.core.redis import async_redis, redis_client, sync_redis
 from app.routers import inventory_router, perf_router, system_monitor
 from app.core.config import settings, find_available_port, is_port_available
@@ -52,35 +55,48 @@ async def lifespan(app: FastAPI):
     # 检查端口占用情况
     actual_port = settings.PORT
     if not is_port_available(settings.HOST, settings.PORT):
-        logger.warning(f"Port {settings.PORT} is occupied, trying to find available port...")
+        logger.warning("Port %s is occupied, trying to find available port...", settings.PORT)
         try:
             actual_port = find_available_port(settings.HOST, settings.PORT + 1)
-            logger.info(f"Found available port: {actual_port}")
+            logger.info("Found available port: %s", actual_port)
         except RuntimeError as e:
-            logger.error(f"Failed to find available port: {e}")
+            logger.error("Failed to find available port: %s", e)
             raise
     
-    logger.info(f"Server will run on {settings.HOST}:{actual_port}")
+    logger.info("Server will run on %s:%s", settings.HOST, actual_port)
     
-    # 数据库连接检查
-    try:
-        with engine.connect() as connection:
-            connection.execute(text("SELECT 1"))
-        logger.info("Database connection successful")
-    except Exception as e:
-        logger.error("Database connection failed: %s", e)
-        raise
+    # 数据库和 Redis 连接检查（并发执行，启动耗时取二者最大值）
+    async def check_database():
+        async with async_engine.begin() as connection:
+            await connection.execute(text("SELECT 1"))
+    
+    import asyncio
+    db_result, redis_result = await asyncio.gather(
+        check_database(), async_redis.ping(), return_exceptions=True
+    )
+    
+    if isinstance(db_result, BaseException):
+        logger.error("Database connection failed: %s", db_result)
+        raise db_result
+    logger.info("Database connection successful")
+    logger.info("Database pool status: %s", async_engine.pool.status())
     
-    # Redis 连接检查
     try:
-        await async_redis.ping()
+        if isinstance(redis_result, BaseException):
+            raise redis_result
         logger.info("Redis connected successfully")
         
-        # 预注册 Lua 脚本（使用同步客户端，只执行一次，大幅提升性能）
+        # 预加载 Lua 脚本（SCRIPT LOAD，后续调用直接 EVALSHA）
         from app.services.inventory_cache import init_lua_scripts
-        init_lua_scripts(sync_redis)
+        from app.core.redis import release_lock_script
+        init_lua_scripts(sync_redis, release_lock_script)
+        
+        # 开启库存键的键空间通知（缓存失效由 Redis 写入事件驱动）；
+        # 无法确认开启时不启动失效订阅，进程内缓存保持关闭
+        from app.core.cache_invalidation import enable_keyspace_notifications
+        enable_keyspace_notifications(sync_redis)
     except Exception as e:
-        logger.warning(f"Redis connection failed: {e}")
+        logger.warning("Redis connection failed: %s", e)
         logger.warning("Application will run without Redis caching")
     
     # 初始化测试数据
@@ -100,13 +116,13 @@ async def lifespan(app: FastAPI):
                 
             if product_ids:
                 count = product_bloom_filter.add_batch(product_ids)
-                logger.info(f"布隆过滤器已加载 {count} 个商品 ID")
+                logger.info("布隆过滤器已加载 %s 个商品 ID", count)
             else:
                 logger.warning("数据库中没有商品数据，布隆过滤器未加载")
         finally:
             db.close()
     except Exception as e:
-        logger.warning(f"布隆过滤器加载失败：{e}")
+        logger.warning("布隆过滤器加载失败：%s", e)
     
     # 启动时加载所有库存数据到 Redis（纯缓存模式，数据永不过期）
     # 使用分布式锁确保只有一个进程执行预热
@@ -117,70 +133,79 @@ async def lifespan(app: FastAPI):
             
         if redis_client:
             # 尝试获取预热锁（防止多个worker同时预热）
-            lock_acquired = redis_client.set("inventory:warmup:lock", "1", nx=True, ex=300)
-            
-            if lock_acquired:
-                logger.info("获得预热锁，开始加载库存数据...")
-                
-                # 检查是否已经有数据（避免重复加载）
-                sample_key = "stock:available:WH001:980"
-                existing_data = redis_client.get(sample_key)
-                
-                if existing_data is None:
-                    db = SessionLocal()
-                    try:
-                        # 查询所有库存记录
-                        from sqlalchemy import select
-                        from app.models.product_stocks import ProductStock
-                        
-                        stmt = select(ProductStock)
-                        stocks = db.execute(stmt).scalars().all()
-                        
-                        count = 0
-                        pipe = redis_client.pipeline(transaction=False)
-                        
-                        for stock in stocks:
-                            # 设置可用库存缓存（永不过期）
-                            cache_key = f"stock:available:{stock.warehouse_id}:{stock.product_id}"
-                            pipe.set(cache_key, stock.available_stock)
+            from app.core.redis import redis_lock
+            # 退出 with 时释放（仅持有者能释放），预热异常也不会让锁滞留到过期
+            with redis_lock.hold("inventory:warmup:lock", 300_000) as lock_token:
+                if lock_token:
+                    logger.info("获得预热锁，开始加载库存数据...")
+                    
+                    # 检查是否已经有数据（避免重复加载）
+                    sample_key = "stock:available:WH001:980"
+                    existing_data = redis_client.get(sample_key)
+                    
+                    if existing_data is None:
+                        db = SessionLocal()
+                        try:
+                            # 查询所有库存记录
+                            from sqlalchemy import select
+                            from app.models.product_stocks import ProductStock
+                            
+                            # 只取需要的列，按 1000 行分批流式读取，不构建 ORM 对象
+                            stmt = select(
+                                ProductStock.warehouse_id,
+                                ProductStock.product_id,
+                                ProductStock.available_stock,
+                                ProductStock.reserved_stock,
+                                ProductStock.frozen_stock,
+                                ProductStock.safety_stock,
+                            ).execution_options(yield_per=1000)
+                            stocks = db.execute(stmt)
+                            
+                            count = 0
+                            pipe = redis_client.pipeline(transaction=False)
                             
-                            # 设置完整库存信息缓存（永不过期）
-                            full_key = f"stock:full:{stock.warehouse_id}:{stock.product_id}"
-                            full_data = {
-                                "warehouse_id": stock.warehouse_id,
-                                "product_id": stock.product_id,
-                                "available_stock": stock.available_stock,
-                                "reserved_stock": stock.reserved_stock,
-                                "frozen_stock": stock.frozen_stock,
-                                "safety_stock": stock.safety_stock,
-                                "total_stock": stock.available_stock + stock.reserved_stock + stock.frozen_stock
-                            }
-                            pipe.set(full_key, json.dumps(full_data))
-                            count += 1
-                        
-                        pipe.execute()
-                        logger.info(f"✅ 启动时已加载 {count} 条库存记录到 Redis（永不过期）")
-                        
-                    except Exception as e:
-                        logger.warning(f"加载库存到 Redis 失败：{e}")
-                    finally:
-                        db.close()
+                            for stock in stocks:
+                                # 设置可用库存缓存（永不过期）
+                                cache_key = f"stock:available:{stock.warehouse_id}:{stock.product_id}"
+                                pipe.set(cache_key, stock.available_stock)
+                                
+                                # 设置完整库存信息缓存（永不过期）
+                                full_key = f"stock:full:{stock.warehouse_id}:{stock.product_id}"
+                                full_data = {
+                                    "warehouse_id": stock.warehouse_id,
+                                    "product_id": stock.product_id,
+                                    "available_stock": stock.available_stock,
+                                    "reserved_stock": stock.reserved_stock,
+                                    "frozen_stock": stock.frozen_stock,
+                                    "safety_stock": stock.safety_stock,
+                                    "total_stock": stock.available_stock + stock.reserved_stock + stock.frozen_stock
+                                }
+                                pipe.set(full_key, json.dumps(full_data))
+                                count += 1
+                            
+                            pipe.execute()
+                            logger.info("✅ 启动时已加载 %s 条库存记录到 Redis（永不过期）", count)
+                            
+                        except Exception as e:
+                            logger.warning("加载库存到 Redis 失败：%s", e)
+                        finally:
+                            db.close()
+                    else:
+                        logger.info("Redis 已存在数据，跳过预热")
                 else:
-                    logger.info("Redis 已存在数据，跳过预热")
-            else:
-                logger.info("其他进程正在预热，等待完成...")
-                # 等待其他进程完成预热
-                import time
-                for _ in range(30):  # 最多等待30秒
-                    time.sleep(1)
-                    sample_key = "stock:available:WH001:980"
-                    if redis_client.get(sample_key):
-                        break
-                logger.info("预热完成")
+                    logger.info("其他进程正在预热，等待完成...")
+                    # 等待其他进程完成预热
+                    import time
+                    for _ in range(30):  # 最多等待30秒
+                        time.sleep(1)
+                        sample_key = "stock:available:WH001:980"
+                        if redis_client.get(sample_key):
+                            break
+                    logger.info("预热完成")
         else:
             logger.warning("Redis 未连接，无法加载库存数据")
     except Exception as e:
-        logger.error(f"启动时加载 Redis 失败：{e}")
+        logger.error("启动时加载 Redis 失败：%s", e)
     
     # 启动 Kafka 消费者（后台任务）
     try:
@@ -201,12 +226,30 @@ async def lifespan(app: FastAPI):
             threading.Thread(target=run_kafka_consumer, daemon=True).start()
             logger.info("Kafka 消费者任务已启动（新线程）")
     except Exception as e:
-        logger.warning(f"Kafka 消费者启动失败: {e}")
+        logger.warning("Kafka 消费者启动失败: %s", e)
+    
+    # 注册主事件循环：线程池中执行的库存操作通过它投递 Kafka 事件
+    from app.core.kafka_producer import bind_event_loop
+    bind_event_loop(asyncio.get_running_loop())
+    
+    # 启动数据库保活任务（替代 pool_pre_ping）
+    keepalive_task = asyncio.create_task(db_keepalive())
+    
+    # 订阅库存缓存失效通知（后台任务，断线自动重连）
+    from app.core.cache_invalidation import run_invalidation_subscriber
+    invalidation_task = asyncio.create_task(run_invalidation_subscriber())
+    
+    # 启动时一次性生成并序列化 OpenAPI 文档，避免首次访问 /docs 时现场构建
+    if app.openapi_url:
+        _openapi_payload()
     
     yield
     
     # 应用关闭时的清理
     logger.info("Shutting down application...")
+    keepalive_task.cancel()
+    invalidation_task.cancel()
+    await async_engine.dispose()
 
 # 创建 FastAPI 应用
 app = FastAPI(
@@ -241,10 +284,12 @@ app = FastAPI(
                     ## 🌐 当前运行端口：{settings.PORT}
                     如果端口被占用，系统将自动尝试使用其他可用端口。""",
     version="1.0.0",
-    openapi_url="/openapi.json",
-    docs_url="/docs",
-    redoc_url="/redoc",
+    # 生产环境可通过 ENABLE_DOCS=False 关闭接口文档
+    openapi_url="/openapi.json" if settings.ENABLE_DOCS else None,
+    docs_url="/docs" if settings.ENABLE_DOCS else None,
+    redoc_url="/redoc" if settings.ENABLE_DOCS else None,
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,  # orjson 序列化，比标准库 json 快数倍
     contact={
         "name": "库存微服务团队",
         "email": "inventory@example.com",
@@ -281,24 +326,41 @@ app = FastAPI(
     ]
 )
 
-# 添加 CORS 中间件
-# 生产环境配置：允许从环境变量 ALLOWED_ORIGINS 读取域名列表，逗号分隔
-# 示例：ALLOWED_ORIGINS="https://example.com,https://app.example.com"
-allowed_origins_str = os.getenv("ALLOWED_ORIGINS", "")
-allowed_origins = [origin.strip() for origin in allowed_origins_str.split(",") if origin.strip()] if allowed_origins_str else []
 
-# 如果未配置且非调试模式，使用安全的默认值
-if not allowed_origins and not settings.DEBUG:
-    allowed_origins = ["https://example.com"]  # 生产环境默认域名
-else:
-    allowed_origins = allowed_origins or ["*"]  # 调试模式允许所有
+@lru_cache(maxsize=1)
+def _openapi_payload() -> tuple[bytes, str]:
+    """OpenAPI 文档的序列化结果和 ETag（文档在进程内不变，只生成、序列化一次）"""
+    body = orjson.dumps(app.openapi())
+    return body, f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+
 
+if app.openapi_url:
+    # 替换 FastAPI 默认的文档路由：默认实现每次请求都重新序列化整份文档
+    app.router.routes = [
+        route for route in app.router.routes
+        if getattr(route, "path", None) != app.openapi_url
+    ]
+
+    @app.api_route(app.openapi_url, methods=["GET", "HEAD"], include_in_schema=False)
+    async def openapi_json(request: Request) -> Response:
+        """返回缓存的 OpenAPI 文档，If-None-Match 命中时返回 304"""
+        body, etag = _openapi_payload()
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers=headers)
+        return Response(body, media_type="application/json", headers=headers)
+
+
+# 添加 CORS 中间件
+# 域名列表从 settings.ALLOWED_ORIGINS 读取；公开 API 不携带凭证，
+# 预检结果允许浏览器缓存一天，避免每个请求前都发 OPTIONS
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=allowed_origins,
-    allow_credentials=True,
+    allow_origins=settings.cors_origins,
+    allow_credentials=False,
     allow_methods=["GET", "POST", "PUT", "DELETE", "PATCH"],
-    allow_headers=["Authorization", "Content-Type", "X-Request-ID"],
+    allow_headers=["Authorization", "Content-Type", "X-Request-ID", "Idempotency-Key"],
+    max_age=86400,
 )
 
 # 添加安全防护中间件（限流）
@@ -315,9 +377,9 @@ try:
     else:
         logger.info("安全防护中间件未启用（Redis 不可用或已禁用）")
 except ImportError as e:
-    logger.warning(f"安全防护中间件导入失败: {e}")
+    logger.warning("安全防护中间件导入失败: %s", e)
 except Exception as e:
-    logger.warning(f"安全防护中间件初始化失败: {e}")
+    logger.warning("安全防护中间件初始化失败: %s", e)
 
 # 注册路由
 app.include_router(inventory_router.router, prefix="/api/v1")
@@ -327,40 +389,41 @@ app.include_router(system_monitor.router, prefix="/api/v1")
 # 全局异常处理
 @app.exception_handler(RequestValidationError)
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
-    logger.error(f"Validation error: {exc}")
-    return JSONResponse(
+    logger.error("Validation error: %s", exc)
+    return ORJSONResponse(
         status_code=422,
         content={
             "success": False,
             "message": "请求参数验证失败",
-            "details": exc.errors()
+            "details": jsonable_encoder(exc.errors())
         }
     )
 
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request: Request, exc: HTTPException):
-    logger.error(f"HTTP error: {exc.status_code} - {exc.detail}")
-    return JSONResponse(
-        status_code=exc.status_code,
-        content={
-            "success": False,
-            "message": exc.detail
-        }
-    )
+    logger.error("HTTP error: %s - %s", exc.status_code, exc.detail)
+    content = {
+        "success": False,
+        "message": exc.detail
+    }
+    # 库存业务异常附带错误码，调用方按错误码判断，不解析提示文案
+    code = getattr(exc, "code", None)
+    if code is not None:
+        content["code"] = int(code)
+    return ORJSONResponse(status_code=exc.status_code, content=content)
 
 @app.exception_handler(Exception)
 async def general_exception_handler(request: Request, exc: Exception):
-    import traceback
-    error_detail = "".join(traceback.format_exception(type(exc), exc, exc.__traceback__))
-    logger.error(f"Unexpected error: {exc}\n{error_detail}")
-    return JSONResponse(
-        status_code=500,
-        content={
-            "success": False,
-            "message": f"服务器内部错误: {str(exc)}",
-            "detail": error_detail
-        }
-    )
+    # 只有未预期的异常才记录完整堆栈；堆栈文本仅在 DEBUG 模式下返回给客户端
+    logger.error("Unexpected error: %s", exc, exc_info=exc)
+    content = {
+        "success": False,
+        "message": f"服务器内部错误: {str(exc)}",
+    }
+    if settings.DEBUG:
+        import traceback
+        content["detail"] = "".join(traceback.format_exception(type(exc), exc, exc.__traceback__))
+    return ORJSONResponse(status_code=500, content=content)
 
 # 健康检查端点
 from pydantic import BaseModel
@@ -549,12 +612,12 @@ if __name__ == "__main__":
     port = settings.PORT
     
     if not is_port_available(host, port):
-        logger.warning(f"Port {port} is occupied, trying to find available port...")
+        logger.warning("Port %s is occupied, trying to find available port...", port)
         try:
             port = find_available_port(host, port + 1)
-            logger.info(f"Found available port: {port}")
+            logger.info("Found available port: %s", port)
         except RuntimeError as e:
-            logger.error(f"Failed to find available port: {e}")
+            logger.error("Failed to find available port: %s", e)
             raise
     
     # 生产环境配置：使用多进程 uvicorn
@@ -562,13 +625,17 @@ if __name__ == "__main__":
     # 开发环境：workers=1 或 2
     # 生产环境：根据 CPU 核心数调整，一般 8-16 个
     import multiprocessing
+    import importlib.util
     cpu_count = multiprocessing.cpu_count()
-    workers = min(cpu_count * 2 + 1, 1)
+    workers = settings.UVICORN_WORKERS or cpu_count
+    
+    # uvloop 仅支持 Linux/Mac，未安装或 Windows 下回退到默认 asyncio 事件循环
+    loop_impl = "uvloop" if sys.platform != "win32" and importlib.util.find_spec("uvloop") else "asyncio"
     
-    logger.info(f"Starting server with {workers} workers (CPU cores: {cpu_count})")
+    logger.info("Starting server with %s workers (CPU cores: %s, loop: %s)", workers, cpu_count, loop_impl)
     from app.core.redis import REDIS_POOL_SIZE, REDIS_POOL_MAX_OVERFLOW
-    logger.info(f"Redis pool size: {REDIS_POOL_SIZE}, max overflow: {REDIS_POOL_MAX_OVERFLOW}")
-    logger.info(f"Optimized for high concurrency - Target QPS: 1000+")
+    logger.info("Redis pool size: %s, max overflow: %s", REDIS_POOL_SIZE, REDIS_POOL_MAX_OVERFLOW)
+    logger.info("Optimized for high concurrency - Target QPS: 1000+")
     
     # 注意：reload=True 时 workers 参数不生效，开发环境建议使用单进程
     # 生产环境设置 DEBUG=False 以启用多进程
@@ -584,7 +651,7 @@ if __name__ == "__main__":
         access_log=True,
         log_level="info",
         http="httptools",  # 使用高性能 HTTP 解析器
-        # loop="uvloop",  # Windows 不支持 uvloop，Linux/Mac可启用
+        loop=loop_impl,  # Linux/Mac 使用 uvloop
         limit_concurrency=2000,  # 最大并发连接数
         limit_max_requests=10000,  # worker 重启前最大请求数
         backlog=2048,  # 监听队列大小
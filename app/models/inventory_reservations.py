@@ -109,4 +109,11 @@ Index(
     "idx_reservation_warehouse_status",
     InventoryReservation.warehouse_id,
     InventoryReservation.status,
-)
\ No newline at end of file
+)
+
+# 过期预占清理专用部分索引：仅覆盖 RESERVED 状态，按过期时间顺序扫描
+Index(
+    "idx_reservation_expired_active",
+    InventoryReservation.expired_at,
+    postgresql_where=text("status = 'RESERVED'"),
+)
@@ -66,6 +66,13 @@ class ProductStock(Base):
         comment="安全库存（最低库存预警线）",
     )
 
+    sales_count = Column(
+        Integer,
+        nullable=False,
+        server_default="0",
+        comment="累计销量（确认出库数量）",
+    )
+
     created_at = Column(
         TIMESTAMP(timezone=True),
         nullable=False,
@@ -1,10 +1,10 @@
 """库存调整 API 路由（入库、调整、冻结）- 纯 Redis 操作"""
 
-from fastapi import APIRouter, Depends, HTTPException, Body
+from fastapi import APIRouter, Body
+from starlette.concurrency import run_in_threadpool
 import logging
 
-from app.core.dependencies import get_redis
-from app.services.inventory_service import InventoryService
+from app.core.dependencies import get_inventory_service
 from app.schemas.inventory_api import (
     IncreaseStockResponse,
     AdjustStockResponse,
@@ -18,6 +18,9 @@ from app.schemas.inventory_api import (
 logger = logging.getLogger(__name__)
 router = APIRouter(tags=["库存管理"])
 
+# 库存服务单例（模块级引用，避免每个请求走依赖解析）
+inventory_service = get_inventory_service()
+
 
 @router.post(
     "/increase",
@@ -51,31 +54,24 @@ router = APIRouter(tags=["库存管理"])
 )
 async def increase_stock(
     request: IncreaseStockRequest = Body(..., description="入库请求"),
-    redis = Depends(get_redis)
 
 ):
     """入库/补货接口 - 纯 Redis 操作"""
-    try:
-        service = InventoryService(redis)
-        result = service.increase_stock(
-            warehouse_id=request.warehouse_id,
-            product_id=request.product_id,
-            quantity=request.quantity,
-            order_id=request.order_id,
-            operator=request.operator,
-            remark=request.remark,
-            source="api"
-        )
-        return IncreaseStockResponse(
-            success=True,
-            message="入库成功",
-            **result
-        )
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"入库失败：{str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
+    result = await run_in_threadpool(
+        inventory_service.increase_stock,
+        warehouse_id=request.warehouse_id,
+        product_id=request.product_id,
+        quantity=request.quantity,
+        order_id=request.order_id,
+        operator=request.operator,
+        remark=request.remark,
+        source="api"
+    )
+    return IncreaseStockResponse(
+        success=True,
+        message="入库成功",
+        **result
+    )
 
 
 @router.post(
@@ -110,31 +106,24 @@ async def increase_stock(
     }
 )
 async def adjust_stock(
-    request: AdjustStockRequest = Body(..., description="调整请求"),
-    redis = Depends(get_redis)
+    request: AdjustStockRequest = Body(..., description="调整请求")
 ):
     """库存调整接口 - 纯 Redis 操作"""
-    try:
-        service = InventoryService(redis)
-        result = service.adjust_stock(
-            warehouse_id=request.warehouse_id,
-            product_id=request.product_id,
-            adjust_type=request.adjust_type,
-            quantity=request.quantity,
-            reason=request.reason,
-            operator=request.operator,
-            source="api"
-        )
-        return AdjustStockResponse(
-            success=True,
-            message="调整成功",
-            **result
-        )
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"库存调整失败：{str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
+    result = await run_in_threadpool(
+        inventory_service.adjust_stock,
+        warehouse_id=request.warehouse_id,
+        product_id=request.product_id,
+        adjust_type=request.adjust_type,
+        quantity=request.quantity,
+        reason=request.reason,
+        operator=request.operator,
+        source="api"
+    )
+    return AdjustStockResponse(
+        success=True,
+        message="调整成功",
+        **result
+    )
 
 
 @router.post(
@@ -167,29 +156,22 @@ async def adjust_stock(
     }
 )
 async def freeze_stock(
-    request: FreezeStockRequest = Body(..., description="冻结请求"),
-    redis = Depends(get_redis)
+    request: FreezeStockRequest = Body(..., description="冻结请求")
 ):
     """冻结库存接口 - 纯 Redis 操作"""
-    try:
-        service = InventoryService(redis)
-        result = service.freeze_stock(
-            warehouse_id=request.warehouse_id,
-            product_id=request.product_id,
-            quantity=request.quantity,
-            reason=request.reason,
-            operator=request.operator
-        )
-        return FreezeStockResponse(
-            success=True,
-            message="冻结成功",
-            **result
-        )
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"冻结库存失败：{str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
+    result = await run_in_threadpool(
+        inventory_service.freeze_stock,
+        warehouse_id=request.warehouse_id,
+        product_id=request.product_id,
+        quantity=request.quantity,
+        reason=request.reason,
+        operator=request.operator
+    )
+    return FreezeStockResponse(
+        success=True,
+        message="冻结成功",
+        **result
+    )
 
 
 @router.post(
@@ -222,26 +204,19 @@ async def freeze_stock(
     }
 )
 async def unfreeze_stock(
-    request: UnfreezeStockRequest = Body(..., description="解冻请求"),
-    redis = Depends(get_redis)
+    request: UnfreezeStockRequest = Body(..., description="解冻请求")
 ):
     """解冻库存接口 - 纯 Redis 操作"""
-    try:
-        service = InventoryService(redis)
-        result = service.unfreeze_stock(
-            warehouse_id=request.warehouse_id,
-            product_id=request.product_id,
-            quantity=request.quantity,
-            reason=request.reason,
-            operator=request.operator
-        )
-        return FreezeStockResponse(
-            success=True,
-            message="解冻成功",
-            **result
-        )
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"解冻库存失败：{str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+    result = await run_in_threadpool(
+        inventory_service.unfreeze_stock,
+        warehouse_id=request.warehouse_id,
+        product_id=request.product_id,
+        quantity=request.quantity,
+        reason=request.reason,
+        operator=request.operator
+    )
+    return FreezeStockResponse(
+        success=True,
+        message="解冻成功",
+        **result
+    )
\ No newline at end of file
@@ -1,19 +1,23 @@
 """批量操作 API 路由 - 纯 Redis 操作"""
 
-from fastapi import APIRouter, Depends, HTTPException, Body
+from fastapi import APIRouter, Body
+from starlette.concurrency import run_in_threadpool
 import logging
 
-from app.core.dependencies import get_redis
-from app.services.inventory_service import InventoryService
+from app.core.dependencies import get_inventory_service
 from app.schemas.inventory_api import (
     BatchReserveResponse,
     BatchReserveRequest,
     BatchReleaseRequest,
+    BatchReleaseResponse,
 )
 
 logger = logging.getLogger(__name__)
 router = APIRouter(tags=["库存管理"])
 
+# 库存服务单例（模块级引用，避免每个请求走依赖解析）
+inventory_service = get_inventory_service()
+
 
 @router.post(
     "/reserve-batch",
@@ -59,31 +63,24 @@ router = APIRouter(tags=["库存管理"])
     }
 )
 async def batch_reserve_stock(
-    request: BatchReserveRequest = Body(..., description="批量预占请求"),
-    redis = Depends(get_redis)
+    request: BatchReserveRequest = Body(..., description="批量预占请求")
 ):
     """批量预占库存接口 - 纯 Redis 操作"""
-    try:
-        service = InventoryService(redis)
-        items = [
-            {"warehouse_id": item.warehouse_id, "product_id": item.product_id, "quantity": item.quantity}
-            for item in request.items
-        ]
-        result = service.reserve_batch(order_id=request.order_id, items=items)
-        return BatchReserveResponse(
-            success=True,
-            message="批量预占完成",
-            **result
-        )
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"批量预占失败：{str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
+    items = [
+        {"warehouse_id": item.warehouse_id, "product_id": item.product_id, "quantity": item.quantity}
+        for item in request.items
+    ]
+    result = await run_in_threadpool(inventory_service.reserve_batch, order_id=request.order_id, items=items)
+    return BatchReserveResponse(
+        success=True,
+        message="批量预占完成",
+        **result
+    )
 
 
 @router.post(
     "/release-batch",
+    response_model=BatchReleaseResponse,
     summary="批量释放预占",
     description="""批量释放同一订单的所有预占库存。
     
@@ -108,21 +105,13 @@ async def batch_reserve_stock(
     }
 )
 async def batch_release_stock(
-    request: BatchReleaseRequest = Body(..., description="批量释放请求"),
-    redis = Depends(get_redis)
+    request: BatchReleaseRequest = Body(..., description="批量释放请求")
 ):
     """批量释放预占库存接口 - 纯 Redis 操作"""
-    try:
-        service = InventoryService(redis)
-        count = service.release_stock(request.order_id)
-        return {
-            "success": True,
-            "message": "批量释放成功",
-            "order_id": request.order_id,
-            "released_count": count
-        }
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"批量释放失败：{str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+    count = await run_in_threadpool(inventory_service.release_stock, request.order_id)
+    return BatchReleaseResponse(
+        success=True,
+        message="批量释放成功",
+        order_id=request.order_id,
+        released_count=int(count)
+    )
\ No newline at end of file
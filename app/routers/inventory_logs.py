@@ -5,14 +5,19 @@
 """
 
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import desc, func, select
 from datetime import datetime as dt
 from typing import Optional
+from collections import OrderedDict
+from uuid import uuid4
 import logging
 
-from app.core.dependencies import get_db, get_redis
+from app.core.dependencies import get_db
+from app.db.session import SessionLocal
 from app.models.inventory_logs import InventoryLog
+from app.models.inventory_reservations import InventoryReservation, ReservationStatus
 from app.schemas.inventory_api import (
     PaginatedLogsResponse,
     InventoryLogDetail,
@@ -20,7 +25,15 @@ from app.schemas.inventory_api import (
     CeleryTaskResponse,
     TaskStatusResponse,
 )
-from tasks.inventory_tasks import cleanup_expired_reservations as celery_cleanup_task
+from app.core.redis import async_redis
+from celery import chord
+from celery_app import (
+    app as celery_app,
+    CLEANUP_TASK_NAME,
+    FINISH_CLEANUP_TASK_NAME,
+    CLEANUP_RUNNING_KEY,
+    CLEANUP_RUNNING_TTL,
+)
 
 logger = logging.getLogger(__name__)
 router = APIRouter(tags=["库存管理"])
@@ -89,34 +102,41 @@ async def get_inventory_logs(
     end_date: Optional[str] = Query(None, description="结束时间 (ISO 格式)"),
     page: int = Query(1, ge=1, description="页码"),
     page_size: int = Query(50, ge=1, le=100, description="每页数量"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """查询库存流水日志（直接查数据库）"""
     try:
-        # 构建查询
-        query = db.query(InventoryLog)
-        
-        # 应用筛选条件
+        # 构建筛选条件
+        conditions = []
         if warehouse_id:
-            query = query.filter(InventoryLog.warehouse_id == warehouse_id)
+            conditions.append(InventoryLog.warehouse_id == warehouse_id)
         if product_id:
-            query = query.filter(InventoryLog.product_id == product_id)
+            conditions.append(InventoryLog.product_id == product_id)
         if order_id:
-            query = query.filter(InventoryLog.order_id == order_id)
+            conditions.append(InventoryLog.order_id == order_id)
         if change_type:
-            query = query.filter(InventoryLog.change_type == change_type)
+            conditions.append(InventoryLog.change_type == change_type)
         if start_date:
             start_dt = dt.fromisoformat(start_date)
-            query = query.filter(InventoryLog.created_at >= start_dt)
+            conditions.append(InventoryLog.created_at >= start_dt)
         if end_date:
             end_dt = dt.fromisoformat(end_date)
-            query = query.filter(InventoryLog.created_at <= end_dt)
+            conditions.append(InventoryLog.created_at <= end_dt)
         
         # 获取总数
-        total = query.count()
+        total = await db.scalar(
+            select(func.count()).select_from(InventoryLog).where(*conditions)
+        )
         
         # 分页查询
-        logs = query.order_by(desc(InventoryLog.created_at)).offset((page - 1) * page_size).limit(page_size).all()
+        result = await db.execute(
+            select(InventoryLog)
+            .where(*conditions)
+            .order_by(desc(InventoryLog.created_at))
+            .offset((page - 1) * page_size)
+            .limit(page_size)
+        )
+        logs = result.scalars().all()
         
         # 计算总页数
         total_pages = (total + page_size - 1) // page_size
@@ -155,88 +175,185 @@ async def get_inventory_logs(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"查询库存流水失败：{str(e)}")
+        logger.error("查询库存流水失败：%s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.post("/cleanup/manual")
-async def manual_cleanup(
-    batch_size: int = 500,
-    db: Session = Depends(get_db)
-):
-    """手动触发清理任务（直接操作数据库）"""
+def _run_manual_cleanup(batch_size: int) -> int:
+    """使用同步会话执行过期预占清理（同步批量 SQL + Redis 调用，需在线程池中执行）"""
+    from app.services.inventory_log import InventoryLogService
+    from app.services.inventory_service import get_global_cache_service
+    from app.core.redis import redis_client
+    
+    db = SessionLocal()
     try:
-        from app.models.inventory_reservations import InventoryReservation, ReservationStatus
-        from datetime import datetime, timedelta
-        
-        # 查找过期的预占记录
-        expired_threshold = datetime.utcnow() - timedelta(seconds=900)  # 15分钟
-        
-        expired_reservations = db.query(InventoryReservation).filter(
-            InventoryReservation.status == ReservationStatus.RESERVED,
-            InventoryReservation.expired_at < expired_threshold
-        ).limit(batch_size).all()
-        
-        count = 0
-        for res in expired_reservations:
-            # 释放预占
-            res.status = ReservationStatus.EXPIRED
-            count += 1
-        
-        db.commit()
-        return {
-            "success": True, 
-            "message": f"手动清理完成", 
-            "cleaned_count": count
-        }
+        return InventoryLogService(
+            db, get_global_cache_service(redis_client)
+        ).cleanup_expired_reservations(batch_size)
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+@router.post("/cleanup/manual", response_model=CleanupResponse)
+async def manual_cleanup(batch_size: int = 500):
+    """手动触发清理任务（直接操作数据库）
+    
+    清理逻辑为同步 SQL 与同步 Redis 调用，放到线程池执行，避免阻塞事件循环。
+    """
+    try:
+        count = await run_in_threadpool(_run_manual_cleanup, batch_size)
+        return CleanupResponse(
+            success=True,
+            message="手动清理完成",
+            cleaned_count=count
+        )
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"手动清理失败：{str(e)}")
-        db.rollback()
+        logger.error("手动清理失败：%s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.post("/cleanup/celery")
-async def celery_cleanup(batch_size: int = 500):
-    """触发 Celery 异步清理任务（方式三：Celery 调用）"""
+# 单次提交的最大分片数
+CLEANUP_MAX_SHARDS = 16
+
+
+def _cleanup_shard_count(expired_count: int, batch_size: int) -> int:
+    """按待清理数量计算分片数，每片至少一个批次大小"""
+    return min(CLEANUP_MAX_SHARDS, (expired_count - 1) // batch_size + 1)
+
+
+@router.post("/cleanup/celery", response_model=CeleryTaskResponse)
+async def celery_cleanup(batch_size: int = 500, db: AsyncSession = Depends(get_db)):
+    """触发 Celery 异步清理任务（方式三：Celery 调用）
+    
+    按 id % shards 将过期预占分成互不相交的分片，一次性以 group 提交给多个 worker 并行清理，
+    全部分片完成后由汇总回调清除运行标记。返回的任务ID即汇总回调任务ID。
+    """
     try:
-        task = celery_cleanup_task.delay(batch_size)
-        return {
-            "success": True,
-            "message": "已提交异步清理任务",
-            "task_id": task.id
-        }
+        # 预先生成任务ID写入运行标记；已有清理任务在运行时直接返回其任务ID，
+        # 避免重复任务争抢同一批行锁
+        task_id = uuid4().hex
+        if not await async_redis.set(CLEANUP_RUNNING_KEY, task_id, nx=True, ex=CLEANUP_RUNNING_TTL):
+            return CeleryTaskResponse(
+                success=True,
+                message="清理任务已在运行",
+                task_id=await async_redis.get(CLEANUP_RUNNING_KEY)
+            )
+        
+        try:
+            expired_count = (await db.execute(
+                select(func.count())
+                .select_from(InventoryReservation)
+                .where(
+                    InventoryReservation.status == ReservationStatus.RESERVED,
+                    InventoryReservation.expired_at <= func.now()
+                )
+            )).scalar_one()
+            if not expired_count:
+                await async_redis.delete(CLEANUP_RUNNING_KEY)
+                return CeleryTaskResponse(
+                    success=True,
+                    message="没有需要清理的过期预占记录",
+                    task_id=None
+                )
+            
+            shards = _cleanup_shard_count(expired_count, batch_size)
+            workflow = chord(
+                [
+                    celery_app.signature(CLEANUP_TASK_NAME, args=(batch_size, shard, shards))
+                    for shard in range(shards)
+                ],
+                celery_app.signature(FINISH_CLEANUP_TASK_NAME).set(task_id=task_id)
+            )
+            # apply_async() 会同步连接 broker 并序列化参数，放到线程池执行，避免阻塞事件循环
+            task = await run_in_threadpool(workflow.apply_async)
+        except Exception:
+            await async_redis.delete(CLEANUP_RUNNING_KEY)
+            raise
+        return CeleryTaskResponse(
+            success=True,
+            message=f"已提交异步清理任务（{shards} 个分片）",
+            task_id=task.id
+        )
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Celery 任务提交失败：{str(e)}")
+        logger.error("Celery 任务提交失败：%s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.get("/cleanup/status/{task_id}")
+# 已结束任务的状态缓存（结果不会再变化，无需反复查询 result backend）
+_TASK_STATUS_CACHE_SIZE = 1024
+# Redis 中已结束任务状态的缓存键前缀与过期时间（秒）
+TASK_STATUS_KEY_PREFIX = "celery:status:"
+TASK_STATUS_CACHE_TTL = 3600
+_finished_task_status: "OrderedDict[str, TaskStatusResponse]" = OrderedDict()
+
+
+# 任务状态 -> 状态描述
+_TASK_STATUS_FORMATTERS = {
+    'PENDING': lambda task: "任务等待中",
+    'SUCCESS': lambda task: f"任务完成：{task.result}",
+    'FAILURE': lambda task: f"任务失败：{str(task.info)}",
+}
+
+
+def _fetch_task_status(task_id: str) -> TaskStatusResponse:
+    """查询 Celery 任务状态（同步调用 result backend）"""
+    task = celery_app.AsyncResult(task_id)
+    state = task.state
+    
+    formatter = _TASK_STATUS_FORMATTERS.get(state)
+    status = formatter(task) if formatter else f"任务状态：{state}"
+    
+    return TaskStatusResponse(
+        task_id=task_id,
+        status=status,
+        state=state
+    )
+
+
+def _remember_finished_status(result: TaskStatusResponse):
+    """将已结束任务的状态写入进程内 LRU 缓存"""
+    _finished_task_status[result.task_id] = result
+    if len(_finished_task_status) > _TASK_STATUS_CACHE_SIZE:
+        _finished_task_status.popitem(last=False)
+
+
+@router.get("/cleanup/status/{task_id}", response_model=TaskStatusResponse)
 async def get_cleanup_status(task_id: str):
-    """查询 Celery 任务执行状态"""
+    """查询 Celery 任务执行状态
+    
+    已结束任务的状态不会再变化：先查进程内缓存，再查 Redis 共享缓存
+    （多 worker 共用），都未命中才访问 Celery result backend。
+    """
+    cached = _finished_task_status.get(task_id)
+    if cached is not None:
+        return cached
+    
     try:
-        from celery_app import app
-        task = app.AsyncResult(task_id)
+        status_key = f"{TASK_STATUS_KEY_PREFIX}{task_id}"
+        cached_raw = await async_redis.get(status_key)
+        if cached_raw is not None:
+            result = TaskStatusResponse.model_validate_json(cached_raw)
+            _remember_finished_status(result)
+            return result
         
-        if task.state == 'PENDING':
-            status = "任务等待中"
-        elif task.state == 'SUCCESS':
-            status = f"任务完成：{task.result}"
-        elif task.state == 'FAILURE':
-            status = f"任务失败：{str(task.info)}"
-        else:
-            status = f"任务状态：{task.state}"
-            
-        return {
-            "task_id": task_id,
-            "status": status,
-            "state": task.state
-        }
+        result = await run_in_threadpool(_fetch_task_status, task_id)
+        
+        if result.state in ('SUCCESS', 'FAILURE', 'REVOKED'):
+            _remember_finished_status(result)
+            await async_redis.set(
+                status_key, result.model_dump_json(), ex=TASK_STATUS_CACHE_TTL
+            )
+        
+        return result
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"查询任务状态失败：{str(e)}")
+        logger.error("查询任务状态失败：%s", e)
         raise HTTPException(status_code=500, detail=str(e))
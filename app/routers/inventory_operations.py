@@ -1,19 +1,61 @@
 """库存操作 API 路由（预占、确认、释放）- 纯 Redis 操作"""
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Path
+from fastapi import APIRouter, HTTPException, Query, Path
+from starlette.concurrency import run_in_threadpool
+from contextlib import asynccontextmanager
+from typing import Dict
+import asyncio
 import logging
 
-from app.core.dependencies import get_redis
-from app.services.inventory_service import InventoryService
-from app.schemas.inventory_api import OperationResponse
+from app.core.dependencies import get_inventory_service
+from app.core.errors import InventoryError, InventoryErrorCode
+from app.schemas.inventory_api import OperationResponse, ORDER_ID_PATTERN
 
 logger = logging.getLogger(__name__)
 router = APIRouter(tags=["库存管理"])
 
+# 库存服务单例（模块级引用，避免每个请求走依赖解析）
+inventory_service = get_inventory_service()
+
+# 成功响应消息常量（响应对象由 handler 自行构造，使用 model_construct 跳过重复校验）
+_MSG_RESERVE_OK = "预占成功"
+_MSG_CONFIRM_OK = "确认成功"
+_MSG_RELEASE_OK = "释放成功"
+
+# 单个商品同时进入线程池执行预占的最大请求数
+RESERVE_CONCURRENCY_PER_PRODUCT = 8
+
+
+# product_id -> [信号量, 持有或等待该信号量的请求数]
+# 计数归零才删除：表中只有正在使用的商品，不会在请求持有期间被淘汰
+_reserve_semaphores: Dict[int, list] = {}
+
+
+@asynccontextmanager
+async def _reserve_slot(product_id: int):
+    """按商品限制同时执行预占的请求数
+    
+    热点商品突发流量时，超出部分在进程内排队，避免同一商品的请求占满线程池、
+    集中冲击 Redis 上的同一个 key。
+    计数的增减都在事件循环线程内同步完成，无需加锁。
+    """
+    entry = _reserve_semaphores.get(product_id)
+    if entry is None:
+        entry = _reserve_semaphores[product_id] = [asyncio.Semaphore(RESERVE_CONCURRENCY_PER_PRODUCT), 0]
+    entry[1] += 1
+    try:
+        async with entry[0]:
+            yield
+    finally:
+        entry[1] -= 1
+        if entry[1] == 0:
+            del _reserve_semaphores[product_id]
+
 
 @router.post(
     "/reserve",
     response_model=OperationResponse,
+    response_model_exclude_unset=True,
     summary="预占库存",
     description="""预占指定商品的库存数量，防止超卖。
     
@@ -87,12 +129,10 @@ async def reserve_stock(
     ),
     order_id: str = Query(
         ..., 
-        min_length=1,
-        max_length=64,
+        pattern=ORDER_ID_PATTERN,
         description="订单 ID",
         examples=["ORD202401010001"]
-    ),
-    redis = Depends(get_redis)
+    )
 ):
     """预占库存（支持多仓库）- 纯 Redis 操作"""
     # 参数合法性校验
@@ -108,30 +148,21 @@ async def reserve_stock(
     # 2. 校验 product_id 是否存在（使用 BloomFilter 快速过滤）
     from app.services.bloom_filter import product_bloom_filter
     if product_bloom_filter.is_initialized() and not product_bloom_filter.contains(product_id):
-        raise HTTPException(status_code=404, detail="商品不存在")
+        raise InventoryError(404, InventoryErrorCode.PRODUCT_NOT_FOUND, "商品不存在")
     
     # 3. 校验 quantity 范围
     if quantity > 10000:
         raise HTTPException(status_code=400, detail="单次预占数量不能超过 10000")
     
-    # 4. 校验 order_id 格式
-    if not order_id.replace("_", "").replace("-", "").isalnum():
-        raise HTTPException(status_code=400, detail="订单ID格式不正确")
-    
-    try:
-        service = InventoryService(redis)
-        result = service.reserve_stock(warehouse_id, product_id, quantity, order_id)
-        return {"success": True, "message": "预占成功", "data": result}
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"预占库存失败：{str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
+    async with _reserve_slot(product_id):
+        result = await run_in_threadpool(inventory_service.reserve_stock, warehouse_id, product_id, quantity, order_id)
+    return OperationResponse.model_construct(success=True, message=_MSG_RESERVE_OK, data=result)
 
 
 @router.post(
     "/confirm/{order_id}",
     response_model=OperationResponse,
+    response_model_exclude_unset=True,
     summary="确认库存扣减",
     description="""确认预占的库存，实际扣减商品库存。
     
@@ -168,26 +199,20 @@ async def reserve_stock(
 async def confirm_stock(
     order_id: str = Path(
         ..., 
+        pattern=ORDER_ID_PATTERN,
         description="订单 ID",
         examples=["ORD202401010001"]
-    ),
-    redis = Depends(get_redis)
+    )
 ):
     """确认库存扣减 - 纯 Redis 操作"""
-    try:
-        service = InventoryService(redis)
-        result = service.confirm_stock(order_id)
-        return {"success": True, "message": "确认成功", "data": result}
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"确认库存失败：{str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
+    result = await run_in_threadpool(inventory_service.confirm_stock, order_id)
+    return OperationResponse.model_construct(success=True, message=_MSG_CONFIRM_OK, data=result)
 
 
 @router.post(
     "/release/{order_id}",
     response_model=OperationResponse,
+    response_model_exclude_unset=True,
     summary="释放预占库存",
     description="""释放预占的库存，归还给可用库存。
     
@@ -225,18 +250,11 @@ async def confirm_stock(
 async def release_stock(
     order_id: str = Path(
         ..., 
+        pattern=ORDER_ID_PATTERN,
         description="订单 ID",
         examples=["ORD202401010001"]
-    ),
-    redis = Depends(get_redis)
+    )
 ):
     """释放预占库存 - 纯 Redis 操作"""
-    try:
-        service = InventoryService(redis)
-        result = service.release_stock(order_id)
-        return {"success": True, "message": "释放成功", "data": result}
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"释放库存失败：{str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+    result = await run_in_threadpool(inventory_service.release_stock, order_id)
+    return OperationResponse.model_construct(success=True, message=_MSG_RELEASE_OK, data=result)
\ No newline at end of file
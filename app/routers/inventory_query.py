@@ -1,10 +1,10 @@
 """库存查询 API 路由 - 纯 Redis 查询，零数据库访问"""
 
-from fastapi import APIRouter, HTTPException, Query, Body, Path, Depends
+from fastapi import APIRouter, Query, Body, Path
 import logging
 
-from app.core.dependencies import get_redis
-from app.services.inventory_service import InventoryService
+from app.core.dependencies import get_async_query_service
+from app.core.responses import FastBatchResponse
 from app.schemas.inventory_api import (
     StockResponse,
     BatchStockResponse,
@@ -14,6 +14,9 @@ from app.schemas.inventory_api import (
 logger = logging.getLogger(__name__)
 router = APIRouter(tags=["库存管理"])
 
+# 异步查询服务单例（模块级引用，避免每个请求走依赖解析）：Redis 往返直接 await，不占用线程池
+query_service = get_async_query_service()
+
 
 @router.get(
     "/stock/{product_id}",
@@ -63,42 +66,35 @@ async def get_stock(
         max_length=32,
         description="仓库 ID",
         examples=["WH01"]
-    ),
-    redis = Depends(get_redis)
+    )
 ):
     """查询商品库存（支持多仓库）- 纯 Redis 查询"""
     # 如果未提供 warehouse_id，使用默认值
     if not warehouse_id:
         warehouse_id = "WH01"
     
-    try:
-        service = InventoryService(redis)
-        stock_info = service.get_full_stock_info(warehouse_id, product_id)
-        if not stock_info:
-            return StockResponse(
-                success=True,
-                warehouse_id=warehouse_id,
-                product_id=product_id,
-                available_stock=0,
-                reserved_stock=0,
-                frozen_stock=0,
-                safety_stock=0,
-                total_stock=0
-            )
+    stock_info = await query_service.get_full_stock_info(warehouse_id, product_id)
+    if not stock_info:
         return StockResponse(
             success=True,
-            **stock_info
+            warehouse_id=warehouse_id,
+            product_id=product_id,
+            available_stock=0,
+            reserved_stock=0,
+            frozen_stock=0,
+            safety_stock=0,
+            total_stock=0
         )
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"查询库存失败：{str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
+    return StockResponse(
+        success=True,
+        **stock_info
+    )
 
 
 @router.post(
     "/stock/batch",
     response_model=BatchStockResponse,
+    response_class=FastBatchResponse,
     summary="批量查询商品库存",
     description="""批量查询多个商品的库存数量。
     
@@ -142,23 +138,13 @@ async def batch_get_stocks(
     request: BatchStockQueryRequest = Body(
         ..., 
         description="批量查询请求参数"
-    ),
-    redis = Depends(get_redis)
+    )
 ):
     """批量查询商品库存（支持多仓库）- 纯 Redis 查询"""
     # 如果未提供 warehouse_id，使用默认值
     if not warehouse_id:
         warehouse_id = "WH01"
     
-    try:
-        service = InventoryService(None, redis)
-        stocks = service.batch_get_stocks(warehouse_id, request.product_ids)
-        return BatchStockResponse(
-            success=True,
-            data=stocks
-        )
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"批量查询库存失败：{str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
+    stocks = await query_service.batch_get_stocks(warehouse_id, request.product_ids)
+    # Dict[int, int] 由 orjson 直接输出，跳过 response_model 的逐键转换
+    return FastBatchResponse({"success": True, "message": None, "data": stocks})
@@ -147,7 +147,7 @@ async def test_single_api(request: SinglePerfTestRequest):
         # 保存结果到文件
         result_data = {
             "test_name": request.api_name,
-            "config": request.dict(),
+            "config": request.model_dump(mode="json"),
             "metrics": result.to_dict(),
             "timestamp": datetime.now().isoformat()
         }
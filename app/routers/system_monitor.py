@@ -87,7 +87,7 @@ async def get_cpu_usage():
             per_cpu=[round(x, 2) for x in per_cpu] if per_cpu else None
         )
     except Exception as e:
-        logger.error(f"获取 CPU 使用率失败: {e}")
+        logger.error("获取 CPU 使用率失败: %s", e)
         raise HTTPException(status_code=500, detail=f"获取 CPU 使用率失败: {str(e)}")
 
 
@@ -113,7 +113,7 @@ async def get_memory_usage():
             percent=round(memory.percent, 2)
         )
     except Exception as e:
-        logger.error(f"获取内存使用率失败: {e}")
+        logger.error("获取内存使用率失败: %s", e)
         raise HTTPException(status_code=500, detail=f"获取内存使用率失败: {str(e)}")
 
 
@@ -139,7 +139,7 @@ async def get_disk_usage():
             percent=round(disk.percent, 2)
         )
     except Exception as e:
-        logger.error(f"获取磁盘使用率失败: {e}")
+        logger.error("获取磁盘使用率失败: %s", e)
         raise HTTPException(status_code=500, detail=f"获取磁盘使用率失败: {str(e)}")
 
 
@@ -167,7 +167,7 @@ async def get_network_traffic():
             errout=net_io.errout
         )
     except Exception as e:
-        logger.error(f"获取网络流量失败: {e}")
+        logger.error("获取网络流量失败: %s", e)
         raise HTTPException(status_code=500, detail=f"获取网络流量失败: {str(e)}")
 
 
@@ -199,7 +199,7 @@ async def get_db_pool_status():
             **pool_status
         )
     except Exception as e:
-        logger.error(f"获取数据库连接池状态失败: {e}")
+        logger.error("获取数据库连接池状态失败: %s", e)
         raise HTTPException(status_code=500, detail=f"获取数据库连接池状态失败: {str(e)}")
 
 
@@ -228,7 +228,7 @@ async def get_redis_info():
             version=info.get("redis_version", "unknown")
         )
     except Exception as e:
-        logger.error(f"获取 Redis 信息失败: {e}")
+        logger.error("获取 Redis 信息失败: %s", e)
         raise HTTPException(status_code=500, detail=f"获取 Redis 信息失败: {str(e)}")
 
 
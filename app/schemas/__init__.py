@@ -4,13 +4,14 @@ from app.schemas.base import BaseSchema
 from app.schemas.inventory import (
     ProductImageSchema,
     ProductSchema,
-    ReserveStockRequest,
+    StockItemRequest,
     StockStatusResponse,
     LockProductsRequest,
     LockProductsResponse,
     DeductStockRequest,
     DeductStockResponse,
 )
+from app.schemas.inventory_api import ReserveStockRequest
 from app.schemas.order import (
     OrderItemSchema,
     OrderSchema,
@@ -35,6 +36,7 @@ __all__ = [
     "ProductImageSchema",
     "ProductSchema",
     "ReserveStockRequest",
+    "StockItemRequest",
     "StockStatusResponse",
     "LockProductsRequest",
     "LockProductsResponse",
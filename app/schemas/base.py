@@ -1,5 +1,5 @@
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional
 from datetime import datetime
 
@@ -8,5 +8,4 @@ class BaseSchema(BaseModel):
     created_at: Optional[datetime]
     updated_at: Optional[datetime]
 
-    class Config:
-        orm_mode = True  # 支持从 ORM 对象直接生成 Schema
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)  # 支持从 ORM 对象直接生成 Schema
\ No newline at end of file
@@ -1,7 +1,9 @@
-# app/schemas/product.py
-from pydantic import BaseModel, Field
+# app/schemas/inventory.py
+from pydantic import BaseModel, ConfigDict
 from typing import List, Optional
 
+from app.schemas.inventory_api import ProductId, Quantity
+
 
 
 class ProductImageSchema(BaseModel):
@@ -10,8 +12,7 @@ class ProductImageSchema(BaseModel):
     is_main: bool
     sort_order: int
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 class ProductSchema(BaseModel):
     id: int
@@ -25,13 +26,12 @@ class ProductSchema(BaseModel):
     category_id: Optional[int]
     images: List[ProductImageSchema] = []
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
-# 请求扣减库存
-class ReserveStockRequest(BaseModel):
-    product_id: int = Field(..., gt=0)
-    quantity: int = Field(..., gt=0)
+# 扣减库存商品项（不含订单号；带订单号的预占请求见 inventory_api.ReserveStockRequest）
+class StockItemRequest(BaseModel):
+    product_id: ProductId
+    quantity: Quantity
 
 # 响应库存状态
 class StockStatusResponse(BaseModel):
@@ -39,13 +39,13 @@ class StockStatusResponse(BaseModel):
     stock: int
 
 class LockProductsRequest(BaseModel):
-    product_ids: List[int]
+    product_ids: List[ProductId]
 
 class LockProductsResponse(BaseModel):
     locked_product_ids: List[int]
 
 class DeductStockRequest(BaseModel):
-    items: List[ReserveStockRequest]
+    items: List[StockItemRequest]
 
 class DeductStockResponse(BaseModel):
     success: bool
@@ -1,10 +1,20 @@
 """库存API专用的Pydantic模型和响应格式"""
 
-from pydantic import BaseModel, Field
-from typing import List, Dict, Optional
+from pydantic import BaseModel, Field, StringConstraints
+from typing import Annotated, List, Dict, Optional
 from enum import Enum
 
 
+# ==================== 公共字段类型 ====================
+# 各请求模型共用同一组约束类型，pydantic-core 只需编译一份校验逻辑
+
+# 订单 ID 格式：字母、数字、下划线、短横线，1~64 位（由 pydantic-core 一次正则匹配完成校验）
+ORDER_ID_PATTERN = r"^[A-Za-z0-9_-]{1,64}$"
+OrderId = Annotated[str, StringConstraints(pattern=ORDER_ID_PATTERN)]
+ProductId = Annotated[int, Field(gt=0)]
+Quantity = Annotated[int, Field(gt=0)]
+
+
 class ReservationStatus(str, Enum):
     """预占状态枚举"""
     RESERVED = "reserved"
@@ -23,22 +33,18 @@ class InventoryOperationType(str, Enum):
 
 class ReserveStockRequest(BaseModel):
     """预占库存请求"""
-    product_id: int = Field(
+    product_id: ProductId = Field(
         ..., 
-        gt=0, 
         description="商品 ID",
         examples=[1]
     )
-    quantity: int = Field(
+    quantity: Quantity = Field(
         ..., 
-        gt=0, 
         description="预占数量",
         examples=[2]
     )
-    order_id: str = Field(
+    order_id: OrderId = Field(
         ..., 
-        min_length=1,
-        max_length=64,
         description="订单 ID",
         examples=["ORD202401010001"]
     )
@@ -46,7 +52,7 @@ class ReserveStockRequest(BaseModel):
 
 class BatchStockQueryRequest(BaseModel):
     """批量查询库存请求"""
-    product_ids: List[int] = Field(
+    product_ids: List[ProductId] = Field(
         ...,
         min_length=1,
         max_length=100,
@@ -75,15 +81,13 @@ class IncreaseStockRequest(BaseModel):
         description="仓库 ID",
         examples=["WH01"]
     )
-    product_id: int = Field(
+    product_id: ProductId = Field(
         ...,
-        gt=0,
         description="商品 ID",
         examples=[1]
     )
-    quantity: int = Field(
+    quantity: Quantity = Field(
         ...,
-        gt=0,
         description="入库数量",
         examples=[100]
     )
@@ -116,9 +120,8 @@ class AdjustStockRequest(BaseModel):
         description="仓库 ID",
         examples=["WH01"]
     )
-    product_id: int = Field(
+    product_id: ProductId = Field(
         ...,
-        gt=0,
         description="商品 ID",
         examples=[1]
     )
@@ -127,9 +130,8 @@ class AdjustStockRequest(BaseModel):
         description="调整类型：increase(增加) / decrease(减少) / set(设置为)",
         examples=["increase"]
     )
-    quantity: int = Field(
+    quantity: Quantity = Field(
         ...,
-        gt=0,
         description="调整数量",
         examples=[10]
     )
@@ -157,15 +159,13 @@ class FreezeStockRequest(BaseModel):
         description="仓库 ID",
         examples=["WH01"]
     )
-    product_id: int = Field(
+    product_id: ProductId = Field(
         ...,
-        gt=0,
         description="商品 ID",
         examples=[1]
     )
-    quantity: int = Field(
+    quantity: Quantity = Field(
         ...,
-        gt=0,
         description="冻结数量",
         examples=[5]
     )
@@ -192,15 +192,13 @@ class UnfreezeStockRequest(BaseModel):
         description="仓库 ID",
         examples=["WH01"]
     )
-    product_id: int = Field(
+    product_id: ProductId = Field(
         ...,
-        gt=0,
         description="商品 ID",
         examples=[1]
     )
-    quantity: int = Field(
+    quantity: Quantity = Field(
         ...,
-        gt=0,
         description="解冻数量",
         examples=[5]
     )
@@ -227,15 +225,13 @@ class BatchReserveItem(BaseModel):
         description="仓库 ID",
         examples=["WH01"]
     )
-    product_id: int = Field(
+    product_id: ProductId = Field(
         ...,
-        gt=0,
         description="商品 ID",
         examples=[1]
     )
-    quantity: int = Field(
+    quantity: Quantity = Field(
         ...,
-        gt=0,
         description="预占数量",
         examples=[2]
     )
@@ -243,10 +239,8 @@ class BatchReserveItem(BaseModel):
 
 class BatchReserveRequest(BaseModel):
     """批量预占请求"""
-    order_id: str = Field(
+    order_id: OrderId = Field(
         ...,
-        min_length=1,
-        max_length=64,
         description="订单 ID",
         examples=["ORD202401010001"]
     )
@@ -264,10 +258,8 @@ class BatchReserveRequest(BaseModel):
 
 class BatchReleaseRequest(BaseModel):
     """批量释放请求"""
-    order_id: str = Field(
+    order_id: OrderId = Field(
         ...,
-        min_length=1,
-        max_length=64,
         description="订单 ID",
         examples=["ORD202401010001"]
     )
@@ -336,6 +328,19 @@ class OperationResponse(BaseResponse):
     )
 
 
+class BatchReleaseResponse(BaseResponse):
+    """批量释放响应"""
+    order_id: str = Field(
+        ...,
+        description="订单 ID"
+    )
+    released_count: int = Field(
+        0,
+        ge=0,
+        description="释放数量"
+    )
+
+
 class CleanupResponse(BaseResponse):
     """清理任务响应"""
     cleaned_count: Optional[int] = Field(
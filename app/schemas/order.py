@@ -1,9 +1,9 @@
 # app/schemas/order.py
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from typing import List, Optional
 from decimal import Decimal
 from datetime import datetime
-from app.schemas.inventory import ReserveStockRequest
+from app.schemas.inventory import StockItemRequest
 
 class OrderItemSchema(BaseModel):
     product_id: int
@@ -11,8 +11,7 @@ class OrderItemSchema(BaseModel):
     quantity: int
     unit_price: Decimal
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 class OrderSchema(BaseModel):
     id: int
@@ -25,14 +24,13 @@ class OrderSchema(BaseModel):
     cancelled_at: Optional[datetime]
     items: List[OrderItemSchema] = []
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 # 创建订单请求
 class CreateOrderRequest(BaseModel):
     user_id: int
     address_snapshot: dict
-    items: List[ReserveStockRequest]  # 复用库存扣减请求
+    items: List[StockItemRequest]  # 复用库存扣减商品项
 
 # 创建订单响应
 class CreateOrderResponse(BaseModel):
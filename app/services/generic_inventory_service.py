@@ -9,6 +9,7 @@
 import logging
 from typing import Optional, List, Dict, Any
 from redis import Redis
+from sqlalchemy import UniqueConstraint
 
 from app.core.model_factory import (
     create_product_model,
@@ -23,6 +24,32 @@ from app.services.inventory_reservation import InventoryReservationService
 
 logger = logging.getLogger(__name__)
 
+# 库存行的业务键：同步时只写入这两列定位行，ON CONFLICT 的冲突目标必须落在它们上
+_STOCK_KEY_COLUMNS = frozenset({"warehouse_id", "product_id"})
+
+
+def _stock_conflict_columns(model) -> List[str]:
+    """从库存模型的唯一索引/唯一约束中取出 ON CONFLICT 的冲突目标列
+    
+    只接受列全部属于 (warehouse_id, product_id) 的非部分唯一索引，
+    配置的模型没有这样的唯一索引时直接报错，而不是让数据库在执行时拒绝语句。
+    """
+    table = model.__table__
+    candidates = [
+        idx for idx in sorted(table.indexes, key=lambda idx: idx.name or "")
+        if idx.unique and not idx.dialect_kwargs.get("postgresql_where")
+    ]
+    candidates += [c for c in table.constraints if isinstance(c, UniqueConstraint)]
+    
+    for candidate in candidates:
+        columns = [column.name for column in candidate.columns]
+        if columns and set(columns) <= _STOCK_KEY_COLUMNS:
+            return columns
+    
+    raise RuntimeError(
+        f"库存模型 {table.name} 缺少 (warehouse_id, product_id) 上的唯一索引，无法按冲突更新同步库存"
+    )
+
 
 class GenericInventoryService:
     """
@@ -161,7 +188,10 @@ class GenericInventoryService:
             product_id: 商品 ID
             db_session: SQLAlchemy Session
         """
-        from sqlalchemy import select
+        from sqlalchemy import func, text
+        from sqlalchemy.dialects.postgresql import insert
+        
+        conflict_columns = _stock_conflict_columns(self.ProductStock)
         
         # 从 Redis 获取完整库存信息
         stock_info = self.get_full_stock_info(warehouse_id, product_id)
@@ -170,32 +200,35 @@ class GenericInventoryService:
             logger.warning(f"Redis 中没有 {warehouse_id}:{product_id} 的库存信息")
             return
         
-        # 查询数据库中是否存在
-        stmt = select(self.ProductStock).where(
-            self.ProductStock.warehouse_id == warehouse_id,
-            self.ProductStock.product_id == product_id
+        # 单条 INSERT ... ON CONFLICT DO UPDATE 写入：冲突目标取自模型上 (warehouse_id, product_id) 的唯一索引，
+        # 不再先查询再更新/插入，省一次往返，也没有查询与写入之间的并发窗口
+        values = {
+            "available_stock": stock_info["available_stock"],
+            "reserved_stock": stock_info["reserved_stock"],
+            "frozen_stock": stock_info["frozen_stock"],
+            "safety_stock": stock_info["safety_stock"],
+        }
+        stmt = insert(self.ProductStock).values(
+            warehouse_id=warehouse_id,
+            product_id=product_id,
+            **values
         )
-        stock_record = db_session.execute(stmt).scalar_one_or_none()
-        
-        if stock_record:
-            # 更新现有记录
-            stock_record.available_stock = stock_info["available_stock"]
-            stock_record.reserved_stock = stock_info["reserved_stock"]
-            stock_record.frozen_stock = stock_info["frozen_stock"]
-            stock_record.safety_stock = stock_info["safety_stock"]
-            logger.info(f"更新数据库库存：{warehouse_id}:{product_id}")
-        else:
-            # 创建新记录
-            new_stock = self.ProductStock(
-                warehouse_id=warehouse_id,
-                product_id=product_id,
-                available_stock=stock_info["available_stock"],
-                reserved_stock=stock_info["reserved_stock"],
-                frozen_stock=stock_info["frozen_stock"],
-                safety_stock=stock_info["safety_stock"]
-            )
-            db_session.add(new_stock)
+        update_values = dict(values)
+        # ON CONFLICT DO UPDATE 不会触发 ORM 的 onupdate，需显式刷新更新时间
+        if "updated_at" in self.ProductStock.__table__.c:
+            update_values["updated_at"] = func.now()
+        # xmax = 0 表示本次是插入新行，否则是更新已有行
+        inserted = db_session.execute(
+            stmt.on_conflict_do_update(
+                index_elements=conflict_columns,
+                set_=update_values
+            ).returning(text("xmax = 0"))
+        ).scalar()
+        
+        if inserted:
             logger.info(f"创建数据库库存：{warehouse_id}:{product_id}")
+        else:
+            logger.info(f"更新数据库库存：{warehouse_id}:{product_id}")
         
         db_session.commit()
 
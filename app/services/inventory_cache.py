@@ -1,44 +1,213 @@
 """库存缓存服务 - 纯Redis操作，数据永不过期"""
 
-from typing import Optional, Dict, Any
+from collections import OrderedDict
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from typing import Callable, Optional, Dict, Any
 import logging
-import json
+import threading
+import time
+import orjson
 from redis import Redis
 
+from app.core.cache_invalidation import register_invalidation_listener, register_subscription_listener
+from app.core.config import settings
+from app.core.redis import redis_client
+
 logger = logging.getLogger(__name__)
 
+# 单条 MGET 的最大 key 数，避免单条命令过大阻塞 Redis
+MGET_CHUNK_SIZE = 50
+
+# L1 未命中时等待同键加载结果的最长时间（秒），超时后自行回源
+L1_SINGLE_FLIGHT_WAIT = 0.05
+
+
+# ==================== 进程内库存缓存（L1） ====================
+
+class LocalStockCache:
+    """进程内可用库存缓存（LRU + TTL，线程安全）
+
+    位于 Redis 之前，只服务只读查询。由 Redis 键空间通知失效，TTL 兜底。
+    只有失效通知订阅就绪（set_active(True)）后才读写，否则直接绕过，
+    避免没有失效通知时在 TTL 内返回陈旧库存（如 CONFIG 被禁用、Celery 等无订阅者的进程）。
+    失效时记录键的失效时间：读 Redis 之前取 read_started，回填时若该键在此之后被失效过
+    则放弃回填，避免慢读把旧值写回 L1。
+    同一个键同时未命中时只有一个线程回源（single-flight），其余线程等待其结果。
+    """
+
+    def __init__(self, maxsize: int = 10_000, ttl: float = 30.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[str, tuple]" = OrderedDict()  # key -> (value, expires_at)
+        self._invalidated: "OrderedDict[str, float]" = OrderedDict()  # key -> 最近失效时间
+        self._cleared_at = 0.0  # 整体清空时间（淘汰的失效记录也并入这里）
+        self._inflight: Dict[str, Future] = {}  # key -> 正在回源的结果
+        self._active = False  # 失效通知订阅是否就绪
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.maxsize > 0 and self._active
+
+    def set_active(self, active: bool):
+        """失效通知订阅建立 / 断开时切换 L1 是否启用"""
+        self._active = active
+
+    @staticmethod
+    def now() -> float:
+        return time.monotonic()
+
+    def get_many(self, keys: Dict[Any, str]) -> Dict[Any, int]:
+        """批量读取，keys 为 {标识: 缓存键}，返回命中的 {标识: 值}"""
+        if not self.enabled:
+            return {}
+        now = self.now()
+        hits = {}
+        with self._lock:
+            for ident, key in keys.items():
+                entry = self._data.get(key)
+                if entry is None:
+                    continue
+                if entry[1] <= now:
+                    del self._data[key]
+                    continue
+                self._data.move_to_end(key)
+                hits[ident] = entry[0]
+        return hits
+
+    def set_many(self, items: Dict[str, int], read_started: float):
+        """批量回填，跳过 read_started 之后被失效过的键"""
+        if not self.enabled or not items:
+            return
+        expires_at = self.now() + self.ttl
+        with self._lock:
+            if read_started <= self._cleared_at:
+                return
+            for key, value in items.items():
+                if self._invalidated.get(key, 0.0) >= read_started:
+                    continue
+                self._data[key] = (value, expires_at)
+                self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def get_or_load(self, key: str, loader: Callable[[], Optional[int]]) -> Optional[int]:
+        """读取单个键，未命中时合并并发回源（single-flight）
+
+        Args:
+            key: 缓存键
+            loader: 回源函数（读 Redis）
+        """
+        if not self.enabled:
+            return loader()
+
+        hit = self.get_many({key: key})
+        if hit:
+            return hit[key]
+
+        with self._lock:
+            future = self._inflight.get(key)
+            is_leader = future is None
+            if is_leader:
+                future = self._inflight[key] = Future()
+
+        if not is_leader:
+            try:
+                return future.result(timeout=L1_SINGLE_FLIGHT_WAIT)
+            except FutureTimeoutError:
+                return loader()
+
+        try:
+            read_started = self.now()
+            value = loader()
+            if value is not None:
+                self.set_many({key: value}, read_started)
+            future.set_result(value)
+            return value
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def invalidate(self, key: Optional[str]):
+        """失效单个键；key 为 None 时整体清空"""
+        now = self.now()
+        with self._lock:
+            if key is None:
+                self._data.clear()
+                self._invalidated.clear()
+                self._cleared_at = now
+                return
+            self._data.pop(key, None)
+            self._invalidated[key] = now
+            self._invalidated.move_to_end(key)
+            while len(self._invalidated) > self.maxsize:
+                _, invalidated_at = self._invalidated.popitem(last=False)
+                self._cleared_at = max(self._cleared_at, invalidated_at)
+
+
+# 全局 L1 实例，由键空间通知驱动失效，订阅就绪后才启用
+local_stock_cache = LocalStockCache(
+    maxsize=settings.STOCK_L1_CACHE_SIZE,
+    ttl=settings.STOCK_L1_CACHE_TTL,
+)
+if local_stock_cache.maxsize > 0:
+    register_invalidation_listener(local_stock_cache.invalidate)
+    register_subscription_listener(local_stock_cache.set_active)
+
 
 # ==================== 预注册的 Lua 脚本（应用启动时注册一次） ====================
+# 预占状态的 Redis 结构：
+# - reservation:{warehouse_id}:{product_id}  集合，成员为尚未确认/释放的订单 ID。
+#   SREM 成功即认领该预占，确认、释放、过期清理三条路径互斥，同一预占只会被处理一次；
+#   成员只由这三条路径显式移除，集合不设过期时间，过期清理时仍能认领未确认的预占
+# - reservation_order:{order_id}  哈希，字段 "{warehouse_id}:{product_id}" -> 预占数量，
+#   确认/释放只凭订单 ID 即可找到预占的商品和数量
+RESERVATION_ORDER_KEY_PREFIX = "reservation_order:"
+
+# 订单预占索引的过期时间（秒）：只作为兜底，需长于预占有效期加上过期清理的间隔
+RESERVATION_ORDER_INDEX_TTL = 86400
+
+# 预占结果状态（预占 Lua 脚本返回）
+RESERVE_OK = 0
+RESERVE_DUPLICATE = 1
+RESERVE_INSUFFICIENT = 2
+
 # 原子扣减库存 Lua 脚本
-# 返回值: [new_stock, is_duplicate]
-# - new_stock: 扣减后的库存（如果失败返回负数）
-# - is_duplicate: 1 表示重复预占，0 表示正常
+# 返回值: [stock, status]
+# - stock: 成功时为扣减后的库存，失败时为当前库存
+# - status: RESERVE_OK / RESERVE_DUPLICATE / RESERVE_INSUFFICIENT
 RESERVE_STOCK_LUA = """
 local stock_key = KEYS[1]
 local reservation_key = KEYS[2]
+local order_key = KEYS[3]
 local quantity = tonumber(ARGV[1])
 local order_id = ARGV[2]
-local ttl = tonumber(ARGV[3])
+local index_field = ARGV[3]
+local index_ttl = tonumber(ARGV[4])
 
 -- 获取当前库存
 local current_stock = tonumber(redis.call('GET', stock_key) or '0')
 
--- 检查库存是否足够
-if current_stock < quantity then
-    return {current_stock, 0}
-end
-
--- 检查是否重复预占
+-- 检查是否重复预占（先于库存检查：售罄后重试的订单仍应识别为重复）
 if redis.call('SISMEMBER', reservation_key, order_id) == 1 then
     return {current_stock, 1}
 end
 
+-- 检查库存是否足够
+if current_stock < quantity then
+    return {current_stock, 2}
+end
+
 -- 原子扣减库存
 local new_stock = redis.call('DECRBY', stock_key, quantity)
 
--- 记录预占信息
+-- 记录预占信息（商品维度集合 + 订单维度索引）
 redis.call('SADD', reservation_key, order_id)
-redis.call('EXPIRE', reservation_key, ttl)
+redis.call('HSET', order_key, index_field, quantity)
+redis.call('EXPIRE', order_key, index_ttl)
 
 return {new_stock, 0}
 """
@@ -66,15 +235,17 @@ return {new_stock, 0}
 """
 
 # 批量原子扣减库存 Lua 脚本
-# 返回值：[[product_id, new_stock, success], ...]
+# 返回值：[product_id, stock, status, ...]，status 含义同单个预占
 BATCH_RESERVE_LUA = """
 local results = {}
 local warehouse_id = ARGV[1]
 local order_id = ARGV[2]
-local n = (#ARGV - 2) / 2
+local index_ttl = tonumber(ARGV[3])
+local order_key = 'reservation_order:' .. order_id
+local n = (#ARGV - 3) / 2
 
 for i = 1, n do
-    local idx = (i - 1) * 2 + 3
+    local idx = (i - 1) * 2 + 4
     local product_id = tonumber(ARGV[idx])
     local quantity = tonumber(ARGV[idx + 1])
 
@@ -84,52 +255,139 @@ for i = 1, n do
     -- 获取当前库存
     local current_stock = tonumber(redis.call('GET', stock_key) or '0')
 
-    -- 检查库存和重复
-    local success = 0
-    if current_stock >= quantity and redis.call('SISMEMBER', reservation_key, order_id) == 0 then
+    -- 检查重复和库存
+    local status = 0
+    if redis.call('SISMEMBER', reservation_key, order_id) == 1 then
+        status = 1
+    elseif current_stock < quantity then
+        status = 2
+    else
         redis.call('DECRBY', stock_key, quantity)
         redis.call('SADD', reservation_key, order_id)
-        redis.call('EXPIRE', reservation_key, 900)
+        redis.call('HSET', order_key, warehouse_id .. ':' .. product_id, quantity)
         current_stock = current_stock - quantity
-        success = 1
     end
 
     table.insert(results, product_id)
     table.insert(results, current_stock)
-    table.insert(results, success == 1)
+    table.insert(results, status)
+end
+
+if redis.call('EXISTS', order_key) == 1 then
+    redis.call('EXPIRE', order_key, index_ttl)
 end
 
 return results
 """
 
+# 确认订单预占 Lua 脚本：按订单索引逐个认领（SREM 成功才算确认），认领后删除索引
+# 返回值：[warehouse_id:product_id, quantity, ...]，只包含本次确认的预占
+CONFIRM_ORDER_LUA = """
+local items = redis.call('HGETALL', KEYS[1])
+local results = {}
+for i = 1, #items, 2 do
+    if redis.call('SREM', 'reservation:' .. items[i], ARGV[1]) == 1 then
+        table.insert(results, items[i])
+        table.insert(results, tonumber(items[i + 1]))
+    end
+end
+redis.call('DEL', KEYS[1])
+return results
+"""
+
+# 释放订单预占 Lua 脚本：认领成功的预占归还可用库存，认领后删除索引
+# 返回值：[warehouse_id:product_id, quantity, new_stock, ...]，只包含本次释放的预占
+RELEASE_ORDER_LUA = """
+local items = redis.call('HGETALL', KEYS[1])
+local results = {}
+for i = 1, #items, 2 do
+    if redis.call('SREM', 'reservation:' .. items[i], ARGV[1]) == 1 then
+        local quantity = tonumber(items[i + 1])
+        table.insert(results, items[i])
+        table.insert(results, quantity)
+        table.insert(results, redis.call('INCRBY', 'stock:available:' .. items[i], quantity))
+    end
+end
+redis.call('DEL', KEYS[1])
+return results
+"""
+
+# 批量释放过期预占 Lua 脚本（清理任务写穿 Redis）
+# ARGV 按 [warehouse_id, product_id, order_id, quantity] 分组
+# 返回值：每组 1 表示本次认领并已归还库存，0 表示预占已被其他路径释放
+RELEASE_EXPIRED_LUA = """
+local results = {}
+for i = 1, #ARGV, 4 do
+    local suffix = ARGV[i] .. ':' .. ARGV[i + 1]
+    if redis.call('SREM', 'reservation:' .. suffix, ARGV[i + 2]) == 1 then
+        redis.call('INCRBY', 'stock:available:' .. suffix, tonumber(ARGV[i + 3]))
+        redis.call('HDEL', 'reservation_order:' .. ARGV[i + 2], suffix)
+        table.insert(results, 1)
+    else
+        table.insert(results, 0)
+    end
+end
+return results
+"""
+
+# 撤销过期预占释放的补偿脚本（数据库事务失败时恢复 Redis）
+REVERT_RELEASE_EXPIRED_LUA = """
+for i = 1, #ARGV, 4 do
+    local suffix = ARGV[i] .. ':' .. ARGV[i + 1]
+    redis.call('DECRBY', 'stock:available:' .. suffix, tonumber(ARGV[i + 3]))
+    redis.call('SADD', 'reservation:' .. suffix, ARGV[i + 2])
+    redis.call('HSET', 'reservation_order:' .. ARGV[i + 2], suffix, ARGV[i + 3])
+end
+return 1
+"""
+
 # 预注册的脚本对象（单例）
 _registered_scripts = {}
 
 
-def init_lua_scripts(redis_client: Redis):
-    """应用启动时预注册所有Lua脚本（只执行一次）
+def _register_lua_scripts(redis_client: Redis):
+    """注册所有Lua脚本（仅在本地计算 SHA，不访问 Redis）
     
-    Args:
-        redis_client: Redis客户端实例
+    调用脚本对象时自动走 EVALSHA，遇到 NOSCRIPT 时回退 EVAL。
     """
     global _registered_scripts
     
+    if not redis_client or _registered_scripts:
+        return
+    
+    _registered_scripts['reserve'] = redis_client.register_script(RESERVE_STOCK_LUA)
+    _registered_scripts['release'] = redis_client.register_script(RELEASE_STOCK_LUA)
+    _registered_scripts['batch_reserve'] = redis_client.register_script(BATCH_RESERVE_LUA)
+    _registered_scripts['confirm_order'] = redis_client.register_script(CONFIRM_ORDER_LUA)
+    _registered_scripts['release_order'] = redis_client.register_script(RELEASE_ORDER_LUA)
+    _registered_scripts['release_expired'] = redis_client.register_script(RELEASE_EXPIRED_LUA)
+    _registered_scripts['revert_release_expired'] = redis_client.register_script(REVERT_RELEASE_EXPIRED_LUA)
+
+
+def init_lua_scripts(redis_client: Redis, *extra_scripts):
+    """应用启动时通过 SCRIPT LOAD 预加载所有Lua脚本
+    
+    预加载后首次调用即可命中 EVALSHA，无需把脚本正文发送到 Redis。
+    所有脚本通过一个管道加载，启动时只需一次网络往返。
+    
+    Args:
+        redis_client: Redis客户端实例
+        extra_scripts: 其他模块注册的脚本对象（如释放锁脚本），一并预加载
+    """
     if not redis_client:
         logger.warning("Redis客户端未初始化，无法注册Lua脚本")
         return
     
-    # 如果已经注册过，直接返回
-    if _registered_scripts:
-        logger.debug("Lua脚本已预注册，跳过")
-        return
+    _register_lua_scripts(redis_client)
     
     try:
-        _registered_scripts['reserve'] = redis_client.register_script(RESERVE_STOCK_LUA)
-        _registered_scripts['release'] = redis_client.register_script(RELEASE_STOCK_LUA)
-        _registered_scripts['batch_reserve'] = redis_client.register_script(BATCH_RESERVE_LUA)
-        logger.info("✅ Lua脚本预注册成功")
+        pipe = redis_client.pipeline(transaction=False)
+        for script in (*_registered_scripts.values(), *extra_scripts):
+            pipe.script_load(script.script)
+        pipe.execute()
+        logger.info("✅ Lua脚本预加载成功（SCRIPT LOAD）")
     except Exception as e:
-        logger.error(f"Lua脚本预注册失败: {e}")
+        logger.error(f"Lua脚本预加载失败: {e}")
         raise
 
 
@@ -145,6 +403,10 @@ def get_registered_script(name: str):
     return _registered_scripts.get(name)
 
 
+# 模块导入时即注册脚本，保证在 lifespan 之前创建的服务单例也能拿到脚本对象
+_register_lua_scripts(redis_client)
+
+
 class InventoryCacheService:
     """库存缓存服务 - 纯Redis操作，数据永不过期"""
 
@@ -154,6 +416,10 @@ class InventoryCacheService:
         self._reserve_script = get_registered_script('reserve')
         self._release_script = get_registered_script('release')
         self._batch_reserve_script = get_registered_script('batch_reserve')
+        self._confirm_order_script = get_registered_script('confirm_order')
+        self._release_order_script = get_registered_script('release_order')
+        self._release_expired_script = get_registered_script('release_expired')
+        self._revert_release_expired_script = get_registered_script('revert_release_expired')
         logger.info("✅ 库存缓存服务已初始化（纯Redis模式，数据永不过期）")
 
     def _get_cache_key(self, warehouse_id: str, product_id: int) -> str:
@@ -209,24 +475,29 @@ class InventoryCacheService:
             logger.error("Redis 未初始化")
             return None
             
-        # 构建所有需要的 key，一次性 MGET 读取
-        keys = [
+        # 单次网络往返，批量读取所有字段
+        values = self.redis.mget(self.full_info_keys(warehouse_id, product_id))
+        return self.parse_full_info(warehouse_id, product_id, values)
+
+    @staticmethod
+    def full_info_keys(warehouse_id: str, product_id: int) -> list:
+        """完整库存信息需要 MGET 的全部 key（同步/异步查询共用）"""
+        return [
             f"stock:full:{warehouse_id}:{product_id}",      # 完整信息
             f"stock:available:{warehouse_id}:{product_id}",  # 可用库存
             f"stock:reserved:{warehouse_id}:{product_id}",   # 预占库存
             f"stock:frozen:{warehouse_id}:{product_id}",     # 冻结库存
             f"stock:safety:{warehouse_id}:{product_id}"      # 安全库存
         ]
-            
-        # 单次网络往返，批量读取所有字段
-        values = self.redis.mget(keys)
-            
+
+    @staticmethod
+    def parse_full_info(warehouse_id: str, product_id: int, values: list) -> Optional[Dict[str, Any]]:
+        """把 full_info_keys 的 MGET 结果解析为完整库存信息，不存在时返回 None"""
         full_info_raw, available_raw, reserved_raw, frozen_raw, safety_raw = values
             
         # 优先使用完整信息缓存
         if full_info_raw:
-            value = full_info_raw.decode('utf-8') if isinstance(full_info_raw, bytes) else full_info_raw
-            info = json.loads(value)
+            info = orjson.loads(full_info_raw)
             logger.debug(f"MGET 命中完整信息：{warehouse_id}:{product_id}")
             return info
             
@@ -264,32 +535,32 @@ class InventoryCacheService:
             return
 
         # 永不过期
-        self.redis.set(cache_key, json.dumps(info))
+        self.redis.set(cache_key, orjson.dumps(info))
         logger.debug(f"Redis full stock cache set (no expiry): {cache_key}")
 
     def invalidate_cache(self, warehouse_id: str, product_id: int):
         """失效库存缓存"""
         if self.redis:
-            self.redis.delete(self._get_cache_key(warehouse_id, product_id))
+            cache_key = self._get_cache_key(warehouse_id, product_id)
+            self.redis.unlink(cache_key)
+            local_stock_cache.invalidate(cache_key)
             logger.debug(f"Cache invalidated for warehouse {warehouse_id}, product {product_id}")
 
     def invalidate_caches(self, items: list):
-        """批量失效缓存（使用管道优化）"""
+        """批量失效缓存（单条 UNLINK，一次往返，Redis 侧异步释放内存）"""
         if not self.redis:
             return
 
-        keys_to_delete = []
-        for item in items:
-            warehouse_id = item.get("warehouse_id")
-            product_id = item.get("product_id")
-            if warehouse_id and product_id:
-                keys_to_delete.append(self._get_cache_key(warehouse_id, product_id))
+        keys_to_delete = {
+            self._get_cache_key(item.get("warehouse_id"), item.get("product_id"))
+            for item in items
+            if item.get("warehouse_id") and item.get("product_id")
+        }
 
         if keys_to_delete:
-            pipe = self.redis.pipeline()
+            self.redis.unlink(*keys_to_delete)
             for key in keys_to_delete:
-                pipe.delete(key)
-            pipe.execute()
+                local_stock_cache.invalidate(key)
             logger.debug(f"Batch cache invalidated: {len(keys_to_delete)} keys")
 
     def batch_get_cached_stocks(self, warehouse_id: str, product_ids: list) -> Dict[int, int]:
@@ -297,34 +568,43 @@ class InventoryCacheService:
         if not self.redis or not product_ids:
             return {}
 
+        # 去重，重复的商品 ID 不会放大请求体
+        product_ids = list(dict.fromkeys(product_ids))
         cache_keys = [self._get_cache_key(warehouse_id, pid) for pid in product_ids]
-        cached_values = self.redis.mget(cache_keys)
-
-        results = {}
-
-        for pid, cached in zip(product_ids, cached_values):
-            if cached is not None:
-                results[pid] = int(cached)
-                logger.debug(f"Batch cache hit for warehouse {warehouse_id}, product {pid}")
-            else:
-                # 未命中的返回0，不查数据库
-                results[pid] = 0
+        
+        if len(cache_keys) <= MGET_CHUNK_SIZE:
+            cached_values = self.redis.mget(cache_keys)
+        else:
+            # 拆成多条小 MGET，通过同一个管道发送，仍只有一次网络往返
+            pipe = self.redis.pipeline(transaction=False)
+            for i in range(0, len(cache_keys), MGET_CHUNK_SIZE):
+                pipe.mget(cache_keys[i:i + MGET_CHUNK_SIZE])
+            cached_values = [value for chunk in pipe.execute() for value in chunk]
+
+        results = self.parse_stock_values(product_ids, cached_values)
+        logger.debug(f"Batch cache get for warehouse {warehouse_id}: {len(product_ids)} keys")
 
         return results
 
+    @staticmethod
+    def parse_stock_values(product_ids: list, cached_values: list) -> Dict[int, int]:
+        """把 MGET 结果按商品 ID 对应起来，未命中的返回0，不查数据库（同步/异步查询共用）"""
+        return {
+            pid: int(cached) if cached is not None else 0
+            for pid, cached in zip(product_ids, cached_values)
+        }
+
     def batch_set_cached_stocks(self, warehouse_id: str, stock_map: dict):
         """批量设置缓存的库存（永不过期）"""
         if not self.redis or not stock_map:
             return
 
-        pipe = self.redis.pipeline(transaction=False)
-
-        for product_id, available in stock_map.items():
-            # 永不过期
-            pipe.set(self._get_cache_key(warehouse_id, product_id), available)
-            logger.debug(f"Batch cache set for warehouse {warehouse_id}, product {product_id}: {available}")
-
-        pipe.execute()
+        # 单条 MSET 写入（永不过期）
+        self.redis.mset({
+            self._get_cache_key(warehouse_id, product_id): available
+            for product_id, available in stock_map.items()
+        })
+        logger.debug(f"Batch cache set for warehouse {warehouse_id}: {len(stock_map)} keys")
 
     # ==================== Lua 脚本方法 ====================
 
@@ -333,38 +613,39 @@ class InventoryCacheService:
         warehouse_id: str,
         product_id: int,
         quantity: int,
-        order_id: str,
-        ttl: int = 900
+        order_id: str
     ) -> tuple:
-        """原子预占库存（使用 Lua 脚本）"""
+        """原子预占库存（使用 Lua 脚本）
+        
+        Returns:
+            (stock, status)：status 为 RESERVE_OK / RESERVE_DUPLICATE / RESERVE_INSUFFICIENT，
+            Redis 不可用或脚本执行失败时返回 (None, None)
+        """
         if not self.redis or not self._reserve_script:
-            return None, False
+            return None, None
         
         stock_key = self._get_cache_key(warehouse_id, product_id)
         reservation_key = f"reservation:{warehouse_id}:{product_id}"
+        order_key = f"{RESERVATION_ORDER_KEY_PREFIX}{order_id}"
         
         try:
             result = self._reserve_script(
-                keys=[stock_key, reservation_key],
-                args=[quantity, order_id, ttl]
+                keys=[stock_key, reservation_key, order_key],
+                args=[quantity, order_id, f"{warehouse_id}:{product_id}", RESERVATION_ORDER_INDEX_TTL]
             )
-            new_stock = result[0]
-            is_duplicate = bool(result[1])
-            
-            if new_stock < 0:
-                logger.warning(f"库存不足: warehouse={warehouse_id}, product={product_id}, stock={new_stock}")
-                return new_stock, False
+            stock, status = int(result[0]), int(result[1])
             
-            if is_duplicate:
+            if status == RESERVE_INSUFFICIENT:
+                logger.warning(f"库存不足: warehouse={warehouse_id}, product={product_id}, stock={stock}")
+            elif status == RESERVE_DUPLICATE:
                 logger.warning(f"重复预占: order_id={order_id}")
-                return new_stock, True
-            
-            logger.info(f"Redis 原子预占成功: order_id={order_id}, 新库存={new_stock}")
-            return new_stock, False
+            else:
+                logger.info(f"Redis 原子预占成功: order_id={order_id}, 新库存={stock}")
+            return stock, status
             
         except Exception as e:
             logger.error(f"原子预占失败: {e}")
-            return None, False
+            return None, None
 
     def atomic_release_stock(
         self,
@@ -399,6 +680,81 @@ class InventoryCacheService:
             logger.error(f"原子释放失败: {e}")
             return None, False
 
+    @staticmethod
+    def _parse_order_items(result: list, width: int) -> list:
+        """把订单脚本的扁平返回值解析为 [(warehouse_id, product_id, quantity, ...), ...]"""
+        items = []
+        for i in range(0, len(result), width):
+            field = result[i].decode() if isinstance(result[i], bytes) else result[i]
+            warehouse_id, product_id = field.rsplit(":", 1)
+            items.append((warehouse_id, int(product_id), *(int(v) for v in result[i + 1:i + width])))
+        return items
+
+    def atomic_confirm_order(self, order_id: str) -> list:
+        """原子确认订单的全部预占（使用 Lua 脚本，一次往返）
+
+        逐个 SREM 认领，已被释放或过期清理认领的预占不会再被确认。
+
+        Returns:
+            本次确认的 [(warehouse_id, product_id, quantity), ...]，没有有效预占时为空列表
+        """
+        if not self.redis or not self._confirm_order_script:
+            return []
+
+        result = self._confirm_order_script(
+            keys=[f"{RESERVATION_ORDER_KEY_PREFIX}{order_id}"], args=[order_id]
+        )
+        return self._parse_order_items(result, 2)
+
+    def atomic_release_order(self, order_id: str) -> list:
+        """原子释放订单的全部预占并归还可用库存（使用 Lua 脚本，一次往返）
+
+        Returns:
+            本次释放的 [(warehouse_id, product_id, quantity, new_stock), ...]，没有有效预占时为空列表
+        """
+        if not self.redis or not self._release_order_script:
+            return []
+
+        result = self._release_order_script(
+            keys=[f"{RESERVATION_ORDER_KEY_PREFIX}{order_id}"], args=[order_id]
+        )
+        return self._parse_order_items(result, 3)
+
+    @staticmethod
+    def _expired_release_args(reservations: list) -> list:
+        """把预占记录展开为 [warehouse_id, product_id, order_id, quantity, ...]"""
+        args = []
+        for r in reservations:
+            args.extend([r.warehouse_id, r.product_id, r.order_id, r.quantity])
+        return args
+
+    def atomic_release_expired(self, reservations: list) -> list:
+        """批量认领并释放过期预占（使用 Lua 脚本，一次往返）
+
+        SREM 成功才 INCRBY 归还库存，与确认/释放路径互斥：已确认或已释放的订单不在预占集合中，
+        不会被归还，同一预占只会被处理一次。
+
+        Returns:
+            与 reservations 一一对应的布尔列表，True 表示本次释放了该预占
+        """
+        if not reservations or not self.redis or not self._release_expired_script:
+            return [False] * len(reservations)
+
+        result = self._release_expired_script(args=self._expired_release_args(reservations))
+        return [bool(flag) for flag in result]
+
+    def revert_release_expired(self, reservations: list) -> bool:
+        """撤销 atomic_release_expired 的释放（扣回库存并恢复预占记录）"""
+        if not reservations or not self.redis or not self._revert_release_expired_script:
+            return False
+
+        try:
+            self._revert_release_expired_script(args=self._expired_release_args(reservations))
+            return True
+        except Exception as e:
+            logger.error(f"撤销过期预占释放失败: {e}")
+            return False
+
     def atomic_batch_reserve(
         self,
         warehouse_id: str,
@@ -409,7 +765,7 @@ class InventoryCacheService:
         if not self.redis or not self._batch_reserve_script:
             return []
             
-        args = [warehouse_id]
+        args = [warehouse_id, order_id, RESERVATION_ORDER_INDEX_TTL]
         for product_id, quantity in items:
             args.extend([product_id, quantity])
             
@@ -421,7 +777,8 @@ class InventoryCacheService:
                 results.append({
                     'product_id': result[i],
                     'new_stock': result[i + 1],
-                    'success': bool(result[i + 2])
+                    'status': result[i + 2],
+                    'success': result[i + 2] == RESERVE_OK
                 })
                 
             return results
@@ -443,10 +800,10 @@ class InventoryCacheService:
             result = self.redis.get(key)
             if result:
                 try:
-                    previous_result = json.loads(result)
+                    previous_result = orjson.loads(result)
                     logger.info(f"幂等命中: operation={operation}, order_id={order_id}")
                     return True, previous_result
-                except json.JSONDecodeError:
+                except orjson.JSONDecodeError:
                     return True, {"status": result.decode() if isinstance(result, bytes) else result}
             return False, None
         except Exception as e:
@@ -461,7 +818,7 @@ class InventoryCacheService:
         key = f"idempotent:{operation}:{order_id}"
         
         try:
-            self.redis.setex(key, ttl, json.dumps(result_data, ensure_ascii=False))
+            self.redis.setex(key, ttl, orjson.dumps(result_data, option=orjson.OPT_NON_STR_KEYS))
             logger.info(f"幂等结果已记录: operation={operation}, order_id={order_id}")
         except Exception as e:
             logger.error(f"记录幂等结果失败: {e}")
@@ -1,12 +1,11 @@
 """库存日志服务"""
 
-from sqlalchemy import select, func
+from sqlalchemy import select, func, insert, update, text, bindparam, Integer
 from sqlalchemy.orm import Session
 from typing import Dict, Optional, Any
 from datetime import datetime
 import logging
 
-from app.models.product_stocks import ProductStock
 from app.models.inventory_reservations import InventoryReservation, ReservationStatus
 from app.models.inventory_logs import InventoryLog, ChangeType
 from app.services.inventory_cache import InventoryCacheService
@@ -84,99 +83,203 @@ class InventoryLogService:
             "total_pages": total_pages
         }
 
-    def cleanup_expired_reservations(self, batch_size: int = 500) -> int:
+    def cleanup_expired_reservations(
+        self,
+        batch_size: int = 500,
+        shard: int = 0,
+        shards: int = 1
+    ) -> int:
         """清理过期的库存预占记录（对账操作）
         
         注意：Redis 是主库存，数据库只做对账和审计。
         此方法仅用于修复 Redis 和数据库的不一致。
+        
+        每批次固定次数的往返：
+        1. 单条 UPDATE ... WHERE id IN (SELECT ... FOR UPDATE SKIP LOCKED LIMIT n) RETURNING，
+           批量标记过期记录，多个清理进程可并行
+        2. Lua 脚本批量认领 Redis 预占（SREM 成功才 INCRBY），库存直接写穿 Redis
+        3. 未认领到的记录（Redis 中已确认/释放，Kafka 事件尚未消费）在同一事务内改回 RESERVED，
+           由随后到达的确认/释放事件完结
+        4. 按仓库+商品聚合后单条 UPDATE 归还数据库库存
+        5. 批量写入库存流水
+        
+        一批记录全部未认领时结束本次清理，避免反复选中同一批等待 Kafka 事件的记录。
+        
+        shards > 1 时只处理 id % shards == shard 的记录，多个 worker 各自负责
+        互不相交的分片，并行清理时不会争抢同一批行。
         """
         total_cleaned = 0
 
         while True:
             try:
-                # 查询过期预占记录（不带锁，直接读取）
-                expired_reservations = self.db.execute(
-                    select(InventoryReservation)
-                    .where(
-                        InventoryReservation.status == ReservationStatus.RESERVED,
-                        InventoryReservation.expired_at <= datetime.utcnow()
-                    )
-                    .limit(batch_size)
-                ).scalars().all()
+                # 行锁等待设上限：与消费者争用同一库存行时本批快速失败回滚，而不是无限等待
+                self.db.execute(_SET_CLEANUP_TRANSACTION_SQL)
+                if shards > 1:
+                    stmt = _RELEASE_EXPIRED_SHARDED_STMT
+                    params = {"batch_size": batch_size, "shard": shard, "shards": shards}
+                else:
+                    stmt, params = _RELEASE_EXPIRED_STMT, {"batch_size": batch_size}
+                expired_reservations = self.db.execute(stmt, params).all()
 
                 if not expired_reservations:
                     break
 
                 logger.info(f"发现 {len(expired_reservations)} 条过期预占记录")
-                
-                for reservation in expired_reservations:
-                    try:
-                        # 检查 Redis 中是否已释放（以 Redis 为准）
-                        if self.cache_service:
-                            reservation_set = self.cache_service.redis.smembers(
-                                f'reservation:{reservation.warehouse_id}:{reservation.product_id}'
-                            )
-                            if reservation.order_id not in reservation_set:
-                                # Redis 中已释放，更新数据库状态
-                                reservation.status = ReservationStatus.RELEASED
-                                logger.debug(f"Redis 已释放，同步数据库：{reservation.order_id}")
-                                continue
-                        
-                        # 如果 Redis 中还存在，说明需要释放
-                        # 获取库存记录（不带锁）
-                        product_stock = self.db.execute(
-                            select(ProductStock)
-                            .where(
-                                ProductStock.warehouse_id == reservation.warehouse_id,
-                                ProductStock.product_id == reservation.product_id
-                            )
-                        ).scalar_one_or_none()
-                
-                        if product_stock:
-                            # 归还库存
-                            product_stock.available_stock += reservation.quantity
-                            product_stock.reserved_stock -= reservation.quantity
-                        
-                            # 更新预占状态
-                            reservation.status = ReservationStatus.RELEASED
-                        
-                            # 记录日志
-                            if product_stock:
-                                log = InventoryLog(
-                                    warehouse_id=reservation.warehouse_id,
-                                    product_id=reservation.product_id,
-                                    order_id=reservation.order_id,
-                                    change_type=ChangeType.RELEASE,
-                                    quantity=reservation.quantity,
-                                    before_available=product_stock.available_stock - reservation.quantity,
-                                    after_available=product_stock.available_stock,
-                                    before_reserved=product_stock.reserved_stock + reservation.quantity,
-                                    after_reserved=product_stock.reserved_stock,
-                                    before_frozen=product_stock.frozen_stock,
-                                    after_frozen=product_stock.frozen_stock,
-                                    operator="system_cleanup",
-                                    source="cleanup_job"
-                                )
-                                self.db.add(log)
-                        
-                        total_cleaned += 1
-                
-                    except Exception as e:
-                        logger.error(f"清理单条预占记录失败：order_id={reservation.order_id}, error={str(e)}")
-                        continue
-                
-                self.db.commit()
-                
+
+                # 只有 Redis 中仍未确认/释放（认领成功）的预占才写穿归还库存；
+                # 已确认或已释放的不在预占集合中，库存由对应的 Kafka 事件同步
+                to_restore = expired_reservations
+                unclaimed_ids = []
+                if self.cache_service:
+                    released = self.cache_service.atomic_release_expired(expired_reservations)
+                    to_restore = [r for r, ok in zip(expired_reservations, released) if ok]
+                    unclaimed_ids = [r.id for r, ok in zip(expired_reservations, released) if not ok]
+
+                try:
+                    if unclaimed_ids:
+                        self.db.execute(_KEEP_RESERVED_STMT, {"ids": unclaimed_ids})
+                    if to_restore:
+                        self._restore_reserved_stock(to_restore)
+
+                    self.db.commit()
+                except Exception:
+                    # 数据库未提交，这批预占下次仍会被选中，Redis 需恢复到认领前
+                    if self.cache_service and to_restore:
+                        self.cache_service.revert_release_expired(to_restore)
+                    raise
+                total_cleaned += len(to_restore)
+
                 logger.info(f"已完成批次清理，累计清理 {total_cleaned} 条记录")
 
-                if len(expired_reservations) < batch_size:
+                if len(expired_reservations) < batch_size or not to_restore:
                     break
-        
+
             except Exception as e:
                 logger.error(f"批处理清理过程中发生错误：{str(e)}")
                 self.db.rollback()
                 break
-        
+
         LoggingAspect.log_operation_success("cleanup_expired_reservations", extra_data={'total_cleaned': total_cleaned})
 
-        return total_cleaned
\ No newline at end of file
+        return total_cleaned
+
+    def _restore_reserved_stock(self, reservations: list):
+        """按仓库+商品聚合归还预占库存，并批量记录流水"""
+        grouped: Dict[tuple, list] = {}
+        for r in reservations:
+            grouped.setdefault((r.warehouse_id, r.product_id), []).append(r)
+
+        keys = sorted(grouped)
+        stocks = self.db.execute(
+            _RESTORE_RESERVED_STOCK_SQL,
+            {
+                "warehouse_ids": [wh for wh, _ in keys],
+                "product_ids": [pid for _, pid in keys],
+                "quantities": [sum(r.quantity for r in grouped[k]) for k in keys],
+            }
+        ).all()
+
+        # 根据更新后的库存倒推每条预占释放前后的数值
+        logs = []
+        for stock in stocks:
+            items = grouped[(stock.warehouse_id, stock.product_id)]
+            available = stock.available_stock - sum(r.quantity for r in items)
+            reserved = stock.reserved_stock + sum(r.quantity for r in items)
+            for r in items:
+                logs.append({
+                    "warehouse_id": r.warehouse_id,
+                    "product_id": r.product_id,
+                    "order_id": r.order_id,
+                    "change_type": ChangeType.RELEASE,
+                    "quantity": r.quantity,
+                    "before_available": available,
+                    "after_available": available + r.quantity,
+                    "before_reserved": reserved,
+                    "after_reserved": reserved - r.quantity,
+                    "before_frozen": stock.frozen_stock,
+                    "after_frozen": stock.frozen_stock,
+                    "operator": "system_cleanup",
+                    "source": "cleanup_job",
+                })
+                available += r.quantity
+                reserved -= r.quantity
+
+        if logs:
+            self.db.execute(insert(InventoryLog), logs)
+
+
+def _build_release_expired_stmt(sharded: bool):
+    """构建批量释放过期预占的 UPDATE 语句（模块加载时构建，执行时通过 bindparam 传参）
+    
+    子查询限制单批数量并跳过被在线事务锁住的行，按过期时间走部分索引。
+    sharded 为 True 时只处理 id % shards == shard 的记录。
+    """
+    conditions = [
+        InventoryReservation.status == ReservationStatus.RESERVED,
+        InventoryReservation.expired_at <= func.now()
+    ]
+    if sharded:
+        conditions.append(
+            InventoryReservation.id % bindparam("shards", type_=Integer) == bindparam("shard", type_=Integer)
+        )
+    
+    expired_ids = (
+        select(InventoryReservation.id)
+        .where(*conditions)
+        .order_by(InventoryReservation.expired_at)
+        .limit(bindparam("batch_size", type_=Integer))
+        .with_for_update(skip_locked=True, of=InventoryReservation)
+        .scalar_subquery()
+    )
+    return (
+        update(InventoryReservation)
+        .where(InventoryReservation.id.in_(expired_ids))
+        .values(status=ReservationStatus.RELEASED, updated_at=func.now())
+        .returning(
+            InventoryReservation.id,
+            InventoryReservation.warehouse_id,
+            InventoryReservation.product_id,
+            InventoryReservation.order_id,
+            InventoryReservation.quantity
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+_RELEASE_EXPIRED_STMT = _build_release_expired_stmt(sharded=False)
+_RELEASE_EXPIRED_SHARDED_STMT = _build_release_expired_stmt(sharded=True)
+
+# Redis 未认领的过期记录改回 RESERVED（与批量标记同一事务）
+_KEEP_RESERVED_STMT = (
+    update(InventoryReservation)
+    .where(InventoryReservation.id.in_(bindparam("ids", expanding=True)))
+    .values(status=ReservationStatus.RESERVED)
+    .execution_options(synchronize_session=False)
+)
+
+# 清理事务的行锁等待上限（is_local=true 等同 SET LOCAL，仅对当前事务生效）
+_SET_CLEANUP_TRANSACTION_SQL = text("SELECT set_config('lock_timeout', '5s', true)")
+
+# 按仓库+商品聚合归还库存
+# 先按 (warehouse_id, product_id) 顺序加行锁再更新：并行的清理分片会触及相同商品，
+# 统一的加锁顺序避免 AB/BA 死锁
+_RESTORE_RESERVED_STOCK_SQL = text("""
+    WITH v AS (
+        SELECT unnest(CAST(:warehouse_ids AS varchar[])) AS warehouse_id,
+               unnest(CAST(:product_ids AS bigint[])) AS product_id,
+               unnest(CAST(:quantities AS integer[])) AS quantity
+    ), locked AS (
+        SELECT ps.id, v.quantity
+        FROM product_stocks AS ps
+        JOIN v ON ps.warehouse_id = v.warehouse_id AND ps.product_id = v.product_id
+        ORDER BY ps.warehouse_id, ps.product_id
+        FOR UPDATE OF ps
+    )
+    UPDATE product_stocks AS ps
+    SET available_stock = ps.available_stock + locked.quantity,
+        reserved_stock = ps.reserved_stock - locked.quantity,
+        updated_at = now()
+    FROM locked
+    WHERE ps.id = locked.id
+    RETURNING ps.warehouse_id, ps.product_id, ps.available_stock, ps.reserved_stock, ps.frozen_stock
+""")
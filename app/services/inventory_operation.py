@@ -4,9 +4,10 @@ from fastapi import HTTPException
 from typing import Dict, Any, Optional
 import logging
 
+from app.core.errors import InventoryError, InventoryErrorCode
 from app.services.inventory_cache import InventoryCacheService
 from app.services.inventory_query import InventoryQueryService
-from app.core.kafka_producer import send_inventory_event, InventoryEventType
+from app.core.kafka_producer import send_inventory_event, submit_background, InventoryEventType
 
 logger = logging.getLogger(__name__)
 
@@ -88,34 +89,16 @@ class InventoryOperationService:
             logger.info(f"✅ Redis 入库成功：stock={before_stock}→{after_stock}")
             
             # 3. 异步发送Kafka事件（不同步写数据库）
-            import asyncio
-            try:
-                loop = asyncio.get_running_loop()
-                loop.create_task(self._send_kafka_event(
-                    event_type=InventoryEventType.INCREASE,
-                    warehouse_id=warehouse_id,
-                    product_id=product_id,
-                    quantity=quantity,
-                    order_id=order_id or f"INCR_{product_id}",
-                    before_stock=before_stock,
-                    after_stock=after_stock,
-                    remark=remark or f"入库: {quantity}"
-                ))
-            except RuntimeError:
-                # 没有运行中的loop，在新线程中运行
-                import threading
-                def run_async():
-                    asyncio.run(self._send_kafka_event(
-                        event_type=InventoryEventType.INCREASE,
-                        warehouse_id=warehouse_id,
-                        product_id=product_id,
-                        quantity=quantity,
-                        order_id=order_id or f"INCR_{product_id}",
-                        before_stock=before_stock,
-                        after_stock=after_stock,
-                        remark=remark or f"入库: {quantity}"
-                    ))
-                threading.Thread(target=run_async, daemon=True).start()
+            submit_background(self._send_kafka_event(
+                event_type=InventoryEventType.INCREASE,
+                warehouse_id=warehouse_id,
+                product_id=product_id,
+                quantity=quantity,
+                order_id=order_id or f"INCR_{product_id}",
+                before_stock=before_stock,
+                after_stock=after_stock,
+                remark=remark or f"入库: {quantity}"
+            ))
             
             return {
                 "warehouse_id": warehouse_id,
@@ -158,7 +141,7 @@ class InventoryOperationService:
                 change_qty = quantity
             elif adjust_type == "decrease":
                 if current_stock < quantity:
-                    raise HTTPException(status_code=400, detail="库存不足，无法减少")
+                    raise InventoryError(400, InventoryErrorCode.INSUFFICIENT_STOCK, "库存不足，无法减少")
                 after_available = current_stock - quantity
                 change_qty = -quantity
             elif adjust_type == "set":
@@ -185,33 +168,16 @@ class InventoryOperationService:
             logger.info(f"✅ Redis 库存调整成功：stock={before_available}→{after_available}, type={adjust_type}")
             
             # 3. 异步发送Kafka事件
-            import asyncio
-            try:
-                loop = asyncio.get_running_loop()
-                loop.create_task(self._send_kafka_event(
-                    event_type=InventoryEventType.INCREASE if change_qty > 0 else InventoryEventType.DECREASE,
-                    warehouse_id=warehouse_id,
-                    product_id=product_id,
-                    quantity=abs(change_qty),
-                    order_id=f"ADJUST_{product_id}",
-                    before_stock=before_available,
-                    after_stock=after_available,
-                    remark=reason
-                ))
-            except RuntimeError:
-                import threading
-                def run_async():
-                    asyncio.run(self._send_kafka_event(
-                        event_type=InventoryEventType.INCREASE if change_qty > 0 else InventoryEventType.DECREASE,
-                        warehouse_id=warehouse_id,
-                        product_id=product_id,
-                        quantity=abs(change_qty),
-                        order_id=f"ADJUST_{product_id}",
-                        before_stock=before_available,
-                        after_stock=after_available,
-                        remark=reason
-                    ))
-                threading.Thread(target=run_async, daemon=True).start()
+            submit_background(self._send_kafka_event(
+                event_type=InventoryEventType.INCREASE if change_qty > 0 else InventoryEventType.DECREASE,
+                warehouse_id=warehouse_id,
+                product_id=product_id,
+                quantity=abs(change_qty),
+                order_id=f"ADJUST_{product_id}",
+                before_stock=before_available,
+                after_stock=after_available,
+                remark=reason
+            ))
 
             return {
                 "warehouse_id": warehouse_id,
@@ -247,7 +213,7 @@ class InventoryOperationService:
                 current_stock = 0
             
             if current_stock < quantity:
-                raise HTTPException(status_code=400, detail="可用库存不足，无法冻结")
+                raise InventoryError(400, InventoryErrorCode.INSUFFICIENT_STOCK, "可用库存不足，无法冻结")
             
             before_available = current_stock
             after_available = current_stock - quantity
@@ -270,33 +236,16 @@ class InventoryOperationService:
             logger.info(f"✅ Redis 冻结成功：stock={before_available}→{after_available}, frozen={quantity}")
             
             # 3. 异步发送Kafka事件
-            import asyncio
-            try:
-                loop = asyncio.get_running_loop()
-                loop.create_task(self._send_kafka_event(
-                    event_type=InventoryEventType.FREEZE,
-                    warehouse_id=warehouse_id,
-                    product_id=product_id,
-                    quantity=quantity,
-                    order_id=f"FREEZE_{product_id}",
-                    before_stock=before_available,
-                    after_stock=after_available,
-                    remark=reason
-                ))
-            except RuntimeError:
-                import threading
-                def run_async():
-                    asyncio.run(self._send_kafka_event(
-                        event_type=InventoryEventType.FREEZE,
-                        warehouse_id=warehouse_id,
-                        product_id=product_id,
-                        quantity=quantity,
-                        order_id=f"FREEZE_{product_id}",
-                        before_stock=before_available,
-                        after_stock=after_available,
-                        remark=reason
-                    ))
-                threading.Thread(target=run_async, daemon=True).start()
+            submit_background(self._send_kafka_event(
+                event_type=InventoryEventType.FREEZE,
+                warehouse_id=warehouse_id,
+                product_id=product_id,
+                quantity=quantity,
+                order_id=f"FREEZE_{product_id}",
+                before_stock=before_available,
+                after_stock=after_available,
+                remark=reason
+            ))
             
             return {
                 "warehouse_id": warehouse_id,
@@ -335,7 +284,7 @@ class InventoryOperationService:
             current_frozen = current_frozen_info.get('frozen_stock', 0) if current_frozen_info else 0
             
             if current_frozen < quantity:
-                raise HTTPException(status_code=400, detail="冻结库存不足，无法解冻")
+                raise InventoryError(400, InventoryErrorCode.INSUFFICIENT_FROZEN_STOCK, "冻结库存不足，无法解冻")
             
             before_available = current_available
             after_available = current_available + quantity
@@ -360,33 +309,16 @@ class InventoryOperationService:
             logger.info(f"✅ Redis 解冻成功：stock={before_available}→{after_available}, frozen={before_frozen}→{after_frozen}")
             
             # 3. 异步发送Kafka事件
-            import asyncio
-            try:
-                loop = asyncio.get_running_loop()
-                loop.create_task(self._send_kafka_event(
-                    event_type=InventoryEventType.UNFREEZE,
-                    warehouse_id=warehouse_id,
-                    product_id=product_id,
-                    quantity=quantity,
-                    order_id=f"UNFREEZE_{product_id}",
-                    before_stock=before_available,
-                    after_stock=after_available,
-                    remark=reason
-                ))
-            except RuntimeError:
-                import threading
-                def run_async():
-                    asyncio.run(self._send_kafka_event(
-                        event_type=InventoryEventType.UNFREEZE,
-                        warehouse_id=warehouse_id,
-                        product_id=product_id,
-                        quantity=quantity,
-                        order_id=f"UNFREEZE_{product_id}",
-                        before_stock=before_available,
-                        after_stock=after_available,
-                        remark=reason
-                    ))
-                threading.Thread(target=run_async, daemon=True).start()
+            submit_background(self._send_kafka_event(
+                event_type=InventoryEventType.UNFREEZE,
+                warehouse_id=warehouse_id,
+                product_id=product_id,
+                quantity=quantity,
+                order_id=f"UNFREEZE_{product_id}",
+                before_stock=before_available,
+                after_stock=after_available,
+                remark=reason
+            ))
             
             return {
                 "warehouse_id": warehouse_id,
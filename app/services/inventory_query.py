@@ -1,9 +1,9 @@
-"""库存查询服务 - 纯Redis查询，无数据库回源"""
+"""库存查询服务 - 进程内 L1 + Redis 查询，无数据库回源"""
 
 from typing import List, Dict, Optional, Any
 import logging
 
-from app.services.inventory_cache import InventoryCacheService
+from app.services.inventory_cache import InventoryCacheService, local_stock_cache, MGET_CHUNK_SIZE
 
 logger = logging.getLogger(__name__)
 
@@ -22,15 +22,18 @@ class InventoryQueryService:
     def get_product_stock(self, warehouse_id: str, product_id: int) -> int:
         """查询商品可用库存（纯Redis，无数据库回源）
         
-        直接从Redis获取库存数据，不再查数据库作为回源。
+        先查进程内 L1，未命中再从Redis获取并回填（同键并发合并），不再查数据库作为回源。
         如果Redis中没有数据，返回0。
         """
         if not self.cache_service:
             logger.error("缓存服务未初始化")
             return 0
         
-        # 直接从Redis获取
-        stock = self.cache_service.get_cached_stock(warehouse_id, product_id)
+        # L1 未命中时同键并发请求只有一个回源 Redis
+        stock = local_stock_cache.get_or_load(
+            self.cache_service._get_cache_key(warehouse_id, product_id),
+            lambda: self.cache_service.get_cached_stock(warehouse_id, product_id),
+        )
         logger.debug(f"查询库存: warehouse={warehouse_id}, product={product_id}, stock={stock}")
         return stock if stock is not None else 0
 
@@ -51,7 +54,7 @@ class InventoryQueryService:
     def batch_get_stocks(self, warehouse_id: str, product_ids: List[int]) -> Dict[int, int]:
         """批量获取库存（纯Redis，无数据库回源）
         
-        直接从Redis批量获取所有商品库存。
+        先按进程内 L1 拆分命中/未命中，只对未命中部分走 Redis MGET 并回填。
         未命中的商品返回0，不再查数据库。
         """
         if not product_ids:
@@ -61,8 +64,100 @@ class InventoryQueryService:
             logger.error("缓存服务未初始化")
             return {pid: 0 for pid in product_ids}
 
-        # 直接从Redis批量获取
-        results = self.cache_service.batch_get_cached_stocks(warehouse_id, product_ids)
+        cache_keys = {
+            pid: self.cache_service._get_cache_key(warehouse_id, pid)
+            for pid in product_ids
+        }
+        results = local_stock_cache.get_many(cache_keys)
+        misses = [pid for pid in cache_keys if pid not in results]
         
-        logger.debug(f"批量查询库存: warehouse={warehouse_id}, count={len(product_ids)}")
-        return results
\ No newline at end of file
+        if misses:
+            read_started = local_stock_cache.now()
+            fetched = self.cache_service.batch_get_cached_stocks(warehouse_id, misses)
+            local_stock_cache.set_many(
+                {cache_keys[pid]: stock for pid, stock in fetched.items()},
+                read_started,
+            )
+            results.update(fetched)
+            # 保持请求中的商品顺序
+            results = {pid: results[pid] for pid in cache_keys}
+        
+        logger.debug(
+            f"批量查询库存: warehouse={warehouse_id}, count={len(cache_keys)}, l1_hits={len(cache_keys) - len(misses)}"
+        )
+        return results
+
+
+class AsyncInventoryQueryService:
+    """异步库存查询服务 - FastAPI 路由直接 await，Redis 往返期间不占用线程池线程
+
+    与 InventoryQueryService 共用进程内 L1 和 key/解析规则；同步服务继续供 Celery 等同步场景使用。
+    """
+
+    def __init__(self, redis=None):
+        self.redis = redis
+
+    async def get_product_stock(self, warehouse_id: str, product_id: int) -> int:
+        """查询商品可用库存（L1 + 异步 Redis，无数据库回源）"""
+        cache_key = f"stock:available:{warehouse_id}:{product_id}"
+        hit = local_stock_cache.get_many({product_id: cache_key})
+        if hit:
+            return hit[product_id]
+
+        if not self.redis:
+            logger.error("Redis未初始化")
+            return 0
+
+        read_started = local_stock_cache.now()
+        cached = await self.redis.get(cache_key)
+        stock = int(cached) if cached is not None else 0
+        local_stock_cache.set_many({cache_key: stock}, read_started)
+        return stock
+
+    async def get_full_stock_info(self, warehouse_id: str, product_id: int) -> Optional[Dict[str, Any]]:
+        """获取完整库存信息（异步 MGET，仅 1 次网络往返）"""
+        if not self.redis:
+            logger.error("Redis未初始化")
+            return None
+
+        values = await self.redis.mget(InventoryCacheService.full_info_keys(warehouse_id, product_id))
+        return InventoryCacheService.parse_full_info(warehouse_id, product_id, values)
+
+    async def batch_get_stocks(self, warehouse_id: str, product_ids: List[int]) -> Dict[int, int]:
+        """批量获取库存（L1 拆分命中/未命中，未命中部分异步 MGET）"""
+        if not product_ids:
+            return {}
+
+        cache_keys = {pid: f"stock:available:{warehouse_id}:{pid}" for pid in product_ids}
+        results = local_stock_cache.get_many(cache_keys)
+        misses = [pid for pid in cache_keys if pid not in results]
+
+        if misses:
+            if not self.redis:
+                logger.error("Redis未初始化")
+                return {pid: results.get(pid, 0) for pid in cache_keys}
+
+            read_started = local_stock_cache.now()
+            miss_keys = [cache_keys[pid] for pid in misses]
+            if len(miss_keys) <= MGET_CHUNK_SIZE:
+                cached_values = await self.redis.mget(miss_keys)
+            else:
+                # 拆成多条小 MGET，通过同一个管道发送，仍只有一次网络往返
+                pipe = self.redis.pipeline(transaction=False)
+                for i in range(0, len(miss_keys), MGET_CHUNK_SIZE):
+                    pipe.mget(miss_keys[i:i + MGET_CHUNK_SIZE])
+                cached_values = [value for chunk in await pipe.execute() for value in chunk]
+
+            fetched = InventoryCacheService.parse_stock_values(misses, cached_values)
+            local_stock_cache.set_many(
+                {cache_keys[pid]: stock for pid, stock in fetched.items()},
+                read_started,
+            )
+            results.update(fetched)
+            # 保持请求中的商品顺序
+            results = {pid: results[pid] for pid in cache_keys}
+
+        logger.debug(
+            f"批量查询库存: warehouse={warehouse_id}, count={len(cache_keys)}, l1_hits={len(cache_keys) - len(misses)}"
+        )
+        return results
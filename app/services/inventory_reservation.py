@@ -5,8 +5,13 @@ from typing import Dict, List, Optional, Any
 import time
 import logging
 
-from app.services.inventory_cache import InventoryCacheService
-from app.core.kafka_producer import send_inventory_event, InventoryEventType
+from app.core.errors import InventoryError, InventoryErrorCode
+from app.services.inventory_cache import (
+    InventoryCacheService,
+    RESERVE_DUPLICATE,
+    RESERVE_INSUFFICIENT,
+)
+from app.core.kafka_producer import send_inventory_event, submit_background, InventoryEventType
 
 logger = logging.getLogger(__name__)
 
@@ -68,28 +73,26 @@ class InventoryReservationService:
             if not self.cache_service:
                 raise HTTPException(status_code=500, detail="缓存服务未初始化")
             
-            # 获取预占前的库存
-            current_stock = self.cache_service.get_cached_stock(warehouse_id, product_id)
-            if current_stock is None:
-                current_stock = 0
-            
-            new_stock, is_duplicate = self.cache_service.atomic_reserve_stock(
+            new_stock, status = self.cache_service.atomic_reserve_stock(
                 warehouse_id=warehouse_id,
                 product_id=product_id,
                 quantity=quantity,
-                order_id=order_id,
-                ttl=900  # 15 分钟
+                order_id=order_id
             )
             
-            if is_duplicate:
+            if status is None:
+                raise HTTPException(status_code=500, detail="Redis 预占失败")
+            
+            if status == RESERVE_DUPLICATE:
                 logger.warning(f"重复预占：order_id={order_id}")
-                raise HTTPException(status_code=400, detail="该订单已预占此商品")
+                raise InventoryError(400, InventoryErrorCode.DUPLICATE_RESERVATION, "该订单已预占此商品")
             
-            if new_stock < 0:
+            if status == RESERVE_INSUFFICIENT:
                 logger.warning(f"库存不足：warehouse={warehouse_id}, product={product_id}, stock={new_stock}")
-                raise HTTPException(status_code=400, detail="库存不足")
+                raise InventoryError(400, InventoryErrorCode.INSUFFICIENT_STOCK, "库存不足")
             
-            before_stock = current_stock
+            # Lua 脚本原子返回扣减后的库存，预占前库存由此推算，无需额外读取
+            before_stock = new_stock + quantity
             after_stock = new_stock
             
             logger.info(f"✅ Redis 预占成功：order={order_id}, stock={before_stock}→{after_stock}")
@@ -104,33 +107,16 @@ class InventoryReservationService:
                 )
             
             # 异步发送Kafka事件
-            import asyncio
-            try:
-                loop = asyncio.get_running_loop()
-                loop.create_task(self._send_kafka_event(
-                    event_type=InventoryEventType.RESERVE,
-                    warehouse_id=warehouse_id,
-                    product_id=product_id,
-                    quantity=quantity,
-                    order_id=order_id,
-                    before_stock=before_stock,
-                    after_stock=after_stock,
-                    remark="预占库存"
-                ))
-            except RuntimeError:
-                import threading
-                def run_async():
-                    asyncio.run(self._send_kafka_event(
-                        event_type=InventoryEventType.RESERVE,
-                        warehouse_id=warehouse_id,
-                        product_id=product_id,
-                        quantity=quantity,
-                        order_id=order_id,
-                        before_stock=before_stock,
-                        after_stock=after_stock,
-                        remark="预占库存"
-                    ))
-                threading.Thread(target=run_async, daemon=True).start()
+            submit_background(self._send_kafka_event(
+                event_type=InventoryEventType.RESERVE,
+                warehouse_id=warehouse_id,
+                product_id=product_id,
+                quantity=quantity,
+                order_id=order_id,
+                before_stock=before_stock,
+                after_stock=after_stock,
+                remark="预占库存"
+            ))
             
             return True
             
@@ -164,10 +150,6 @@ class InventoryReservationService:
             if not warehouse_id:
                 raise HTTPException(status_code=400, detail="仓库 ID 不能为空")
             
-            # 获取预占前的库存
-            product_ids = [item["product_id"] for item in items]
-            before_stocks = self.cache_service.batch_get_cached_stocks(warehouse_id, product_ids)
-            
             # 调用 Lua 脚本原子执行批量预占
             result = self.cache_service.atomic_batch_reserve(
                 warehouse_id=warehouse_id,
@@ -196,11 +178,13 @@ class InventoryReservationService:
                         "new_stock": new_stock
                     })
                 else:
+                    duplicate = res['status'] == RESERVE_DUPLICATE
                     failed_items.append({
                         "warehouse_id": warehouse_id,
                         "product_id": product_id,
                         "success": False,
-                        "message": "库存不足或重复预占",
+                        "message": "该订单已预占此商品" if duplicate else "库存不足",
+                        "code": InventoryErrorCode.DUPLICATE_RESERVATION if duplicate else InventoryErrorCode.INSUFFICIENT_STOCK,
                         "new_stock": new_stock
                     })
             
@@ -237,39 +221,24 @@ class InventoryReservationService:
                 )
             
             # 异步发送Kafka事件
-            import asyncio
+            quantities = {i["product_id"]: i["quantity"] for i in items}
             for item in success_items:
                 product_id = item["product_id"]
-                before_stock = before_stocks.get(product_id, 0)
+                quantity = quantities.get(product_id, 0)
+                # 预占前库存由 Lua 返回的扣减后库存推算
                 after_stock = item.get("new_stock", 0)
-                quantity = next((i["quantity"] for i in items if i["product_id"] == product_id), 0)
+                before_stock = after_stock + quantity
                 
-                try:
-                    loop = asyncio.get_running_loop()
-                    loop.create_task(self._send_kafka_event(
-                        event_type=InventoryEventType.RESERVE,
-                        warehouse_id=warehouse_id,
-                        product_id=product_id,
-                        quantity=quantity,
-                        order_id=order_id,
-                        before_stock=before_stock,
-                        after_stock=after_stock,
-                        remark="批量预占"
-                    ))
-                except RuntimeError:
-                    import threading
-                    def run_async():
-                        asyncio.run(self._send_kafka_event(
-                            event_type=InventoryEventType.RESERVE,
-                            warehouse_id=warehouse_id,
-                            product_id=product_id,
-                            quantity=quantity,
-                            order_id=order_id,
-                            before_stock=before_stock,
-                            after_stock=after_stock,
-                            remark="批量预占"
-                        ))
-                    threading.Thread(target=run_async, daemon=True).start()
+                submit_background(self._send_kafka_event(
+                    event_type=InventoryEventType.RESERVE,
+                    warehouse_id=warehouse_id,
+                    product_id=product_id,
+                    quantity=quantity,
+                    order_id=order_id,
+                    before_stock=before_stock,
+                    after_stock=after_stock,
+                    remark="批量预占"
+                ))
             
             return response
             
@@ -294,10 +263,16 @@ class InventoryReservationService:
         start_time = time.time()
         
         try:
-            # 确认库存是最终扣减，不需要额外操作
-            # 预占时已经扣减了库存，确认只是标记状态
+            if not self.cache_service:
+                raise HTTPException(status_code=500, detail="缓存服务未初始化")
+            
+            # 预占时已经扣减了可用库存，确认只需认领预占（移出预占集合），
+            # 之后过期清理不会再把已售出的库存归还
+            confirmed = self.cache_service.atomic_confirm_order(order_id)
+            if not confirmed:
+                raise InventoryError(404, InventoryErrorCode.RESERVATION_NOT_FOUND, "未找到有效的预占记录")
             
-            logger.info(f"✅ 确认库存成功：order_id={order_id}")
+            logger.info(f"✅ 确认库存成功：order_id={order_id}, items={len(confirmed)}")
             
             # 记录幂等性结果
             if self.cache_service and hasattr(self.cache_service, 'set_idempotent'):
@@ -308,37 +283,23 @@ class InventoryReservationService:
                     ttl=86400
                 )
             
-            # 异步发送Kafka事件
-            import asyncio
-            try:
-                loop = asyncio.get_running_loop()
-                loop.create_task(self._send_kafka_event(
+            # 异步发送Kafka事件：每个被确认的商品一条，消费端按真实仓库/商品/数量完结预占记录
+            for warehouse_id, product_id, quantity in confirmed:
+                submit_background(self._send_kafka_event(
                     event_type=InventoryEventType.CONFIRM,
-                    warehouse_id="UNKNOWN",
-                    product_id=0,
-                    quantity=0,
+                    warehouse_id=warehouse_id,
+                    product_id=product_id,
+                    quantity=quantity,
                     order_id=order_id,
                     before_stock=0,
                     after_stock=0,
                     remark="确认库存"
                 ))
-            except RuntimeError:
-                import threading
-                def run_async():
-                    asyncio.run(self._send_kafka_event(
-                        event_type=InventoryEventType.CONFIRM,
-                        warehouse_id="UNKNOWN",
-                        product_id=0,
-                        quantity=0,
-                        order_id=order_id,
-                        before_stock=0,
-                        after_stock=0,
-                        remark="确认库存"
-                    ))
-                threading.Thread(target=run_async, daemon=True).start()
             
             return True
                 
+        except HTTPException:
+            raise
         except Exception as e:
             logger.error(f"确认库存失败：{str(e)}")
             raise HTTPException(status_code=500, detail=f"确认库存失败: {str(e)}")
@@ -358,11 +319,12 @@ class InventoryReservationService:
             if not self.cache_service:
                 raise HTTPException(status_code=500, detail="缓存服务未初始化")
             
-            # 从预占信息中获取释放需要的商品信息
-            # 注意：实际实现中需要从Redis中查询预占记录的商品信息
-            # 这里简化处理：需要前端传入释放的商品信息
+            # 按订单索引认领预占并归还可用库存
+            released = self.cache_service.atomic_release_order(order_id)
+            if not released:
+                raise InventoryError(404, InventoryErrorCode.RESERVATION_NOT_FOUND, "未找到有效的预占记录")
             
-            logger.info(f"✅ Redis 释放预占成功：order_id={order_id}")
+            logger.info(f"✅ Redis 释放预占成功：order_id={order_id}, items={len(released)}")
             
             # 记录幂等性结果
             if self.cache_service and hasattr(self.cache_service, 'set_idempotent'):
@@ -373,34 +335,18 @@ class InventoryReservationService:
                     ttl=86400
                 )
             
-            # 异步发送Kafka事件
-            import asyncio
-            try:
-                loop = asyncio.get_running_loop()
-                loop.create_task(self._send_kafka_event(
+            # 异步发送Kafka事件：每个被释放的商品一条，携带归还前后的可用库存
+            for warehouse_id, product_id, quantity, new_stock in released:
+                submit_background(self._send_kafka_event(
                     event_type=InventoryEventType.RELEASE,
-                    warehouse_id="UNKNOWN",
-                    product_id=0,
-                    quantity=0,
+                    warehouse_id=warehouse_id,
+                    product_id=product_id,
+                    quantity=quantity,
                     order_id=order_id,
-                    before_stock=0,
-                    after_stock=0,
+                    before_stock=new_stock - quantity,
+                    after_stock=new_stock,
                     remark="释放预占"
                 ))
-            except RuntimeError:
-                import threading
-                def run_async():
-                    asyncio.run(self._send_kafka_event(
-                        event_type=InventoryEventType.RELEASE,
-                        warehouse_id="UNKNOWN",
-                        product_id=0,
-                        quantity=0,
-                        order_id=order_id,
-                        before_stock=0,
-                        after_stock=0,
-                        remark="释放预占"
-                    ))
-                threading.Thread(target=run_async, daemon=True).start()
                 
             return True
                 
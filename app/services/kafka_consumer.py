@@ -5,13 +5,14 @@ HTTP 接口不再使用数据库连接池，所有实时操作通过 Redis Lua 
 """
 
 import os
-import json
+import orjson
 import asyncio
 import time
 from typing import Optional
 from aiokafka import AIOKafkaConsumer
-from datetime import datetime
-from sqlalchemy import create_engine
+from datetime import datetime, timedelta
+from sqlalchemy import Integer, bindparam, create_engine, func, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
 from app.models.product_stocks import ProductStock
@@ -28,6 +29,9 @@ KAFKA_ENABLED = os.getenv("KAFKA_ENABLED", "false").lower() == "true"
 INVENTORY_TOPIC = os.getenv("KAFKA_TOPIC", "inventory-changes")
 CONSUMER_GROUP = os.getenv("KAFKA_CONSUMER_GROUP", "inventory-consumer-group")
 
+# 预占有效期（秒），与 Redis 预占集合的 TTL 一致
+RESERVATION_TTL_SECONDS = 900
+
 # ========== Kafka 消费者专用的数据库连接池 ==========
 # 仅供 Kafka 消费者使用，独立于 HTTP 接口
 print("初始化 Kafka 消费者专用数据库连接池...")
@@ -37,6 +41,7 @@ kafka_db_engine = create_engine(
     max_overflow=20,     # 最大溢出连接
     pool_pre_ping=True,  # 自动检测失效连接
     pool_recycle=1800,   # 30 分钟回收连接
+    executemany_mode="values_plus_batch",  # executemany 合并为多值语句，流水批量写入一次往返
 )
 KafkaSessionLocal = sessionmaker(
     bind=kafka_db_engine,
@@ -161,8 +166,13 @@ class MessageMerger:
     """消息合并器 - 将相同商品的相同操作合并
     
     例如：5 个 +1 操作合并为 1 个 +5 操作
+    
+    预占/确认/释放事件绑定订单（预占记录按订单写入、按订单完结），不参与合并，原样直接返回。
     """
     
+    # 绑定订单的事件类型，合并会丢失 order_id 与单笔数量
+    ORDER_EVENT_TYPES = frozenset({"RESERVE", "CONFIRM", "RELEASE"})
+    
     def __init__(self, merge_window_ms: int = 100, merge_threshold: int = 5):
         """
         Args:
@@ -197,6 +207,12 @@ class MessageMerger:
         async with self._lock:
             key = self._get_message_key(event)
             event_type = event.get("event_type")
+            
+            # 订单事件不合并：直接返回，顺带带出已到刷新时间的合并消息
+            if event_type in self.ORDER_EVENT_TYPES:
+                if time.time() - self.last_flush_time >= self.merge_window_ms:
+                    return self._flush_locked() + [event]
+                return [event]
             quantity = event.get("quantity", 0)
             
             current_time = time.time()
@@ -228,46 +244,50 @@ class MessageMerger:
             
             # 如果需要强制刷新，返回所有合并后的消息
             if should_flush:
-                return await self.flush()
+                return self._flush_locked()
             
             return None
     
     async def flush(self) -> list:
         """强制刷新合并缓冲区，返回所有合并后的消息"""
         async with self._lock:
-            if not self.pending_messages:
-                return []
-            
-            merged_messages = []
-            
-            for key, pending in self.pending_messages.items():
-                warehouse_id, product_id, event_type = key
-                
-                # 构建合并后的消息
-                merged_event = {
-                    "warehouse_id": warehouse_id,
-                    "product_id": product_id,
-                    "event_type": event_type,
-                    "quantity": pending["total_quantity"],
-                    "before_stock": pending["events"][0].get("before_stock", 0),
-                    "after_stock": pending["events"][-1].get("after_stock", 0),
-                    "order_id": f"merged_{int(pending['first_time'] * 1000)}",
-                    "_merged_count": pending["count"],  # 记录合并了多少条
-                    "_merge_info": f"{pending['count']} 个 {event_type} 操作已合并"
-                }
-                
-                merged_messages.append(merged_event)
-                self._total_merged += pending["count"]
-            
-            logger.info(
-                f"消息合并完成: 原始 {len(self.pending_messages)} 条 -> 合并后 {len(merged_messages)} 条, "
-                f"共减少 {self._total_merged} 条原始消息"
-            )
+            return self._flush_locked()
+    
+    def _flush_locked(self) -> list:
+        """刷新合并缓冲区（调用方需已持有 self._lock，asyncio.Lock 不可重入）"""
+        if not self.pending_messages:
+            return []
+        
+        merged_messages = []
+        
+        for key, pending in self.pending_messages.items():
+            warehouse_id, product_id, event_type = key
             
-            self.pending_messages = {}
-            self.last_flush_time = time.time()
+            # 构建合并后的消息
+            merged_event = {
+                "warehouse_id": warehouse_id,
+                "product_id": product_id,
+                "event_type": event_type,
+                "quantity": pending["total_quantity"],
+                "before_stock": pending["events"][0].get("before_stock", 0),
+                "after_stock": pending["events"][-1].get("after_stock", 0),
+                "order_id": f"merged_{int(pending['first_time'] * 1000)}",
+                "_merged_count": pending["count"],  # 记录合并了多少条
+                "_merge_info": f"{pending['count']} 个 {event_type} 操作已合并"
+            }
             
-            return merged_messages
+            merged_messages.append(merged_event)
+            self._total_merged += pending["count"]
+        
+        logger.info(
+            f"消息合并完成: 原始 {len(self.pending_messages)} 条 -> 合并后 {len(merged_messages)} 条, "
+            f"共减少 {self._total_merged} 条原始消息"
+        )
+        
+        self.pending_messages = {}
+        self.last_flush_time = time.time()
+        
+        return merged_messages
     
     def get_stats(self) -> dict:
         """获取合并统计信息"""
@@ -316,7 +336,7 @@ async def get_kafka_consumer() -> Optional[AIOKafkaConsumer]:
                 INVENTORY_TOPIC,
                 bootstrap_servers=KAFKA_BOOTSTRAP_SERVERS,
                 group_id=CONSUMER_GROUP,
-                value_deserializer=lambda m: json.loads(m.decode('utf-8')),
+                value_deserializer=orjson.loads,
                 auto_offset_reset='earliest',
                 enable_auto_commit=True
             )
@@ -339,365 +359,329 @@ async def close_kafka_consumer():
 
 
 async def process_inventory_event(event: dict):
-    """处理库存变更事件
+    """处理单条库存变更事件
     
     Args:
         event: 库存变更事件
     """
-    event_type = event.get("event_type")
-    warehouse_id = event.get("warehouse_id")
-    product_id = event.get("product_id")
-    quantity = event.get("quantity")
-    order_id = event.get("order_id")
-    before_stock = event.get("before_stock", 0)
-    after_stock = event.get("after_stock", 0)
-    
-    # 幂等性检查：防止消息重复消费
+    await process_inventory_events([event])
+
+
+async def process_inventory_events(events: list):
+    """批量处理库存变更事件
+    
+    一批事件共用一个会话和事务：库存 UPDATE 逐条执行，流水累积为 log_rows，
+    提交前一次性批量 INSERT，提交后再用一个 pipeline 同步 Redis 缓存。
+    
+    Args:
+        events: 库存变更事件列表（通常为消息合并器一次刷新的结果）
+    """
+    if not events:
+        return
+    
     db = KafkaSessionLocal()  # 使用 Kafka 消费者专用的数据库会话
     redis_client = None
-    cache_service = None
+    log_rows: list[dict] = []
+    synced_stocks: dict = {}  # (warehouse_id, product_id) -> available_stock
+    marked_keys: list = []
     
     try:
         # 初始化 Redis 客户端
         from app.core.redis import redis_client as _redis_client
         redis_client = _redis_client
-        if redis_client:
-            from app.services.inventory_cache import InventoryCacheService
-            cache_service = InventoryCacheService(redis_client)
         
-        # 检查是否已处理过
-        idempotent_key = f"kafka:idempotent:{event_type}:{order_id}:{warehouse_id}:{product_id}"
-        if redis_client:
-            is_processed = redis_client.get(idempotent_key)
-            if is_processed:
-                logger.info(f"消息已处理过，跳过: event_type={event_type}, order_id={order_id}")
-                return
+        for event in events:
+            event_type = event.get("event_type")
+            warehouse_id = event.get("warehouse_id")
+            product_id = event.get("product_id")
+            quantity = event.get("quantity")
+            order_id = event.get("order_id")
+            before_stock = event.get("before_stock", 0)
+            after_stock = event.get("after_stock", 0)
             
-            # 标记为已处理，设置 24 小时过期
-            redis_client.setex(idempotent_key, 86400, "1")
+            # 幂等性检查：防止消息重复消费（SET NX 原子判定并标记，24 小时过期）
+            idempotent_key = f"kafka:idempotent:{event_type}:{order_id}:{warehouse_id}:{product_id}"
+            if redis_client:
+                if not redis_client.set(idempotent_key, "1", ex=86400, nx=True):
+                    logger.info(f"消息已处理过，跳过: event_type={event_type}, order_id={order_id}")
+                    continue
+                marked_keys.append(idempotent_key)
+            
+            # 根据事件类型处理
+            if event_type == "RESERVE":
+                current_available = _handle_reserve(
+                    db, log_rows, warehouse_id, product_id, quantity, order_id, before_stock, after_stock,
+                    merged="_merged_count" in event
+                )
+            elif event_type == "CONFIRM":
+                current_available = _handle_confirm(db, log_rows, warehouse_id, product_id, quantity, order_id)
+            elif event_type == "RELEASE":
+                current_available = _handle_release(db, log_rows, warehouse_id, product_id, quantity, order_id)
+            elif event_type == "INCREASE":
+                current_available = _handle_increase(db, log_rows, warehouse_id, product_id, quantity, before_stock, after_stock)
+            elif event_type == "DECREASE":
+                current_available = _handle_decrease(db, log_rows, warehouse_id, product_id, quantity, before_stock, after_stock)
+            elif event_type == "FREEZE":
+                current_available = _handle_freeze(db, log_rows, warehouse_id, product_id, quantity, before_stock, after_stock)
+            elif event_type == "UNFREEZE":
+                current_available = _handle_unfreeze(db, log_rows, warehouse_id, product_id, quantity, before_stock, after_stock)
+            else:
+                logger.warning(f"未知事件类型: {event_type}")
+                continue
+            
+            if current_available is not None:
+                synced_stocks[(warehouse_id, product_id)] = current_available
         
-        # 根据事件类型处理（带行级锁）
-        if event_type == "RESERVE":
-            await _handle_reserve(db, cache_service, warehouse_id, product_id, quantity, order_id, before_stock, after_stock)
-        elif event_type == "CONFIRM":
-            await _handle_confirm(db, cache_service, warehouse_id, product_id, quantity, order_id)
-        elif event_type == "RELEASE":
-            await _handle_release(db, cache_service, warehouse_id, product_id, quantity, order_id)
-        elif event_type == "INCREASE":
-            await _handle_increase(db, cache_service, warehouse_id, product_id, quantity, before_stock, after_stock)
-        elif event_type == "DECREASE":
-            await _handle_decrease(db, cache_service, warehouse_id, product_id, quantity, before_stock, after_stock)
-        elif event_type == "FREEZE":
-            await _handle_freeze(db, cache_service, warehouse_id, product_id, quantity, before_stock, after_stock)
-        elif event_type == "UNFREEZE":
-            await _handle_unfreeze(db, cache_service, warehouse_id, product_id, quantity, before_stock, after_stock)
-        else:
-            logger.warning(f"未知事件类型: {event_type}")
+        # 流水一次批量写入（驱动侧合并为多值 INSERT），与库存变更同一事务提交
+        if log_rows:
+            from sqlalchemy import insert
+            db.execute(insert(InventoryLog), log_rows)
+        db.commit()
     except Exception as e:
-        logger.error(f"处理库存事件失败: {e}, event: {event}")
+        logger.error(f"处理库存事件失败: {e}, events: {len(events)}")
         db.rollback()
+        # 整批回滚后撤销幂等标记，允许消息重新处理
+        if redis_client and marked_keys:
+            try:
+                redis_client.delete(*marked_keys)
+            except Exception as redis_error:
+                logger.warning(f"撤销幂等标记失败: {redis_error}")
         raise
     finally:
         db.close()
+    
+    # 同步更新 Redis 缓存（一个 pipeline 往返）
+    if redis_client and synced_stocks:
+        try:
+            from app.services.inventory_cache import InventoryCacheService
+            cache_service = InventoryCacheService(redis_client)
+            pipe = redis_client.pipeline(transaction=False)
+            for (warehouse_id, product_id), available in synced_stocks.items():
+                pipe.set(cache_service._get_cache_key(warehouse_id, product_id), available)
+            pipe.execute()
+            logger.debug(f"Redis 已同步 {len(synced_stocks)} 个商品库存")
+        except Exception as e:
+            logger.warning(f"Redis 同步失败（不影响主流程）: {e}")
+
+
+# ========== 预构建的热路径语句 ==========
+# 每条事件都会执行，语句在模块加载时构建一次，参数通过 bindparam 传入，
+# 执行时不再重复构建表达式树，直接命中编译缓存
+_UPDATE_STOCK_RETURNING_STMT = (
+    update(ProductStock)
+    .where(
+        ProductStock.warehouse_id == bindparam("wh_id"),
+        ProductStock.product_id == bindparam("pid")
+    )
+    .values(
+        available_stock=ProductStock.available_stock + bindparam("available_delta", type_=Integer),
+        reserved_stock=ProductStock.reserved_stock + bindparam("reserved_delta", type_=Integer),
+        frozen_stock=ProductStock.frozen_stock + bindparam("frozen_delta", type_=Integer),
+        sales_count=ProductStock.sales_count + bindparam("sales_delta", type_=Integer)
+    )
+    .returning(ProductStock.available_stock, ProductStock.reserved_stock)
+)
 
+_FINISH_ORDER_RESERVATIONS_STMT = (
+    update(InventoryReservation)
+    .where(
+        InventoryReservation.order_id == bindparam("oid"),
+        InventoryReservation.product_id == bindparam("pid"),
+        InventoryReservation.status == ReservationStatus.RESERVED
+    )
+    .values(status=bindparam("target_status", type_=InventoryReservation.status.type))
+)
 
-async def _handle_reserve(db, cache_service, warehouse_id, product_id, quantity, order_id, before_stock, after_stock):
-    """处理预占事件（无锁，直接写入）+ Redis 同步"""
-    from sqlalchemy import select
-    
-    # 直接读取库存记录（不带锁）
-    stock = db.execute(
-        select(ProductStock).where(
-            ProductStock.warehouse_id == warehouse_id,
-            ProductStock.product_id == product_id
-        )
-    ).scalar_one_or_none()
-    
-    if stock:
-        stock.available_stock -= quantity
-        stock.reserved_stock += quantity
-        current_available = stock.available_stock
-        
-        # 记录日志
-        log = InventoryLog(
-            warehouse_id=warehouse_id,
-            product_id=product_id,
-            order_id=order_id,
-            change_type=ChangeType.RESERVE,
-            quantity=-quantity,
-            before_available=before_stock,
-            after_available=stock.available_stock,
-            before_reserved=stock.reserved_stock - quantity,
-            after_reserved=stock.reserved_stock,
-            operator="kafka_consumer"
-        )
-        db.add(log)
-        db.commit()
-        
-        # 同步更新 Redis 缓存
-        if cache_service:
-            try:
-                cache_service.set_cached_stock(warehouse_id, product_id, current_available)
-                logger.debug(f"Redis 已同步预占: warehouse={warehouse_id}, product={product_id}, stock={current_available}")
-            except Exception as e:
-                logger.warning(f"Redis 同步失败（不影响主流程）: {e}")
-        
-        logger.info(f"预占事件处理完成: {order_id}, 库存扣减 {quantity}")
+_INSERT_RESERVATION_STMT = (
+    pg_insert(InventoryReservation)
+    .values(
+        warehouse_id=bindparam("wh_id"),
+        order_id=bindparam("oid"),
+        product_id=bindparam("pid"),
+        quantity=bindparam("qty"),
+        expired_at=func.now() + timedelta(seconds=RESERVATION_TTL_SECONDS)
+    )
+    .on_conflict_do_nothing(index_elements=["warehouse_id", "order_id", "product_id"])
+    .returning(InventoryReservation.id)
+)
 
 
-async def _handle_confirm(db, cache_service, warehouse_id, product_id, quantity, order_id):
-    """处理确认事件（无锁，直接写入）+ Redis 同步"""
-    from sqlalchemy import select
+def _update_stock_returning(db, warehouse_id, product_id, available_delta, reserved_delta=0, frozen_delta=0, sales_delta=0):
+    """单条 UPDATE ... RETURNING 调整库存，返回 (available_stock, reserved_stock)，记录不存在时返回 None
     
-    # 直接读取库存记录（不带锁）
-    stock = db.execute(
-        select(ProductStock).where(
-            ProductStock.warehouse_id == warehouse_id,
-            ProductStock.product_id == product_id
-        )
-    ).scalar_one_or_none()
-    
-    if stock:
-        stock.reserved_stock -= quantity
-        current_available = stock.available_stock
-        
-        # 更新预占记录状态
-        reservations = db.query(InventoryReservation).filter(
-            InventoryReservation.order_id == order_id,
-            InventoryReservation.product_id == product_id,
-            InventoryReservation.status == ReservationStatus.RESERVED
-        ).all()
-        
-        for res in reservations:
-            res.status = ReservationStatus.CONFIRMED
-        
-        log = InventoryLog(
-            warehouse_id=warehouse_id,
-            product_id=product_id,
-            order_id=order_id,
-            change_type=ChangeType.CONFIRM,
-            quantity=0,
-            operator="kafka_consumer"
-        )
-        db.add(log)
-        db.commit()
-        
-        # 同步更新 Redis 缓存（确认不改变可用库存，只改变预占库存）
-        if cache_service:
-            try:
-                cache_service.set_cached_stock(warehouse_id, product_id, current_available)
-                logger.debug(f"Redis 已同步确认: warehouse={warehouse_id}, product={product_id}")
-            except Exception as e:
-                logger.warning(f"Redis 同步失败（不影响主流程）: {e}")
-        
-        logger.info(f"确认事件处理完成: {order_id}")
+    增量在数据库内计算，读取与写入合并为一条语句，没有先读后写的并发覆盖窗口。
+    """
+    return db.execute(
+        _UPDATE_STOCK_RETURNING_STMT,
+        {
+            "wh_id": warehouse_id,
+            "pid": product_id,
+            "available_delta": available_delta,
+            "reserved_delta": reserved_delta,
+            "frozen_delta": frozen_delta,
+            "sales_delta": sales_delta,
+        }
+    ).first()
 
 
-async def _handle_release(db, cache_service, warehouse_id, product_id, quantity, order_id):
-    """处理释放事件（无锁，直接写入）+ Redis 同步"""
-    from sqlalchemy import select
-    
-    # 直接读取库存记录（不带锁）
-    stock = db.execute(
-        select(ProductStock).where(
-            ProductStock.warehouse_id == warehouse_id,
-            ProductStock.product_id == product_id
-        )
-    ).scalar_one_or_none()
+def _finish_order_reservations(db, order_id, product_id, status):
+    """一条 UPDATE 将订单在该商品上的全部有效预占记录改为目标状态"""
+    db.execute(
+        _FINISH_ORDER_RESERVATIONS_STMT,
+        {"oid": order_id, "pid": product_id, "target_status": status}
+    )
+
+
+def _insert_reservation(db, warehouse_id, product_id, quantity, order_id):
+    """INSERT ... ON CONFLICT DO NOTHING RETURNING id 写入预占记录，已存在时返回 None
     
-    if stock:
-        stock.available_stock += quantity
-        stock.reserved_stock -= quantity
-        current_available = stock.available_stock
-        
-        # 更新预占记录状态
-        reservations = db.query(InventoryReservation).filter(
-            InventoryReservation.order_id == order_id,
-            InventoryReservation.product_id == product_id,
-            InventoryReservation.status == ReservationStatus.RESERVED
-        ).all()
-        
-        for res in reservations:
-            res.status = ReservationStatus.RELEASED
-        
-        log = InventoryLog(
-            warehouse_id=warehouse_id,
-            product_id=product_id,
-            order_id=order_id,
-            change_type=ChangeType.RELEASE,
-            quantity=quantity,
-            operator="kafka_consumer"
-        )
-        db.add(log)
-        db.commit()
-        
-        # 同步更新 Redis 缓存
-        if cache_service:
-            try:
-                cache_service.set_cached_stock(warehouse_id, product_id, current_available)
-                logger.debug(f"Redis 已同步释放: warehouse={warehouse_id}, product={product_id}, stock={current_available}")
-            except Exception as e:
-                logger.warning(f"Redis 同步失败（不影响主流程）: {e}")
-        
-        logger.info(f"释放事件处理完成: {order_id}, 库存归还 {quantity}")
+    查重交给唯一约束 (warehouse_id, order_id, product_id)，没有先查后插的竞态，也省一次 SELECT。
+    过期时间与 Redis 预占集合的 TTL 保持一致。
+    """
+    return db.execute(
+        _INSERT_RESERVATION_STMT,
+        {"wh_id": warehouse_id, "oid": order_id, "pid": product_id, "qty": quantity}
+    ).scalar()
 
 
-async def _handle_increase(db, cache_service, warehouse_id, product_id, quantity, before_stock, after_stock):
-    """处理入库事件（无锁，直接写入）+ Redis 同步"""
-    from sqlalchemy import select
+def _handle_reserve(db, log_rows, warehouse_id, product_id, quantity, order_id, before_stock, after_stock,
+                    merged=False):
+    """处理预占事件（无锁，直接写入），返回变更后的可用库存
     
-    # 直接读取库存记录（不带锁）
-    stock = db.execute(
-        select(ProductStock).where(
-            ProductStock.warehouse_id == warehouse_id,
-            ProductStock.product_id == product_id
-        )
-    ).scalar_one_or_none()
+    合并事件的 order_id 是合成的、数量是汇总值，不对应任何真实订单，只调整库存，不写预占记录。
+    """
+    if merged:
+        logger.warning(f"预占事件不应被合并，跳过预占记录写入: product_id={product_id}")
+    elif _insert_reservation(db, warehouse_id, product_id, quantity, order_id) is None:
+        logger.warning(f"预占记录已存在，跳过: order_id={order_id}, product_id={product_id}")
+        return None
     
-    if stock:
-        stock.available_stock += quantity
-        current_available = stock.available_stock
-        
-        log = InventoryLog(
-            warehouse_id=warehouse_id,
-            product_id=product_id,
-            change_type=ChangeType.INCREASE,
-            quantity=quantity,
-            before_available=before_stock,
-            after_available=stock.available_stock,
-            operator="kafka_consumer"
-        )
-        db.add(log)
-        db.commit()
-        
-        # 同步更新 Redis 缓存
-        if cache_service:
-            try:
-                cache_service.set_cached_stock(warehouse_id, product_id, current_available)
-                logger.debug(f"Redis 已同步入库: warehouse={warehouse_id}, product={product_id}, stock={current_available}")
-            except Exception as e:
-                logger.warning(f"Redis 同步失败（不影响主流程）: {e}")
-        
+    row = _update_stock_returning(db, warehouse_id, product_id, -quantity, quantity)
+    if not row:
+        return None
+    
+    current_available, current_reserved = row
+    log_rows.append({
+        "warehouse_id": warehouse_id,
+        "product_id": product_id,
+        "order_id": order_id,
+        "change_type": ChangeType.RESERVE,
+        "quantity": -quantity,
+        "before_available": before_stock,
+        "after_available": current_available,
+        "before_reserved": current_reserved - quantity,
+        "after_reserved": current_reserved,
+        "operator": "kafka_consumer",
+    })
+    logger.info(f"预占事件处理完成: {order_id}, 库存扣减 {quantity}")
+    return current_available
+
+
+def _handle_confirm(db, log_rows, warehouse_id, product_id, quantity, order_id):
+    """处理确认事件（无锁，直接写入），返回变更后的可用库存
+    
+    扣减预占与累加销量在同一条 UPDATE 中完成。
+    """
+    row = _update_stock_returning(db, warehouse_id, product_id, 0, -quantity, sales_delta=quantity)
+    if not row:
+        return None
+    
+    # 更新预占记录状态
+    _finish_order_reservations(db, order_id, product_id, ReservationStatus.CONFIRMED)
+    
+    log_rows.append({
+        "warehouse_id": warehouse_id,
+        "product_id": product_id,
+        "order_id": order_id,
+        "change_type": ChangeType.CONFIRM,
+        "quantity": 0,
+        "operator": "kafka_consumer",
+    })
+    logger.info(f"确认事件处理完成: {order_id}")
+    # 确认不改变可用库存，只改变预占库存
+    return row.available_stock
+
+
+def _handle_release(db, log_rows, warehouse_id, product_id, quantity, order_id):
+    """处理释放事件（无锁，直接写入），返回变更后的可用库存"""
+    row = _update_stock_returning(db, warehouse_id, product_id, quantity, -quantity)
+    if not row:
+        return None
+    
+    # 更新预占记录状态
+    _finish_order_reservations(db, order_id, product_id, ReservationStatus.RELEASED)
+    
+    log_rows.append({
+        "warehouse_id": warehouse_id,
+        "product_id": product_id,
+        "order_id": order_id,
+        "change_type": ChangeType.RELEASE,
+        "quantity": quantity,
+        "operator": "kafka_consumer",
+    })
+    logger.info(f"释放事件处理完成: {order_id}, 库存归还 {quantity}")
+    return row.available_stock
+
+
+def _handle_stock_change(db, log_rows, change_type, warehouse_id, product_id, log_quantity,
+                         before_stock, available_delta, frozen_delta=0):
+    """入库/出库/冻结/解冻共用：调整库存并累积流水，返回变更后的可用库存"""
+    row = _update_stock_returning(db, warehouse_id, product_id, available_delta, frozen_delta=frozen_delta)
+    if not row:
+        return None
+    
+    log_rows.append({
+        "warehouse_id": warehouse_id,
+        "product_id": product_id,
+        "change_type": change_type,
+        "quantity": log_quantity,
+        "before_available": before_stock,
+        "after_available": row.available_stock,
+        "operator": "kafka_consumer",
+    })
+    return row.available_stock
+
+
+def _handle_increase(db, log_rows, warehouse_id, product_id, quantity, before_stock, after_stock):
+    """处理入库事件（无锁，直接写入），返回变更后的可用库存"""
+    current_available = _handle_stock_change(
+        db, log_rows, ChangeType.INCREASE, warehouse_id, product_id, quantity, before_stock, quantity
+    )
+    if current_available is not None:
         logger.info(f"入库事件处理完成: 商品 {product_id}, 库存增加 {quantity}")
+    return current_available
 
 
-async def _handle_decrease(db, cache_service, warehouse_id, product_id, quantity, before_stock, after_stock):
-    """处理出库事件（无锁，直接写入）+ Redis 同步"""
-    from sqlalchemy import select
-    
-    # 直接读取库存记录（不带锁）
-    stock = db.execute(
-        select(ProductStock).where(
-            ProductStock.warehouse_id == warehouse_id,
-            ProductStock.product_id == product_id
-        )
-    ).scalar_one_or_none()
-    
-    if stock:
-        stock.available_stock -= quantity
-        current_available = stock.available_stock
-        
-        log = InventoryLog(
-            warehouse_id=warehouse_id,
-            product_id=product_id,
-            change_type=ChangeType.DECREASE,
-            quantity=-quantity,
-            before_available=before_stock,
-            after_available=stock.available_stock,
-            operator="kafka_consumer"
-        )
-        db.add(log)
-        db.commit()
-        
-        # 同步更新 Redis 缓存
-        if cache_service:
-            try:
-                cache_service.set_cached_stock(warehouse_id, product_id, current_available)
-                logger.debug(f"Redis 已同步出库: warehouse={warehouse_id}, product={product_id}, stock={current_available}")
-            except Exception as e:
-                logger.warning(f"Redis 同步失败（不影响主流程）: {e}")
-        
+def _handle_decrease(db, log_rows, warehouse_id, product_id, quantity, before_stock, after_stock):
+    """处理出库事件（无锁，直接写入），返回变更后的可用库存"""
+    current_available = _handle_stock_change(
+        db, log_rows, ChangeType.DECREASE, warehouse_id, product_id, -quantity, before_stock, -quantity
+    )
+    if current_available is not None:
         logger.info(f"出库事件处理完成: 商品 {product_id}, 库存减少 {quantity}")
+    return current_available
 
 
-async def _handle_freeze(db, cache_service, warehouse_id, product_id, quantity, before_stock, after_stock):
-    """处理冻结事件（无锁，直接写入）+ Redis 同步"""
-    from sqlalchemy import select
-    
-    # 直接读取库存记录（不带锁）
-    stock = db.execute(
-        select(ProductStock).where(
-            ProductStock.warehouse_id == warehouse_id,
-            ProductStock.product_id == product_id
-        )
-    ).scalar_one_or_none()
-    
-    if stock:
-        stock.available_stock -= quantity
-        stock.frozen_stock += quantity
-        current_available = stock.available_stock
-        
-        log = InventoryLog(
-            warehouse_id=warehouse_id,
-            product_id=product_id,
-            change_type=ChangeType.FREEZE,
-            quantity=-quantity,
-            before_available=before_stock,
-            after_available=stock.available_stock,
-            operator="kafka_consumer"
-        )
-        db.add(log)
-        db.commit()
-        
-        # 同步更新 Redis 缓存
-        if cache_service:
-            try:
-                cache_service.set_cached_stock(warehouse_id, product_id, current_available)
-                logger.debug(f"Redis 已同步冻结: warehouse={warehouse_id}, product={product_id}, stock={current_available}")
-            except Exception as e:
-                logger.warning(f"Redis 同步失败（不影响主流程）: {e}")
-        
+def _handle_freeze(db, log_rows, warehouse_id, product_id, quantity, before_stock, after_stock):
+    """处理冻结事件（无锁，直接写入），返回变更后的可用库存"""
+    current_available = _handle_stock_change(
+        db, log_rows, ChangeType.FREEZE, warehouse_id, product_id, -quantity, before_stock, -quantity,
+        frozen_delta=quantity
+    )
+    if current_available is not None:
         logger.info(f"冻结事件处理完成: 商品 {product_id}, 冻结 {quantity}")
+    return current_available
 
 
-async def _handle_unfreeze(db, cache_service, warehouse_id, product_id, quantity, before_stock, after_stock):
-    """处理解冻事件（无锁，直接写入）+ Redis 同步"""
-    from sqlalchemy import select
-    
-    # 直接读取库存记录（不带锁）
-    stock = db.execute(
-        select(ProductStock).where(
-            ProductStock.warehouse_id == warehouse_id,
-            ProductStock.product_id == product_id
-        )
-    ).scalar_one_or_none()
-    
-    if stock:
-        stock.available_stock += quantity
-        stock.frozen_stock -= quantity
-        current_available = stock.available_stock
-        
-        log = InventoryLog(
-            warehouse_id=warehouse_id,
-            product_id=product_id,
-            change_type=ChangeType.UNFREEZE,
-            quantity=quantity,
-            before_available=before_stock,
-            after_available=stock.available_stock,
-            operator="kafka_consumer"
-        )
-        db.add(log)
-        db.commit()
-        
-        # 同步更新 Redis 缓存
-        if cache_service:
-            try:
-                cache_service.set_cached_stock(warehouse_id, product_id, current_available)
-                logger.debug(f"Redis 已同步解冻: warehouse={warehouse_id}, product={product_id}, stock={current_available}")
-            except Exception as e:
-                logger.warning(f"Redis 同步失败（不影响主流程）: {e}")
-        
+def _handle_unfreeze(db, log_rows, warehouse_id, product_id, quantity, before_stock, after_stock):
+    """处理解冻事件（无锁，直接写入），返回变更后的可用库存"""
+    current_available = _handle_stock_change(
+        db, log_rows, ChangeType.UNFREEZE, warehouse_id, product_id, quantity, before_stock, quantity,
+        frozen_delta=-quantity
+    )
+    if current_available is not None:
         logger.info(f"解冻事件处理完成: 商品 {product_id}, 解冻 {quantity}")
+    return current_available
 
 
 async def start_kafka_consumer():
@@ -752,10 +736,9 @@ async def start_kafka_consumer():
                     merged_events = await message_merger.add(event)
                     
                     if merged_events:
-                        # 有合并后的消息需要处理
+                        # 有合并后的消息需要处理：整批一个事务，流水批量写入
+                        await process_inventory_events(merged_events)
                         for merged_event in merged_events:
-                            # 处理合并后的消息
-                            await process_inventory_event(merged_event)
                             total_processed += 1
                             total_merged += merged_event.get("_merged_count", 1)
                             logger.debug(
@@ -807,12 +790,11 @@ async def start_kafka_consumer():
             if 'message_merger' in locals() and message_merger:
                 remaining = await message_merger.flush()
                 if remaining:
-                    for event in remaining:
-                        try:
-                            await process_inventory_event(event)
-                            total_processed += 1
-                        except Exception as e:
-                            logger.error(f"处理剩余消息失败：{e}")
+                    try:
+                        await process_inventory_events(remaining)
+                        total_processed += len(remaining)
+                    except Exception as e:
+                        logger.error(f"处理剩余消息失败：{e}")
             
             # 输出最终统计（如果 start_time 已初始化）
             if 'start_time' in locals():
@@ -1,12 +0,0 @@
-# Models
-from .product import Product
-from .product_stocks import ProductStock
-from .inventory_reservations import InventoryReservation
-from .idempotency_keys import IdempotencyKey
-
-__all__ = [
-    "Product",
-    "ProductStock", 
-    "InventoryReservation",
-    "IdempotencyKey"
-]
\ No newline at end of file
@@ -1,17 +0,0 @@
-"""库存服务模块"""
-
-from app.services.inventory_service import InventoryService
-from app.services.inventory_cache import InventoryCacheService
-from app.services.inventory_query import InventoryQueryService
-from app.services.inventory_operation import InventoryOperationService
-from app.services.inventory_reservation import InventoryReservationService
-from app.services.inventory_log import InventoryLogService
-
-__all__ = [
-    "InventoryService",
-    "InventoryCacheService",
-    "InventoryQueryService",
-    "InventoryOperationService",
-    "InventoryReservationService",
-    "InventoryLogService",
-]
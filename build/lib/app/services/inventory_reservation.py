@@ -1,411 +0,0 @@
-"""库存预占服务 - 纯Redis操作，Kafka异步同步数据库"""
-
-from fastapi import HTTPException
-from typing import Dict, List, Optional, Any
-import time
-import logging
-
-from app.services.inventory_cache import InventoryCacheService
-from app.core.kafka_producer import send_inventory_event, InventoryEventType
-
-logger = logging.getLogger(__name__)
-
-
-class InventoryReservationService:
-    """库存预占服务 - 纯Redis操作，Kafka异步同步数据库
-    
-    使用 Redis Lua 脚本实现原子化库存预占
-    """
-
-    def __init__(self, cache_service: InventoryCacheService = None):
-        self.cache_service = cache_service
-
-    async def _send_kafka_event(
-        self,
-        event_type: str,
-        warehouse_id: str,
-        product_id: int,
-        quantity: int,
-        order_id: str,
-        before_stock: int,
-        after_stock: int,
-        remark: str = None
-    ):
-        """发送Kafka事件"""
-        try:
-            await send_inventory_event(
-                event_type=event_type,
-                warehouse_id=warehouse_id,
-                product_id=product_id,
-                quantity=quantity,
-                order_id=order_id,
-                before_stock=before_stock,
-                after_stock=after_stock,
-                remark=remark
-            )
-        except Exception as e:
-            logger.warning(f"Kafka事件发送失败（不影响主流程）: {e}")
-
-    def reserve_stock(
-        self,
-        warehouse_id: str,
-        product_id: int,
-        quantity: int,
-        order_id: str
-    ) -> bool:
-        """预占库存 - Redis Lua 脚本原子操作，Kafka异步同步"""
-        start_time = time.time()
-        
-        # 幂等性检查：如果已处理过，直接返回之前的结果
-        if self.cache_service and hasattr(self.cache_service, 'check_idempotent'):
-            is_duplicate, previous_result = self.cache_service.check_idempotent("reserve", order_id)
-            if is_duplicate and previous_result:
-                logger.info(f"幂等命中：order_id={order_id}, 返回之前的结果")
-                return previous_result.get("success", True)
-        
-        try:
-            # 使用 Redis Lua 脚本原子扣减库存
-            if not self.cache_service:
-                raise HTTPException(status_code=500, detail="缓存服务未初始化")
-            
-            # 获取预占前的库存
-            current_stock = self.cache_service.get_cached_stock(warehouse_id, product_id)
-            if current_stock is None:
-                current_stock = 0
-            
-            new_stock, is_duplicate = self.cache_service.atomic_reserve_stock(
-                warehouse_id=warehouse_id,
-                product_id=product_id,
-                quantity=quantity,
-                order_id=order_id,
-                ttl=900  # 15 分钟
-            )
-            
-            if is_duplicate:
-                logger.warning(f"重复预占：order_id={order_id}")
-                raise HTTPException(status_code=400, detail="该订单已预占此商品")
-            
-            if new_stock < 0:
-                logger.warning(f"库存不足：warehouse={warehouse_id}, product={product_id}, stock={new_stock}")
-                raise HTTPException(status_code=400, detail="库存不足")
-            
-            before_stock = current_stock
-            after_stock = new_stock
-            
-            logger.info(f"✅ Redis 预占成功：order={order_id}, stock={before_stock}→{after_stock}")
-            
-            # 记录幂等性结果（24 小时有效）
-            if self.cache_service and hasattr(self.cache_service, 'set_idempotent'):
-                self.cache_service.set_idempotent(
-                    operation="reserve",
-                    order_id=order_id,
-                    result_data={"success": True, "warehouse_id": warehouse_id, "product_id": product_id, "quantity": quantity},
-                    ttl=86400
-                )
-            
-            # 异步发送Kafka事件
-            import asyncio
-            try:
-                loop = asyncio.get_running_loop()
-                loop.create_task(self._send_kafka_event(
-                    event_type=InventoryEventType.RESERVE,
-                    warehouse_id=warehouse_id,
-                    product_id=product_id,
-                    quantity=quantity,
-                    order_id=order_id,
-                    before_stock=before_stock,
-                    after_stock=after_stock,
-                    remark="预占库存"
-                ))
-            except RuntimeError:
-                import threading
-                def run_async():
-                    asyncio.run(self._send_kafka_event(
-                        event_type=InventoryEventType.RESERVE,
-                        warehouse_id=warehouse_id,
-                        product_id=product_id,
-                        quantity=quantity,
-                        order_id=order_id,
-                        before_stock=before_stock,
-                        after_stock=after_stock,
-                        remark="预占库存"
-                    ))
-                threading.Thread(target=run_async, daemon=True).start()
-            
-            return True
-            
-        except HTTPException:
-            raise
-        except Exception as e:
-            logger.error(f"预占库存失败：{str(e)}")
-            raise HTTPException(status_code=500, detail=f"预占库存失败: {str(e)}")
-
-    def reserve_batch(
-        self,
-        order_id: str,
-        items: List[Dict[str, Any]]
-    ) -> Dict[str, Any]:
-        """批量预占库存（使用 Lua 脚本原子操作）"""
-        start_time = time.time()
-        
-        # 幂等性检查
-        if self.cache_service and hasattr(self.cache_service, 'check_idempotent'):
-            is_duplicate, previous_result = self.cache_service.check_idempotent("reserve_batch", order_id)
-            if is_duplicate and previous_result:
-                logger.info(f"幂等命中（批量预占）: order_id={order_id}")
-                return previous_result
-        
-        try:
-            if not self.cache_service:
-                raise HTTPException(status_code=500, detail="缓存服务未初始化")
-            
-            # 构建参数
-            warehouse_id = items[0]["warehouse_id"] if items else None
-            if not warehouse_id:
-                raise HTTPException(status_code=400, detail="仓库 ID 不能为空")
-            
-            # 获取预占前的库存
-            product_ids = [item["product_id"] for item in items]
-            before_stocks = self.cache_service.batch_get_cached_stocks(warehouse_id, product_ids)
-            
-            # 调用 Lua 脚本原子执行批量预占
-            result = self.cache_service.atomic_batch_reserve(
-                warehouse_id=warehouse_id,
-                order_id=order_id,
-                items=[(item["product_id"], item["quantity"]) for item in items]
-            )
-            
-            if not result:
-                raise HTTPException(status_code=500, detail="批量预占失败")
-            
-            # 解析结果
-            success_items = []
-            failed_items = []
-            
-            for res in result:
-                product_id = res['product_id']
-                new_stock = res['new_stock']
-                success = res['success']
-                
-                if success:
-                    success_items.append({
-                        "warehouse_id": warehouse_id,
-                        "product_id": product_id,
-                        "success": True,
-                        "message": "预占成功",
-                        "new_stock": new_stock
-                    })
-                else:
-                    failed_items.append({
-                        "warehouse_id": warehouse_id,
-                        "product_id": product_id,
-                        "success": False,
-                        "message": "库存不足或重复预占",
-                        "new_stock": new_stock
-                    })
-            
-            # 检查是否有失败的项目
-            if failed_items:
-                logger.warning(f"批量预占部分失败：{len(failed_items)}/{len(items)}")
-                raise HTTPException(
-                    status_code=400,
-                    detail={
-                        "message": "部分商品预占失败",
-                        "failed_items": failed_items,
-                        "total_items": len(items),
-                        "failed_count": len(failed_items)
-                    }
-                )
-            
-            logger.info(f"✅ 批量预占成功：order_id={order_id}, count={len(success_items)}")
-            
-            response = {
-                "order_id": order_id,
-                "total_items": len(items),
-                "success_items": len(success_items),
-                "failed_items": 0,
-                "details": success_items
-            }
-            
-            # 记录幂等性结果
-            if self.cache_service and hasattr(self.cache_service, 'set_idempotent'):
-                self.cache_service.set_idempotent(
-                    operation="reserve_batch",
-                    order_id=order_id,
-                    result_data=response,
-                    ttl=86400
-                )
-            
-            # 异步发送Kafka事件
-            import asyncio
-            for item in success_items:
-                product_id = item["product_id"]
-                before_stock = before_stocks.get(product_id, 0)
-                after_stock = item.get("new_stock", 0)
-                quantity = next((i["quantity"] for i in items if i["product_id"] == product_id), 0)
-                
-                try:
-                    loop = asyncio.get_running_loop()
-                    loop.create_task(self._send_kafka_event(
-                        event_type=InventoryEventType.RESERVE,
-                        warehouse_id=warehouse_id,
-                        product_id=product_id,
-                        quantity=quantity,
-                        order_id=order_id,
-                        before_stock=before_stock,
-                        after_stock=after_stock,
-                        remark="批量预占"
-                    ))
-                except RuntimeError:
-                    import threading
-                    def run_async():
-                        asyncio.run(self._send_kafka_event(
-                            event_type=InventoryEventType.RESERVE,
-                            warehouse_id=warehouse_id,
-                            product_id=product_id,
-                            quantity=quantity,
-                            order_id=order_id,
-                            before_stock=before_stock,
-                            after_stock=after_stock,
-                            remark="批量预占"
-                        ))
-                    threading.Thread(target=run_async, daemon=True).start()
-            
-            return response
-            
-        except HTTPException:
-            raise
-        except Exception as e:
-            logger.error(f"批量预占失败：{str(e)}")
-            raise HTTPException(status_code=500, detail=f"批量预占失败: {str(e)}")
-
-    def confirm_stock(self, order_id: str) -> bool:
-        """确认库存 - Redis操作，Kafka异步同步
-        
-        确认预占，扣减预占库存（实际扣减）
-        """
-        # 幂等性检查
-        if self.cache_service and hasattr(self.cache_service, 'check_idempotent'):
-            is_duplicate, previous_result = self.cache_service.check_idempotent("confirm", order_id)
-            if is_duplicate and previous_result:
-                logger.info(f"幂等命中 (confirm): order_id={order_id}")
-                return previous_result.get("success", True)
-        
-        start_time = time.time()
-        
-        try:
-            # 确认库存是最终扣减，不需要额外操作
-            # 预占时已经扣减了库存，确认只是标记状态
-            
-            logger.info(f"✅ 确认库存成功：order_id={order_id}")
-            
-            # 记录幂等性结果
-            if self.cache_service and hasattr(self.cache_service, 'set_idempotent'):
-                self.cache_service.set_idempotent(
-                    operation="confirm",
-                    order_id=order_id,
-                    result_data={"success": True},
-                    ttl=86400
-                )
-            
-            # 异步发送Kafka事件
-            import asyncio
-            try:
-                loop = asyncio.get_running_loop()
-                loop.create_task(self._send_kafka_event(
-                    event_type=InventoryEventType.CONFIRM,
-                    warehouse_id="UNKNOWN",
-                    product_id=0,
-                    quantity=0,
-                    order_id=order_id,
-                    before_stock=0,
-                    after_stock=0,
-                    remark="确认库存"
-                ))
-            except RuntimeError:
-                import threading
-                def run_async():
-                    asyncio.run(self._send_kafka_event(
-                        event_type=InventoryEventType.CONFIRM,
-                        warehouse_id="UNKNOWN",
-                        product_id=0,
-                        quantity=0,
-                        order_id=order_id,
-                        before_stock=0,
-                        after_stock=0,
-                        remark="确认库存"
-                    ))
-                threading.Thread(target=run_async, daemon=True).start()
-            
-            return True
-                
-        except Exception as e:
-            logger.error(f"确认库存失败：{str(e)}")
-            raise HTTPException(status_code=500, detail=f"确认库存失败: {str(e)}")
-
-    def release_stock(self, order_id: str) -> bool:
-        """释放库存 - Redis Lua 脚本原子操作，Kafka异步同步"""
-        # 幂等性检查
-        if self.cache_service and hasattr(self.cache_service, 'check_idempotent'):
-            is_duplicate, previous_result = self.cache_service.check_idempotent("release", order_id)
-            if is_duplicate and previous_result:
-                logger.info(f"幂等命中 (release): order_id={order_id}")
-                return previous_result.get("success", True)
-        
-        start_time = time.time()
-        
-        try:
-            if not self.cache_service:
-                raise HTTPException(status_code=500, detail="缓存服务未初始化")
-            
-            # 从预占信息中获取释放需要的商品信息
-            # 注意：实际实现中需要从Redis中查询预占记录的商品信息
-            # 这里简化处理：需要前端传入释放的商品信息
-            
-            logger.info(f"✅ Redis 释放预占成功：order_id={order_id}")
-            
-            # 记录幂等性结果
-            if self.cache_service and hasattr(self.cache_service, 'set_idempotent'):
-                self.cache_service.set_idempotent(
-                    operation="release",
-                    order_id=order_id,
-                    result_data={"success": True},
-                    ttl=86400
-                )
-            
-            # 异步发送Kafka事件
-            import asyncio
-            try:
-                loop = asyncio.get_running_loop()
-                loop.create_task(self._send_kafka_event(
-                    event_type=InventoryEventType.RELEASE,
-                    warehouse_id="UNKNOWN",
-                    product_id=0,
-                    quantity=0,
-                    order_id=order_id,
-                    before_stock=0,
-                    after_stock=0,
-                    remark="释放预占"
-                ))
-            except RuntimeError:
-                import threading
-                def run_async():
-                    asyncio.run(self._send_kafka_event(
-                        event_type=InventoryEventType.RELEASE,
-                        warehouse_id="UNKNOWN",
-                        product_id=0,
-                        quantity=0,
-                        order_id=order_id,
-                        before_stock=0,
-                        after_stock=0,
-                        remark="释放预占"
-                    ))
-                threading.Thread(target=run_async, daemon=True).start()
-                
-            return True
-                
-        except HTTPException:
-            raise
-        except Exception as e:
-            logger.error(f"释放库存失败：{str(e)}")
-            raise HTTPException(status_code=500, detail=f"释放库存失败: {str(e)}")
@@ -1 +0,0 @@
-"""Celery 任务模块"""
\ No newline at end of file
@@ -4,8 +4,8 @@ import os
 from celery import Celery
 from celery.schedules import crontab
 
-# 创建 Celery 应用实例
-app = Celery('inventory_worker')
+# 创建 Celery 应用实例（include 的任务模块只在 worker 启动时导入，Web 进程按名称提交任务）
+app = Celery('inventory_worker', include=['tasks.inventory_tasks'])
 
 # 从环境变量获取 Redis 配置
 REDIS_HOST = os.getenv("REDIS_HOST", "localhost")
@@ -24,6 +24,18 @@ app.conf.accept_content = ['json']
 app.conf.timezone = 'Asia/Shanghai'
 app.conf.enable_utc = True
 
+# 清理任务名称（Web 进程按名称提交，无需导入任务模块）
+CLEANUP_TASK_NAME = 'tasks.inventory.cleanup_expired_reservations'
+FINISH_CLEANUP_TASK_NAME = 'tasks.inventory.finish_cleanup'
+
+# 清理任务运行标记（值为汇总回调任务ID），防止重复提交清理任务
+CLEANUP_RUNNING_KEY = "inventory:cleanup:running"
+CLEANUP_RUNNING_TTL = 300
+
+# 定时清理的分片数：每个分片只处理 id % shards == shard 的预占记录，各 worker 扫描互不重叠
+CLEANUP_BEAT_SHARDS = int(os.getenv("CLEANUP_BEAT_SHARDS", "4"))
+CLEANUP_BEAT_BATCH_SIZE = 500
+
 # 任务路由配置（可选）
 app.conf.task_routes = {
     'tasks.inventory.*': {'queue': 'inventory'},
@@ -52,15 +64,25 @@ app.conf.beat_schedule = {
             'queue': 'inventory',
         }
     },
-    # 每天凌晨 3 点清理过期预占
-    'cleanup-expired-reservations-daily': {
-        'task': 'tasks.inventory.cleanup_expired_reservations',
-        'schedule': crontab(hour=3, minute=0),  # 每天凌晨 3 点
-        'options': {
-            'queue': 'inventory',
+    # 每天凌晨 3 点清理过期预占（按分片拆成多个任务并行执行）
+    **{
+        f'cleanup-expired-reservations-daily-shard-{shard}': {
+            'task': CLEANUP_TASK_NAME,
+            'schedule': crontab(hour=3, minute=0),  # 每天凌晨 3 点
+            'args': (CLEANUP_BEAT_BATCH_SIZE, shard, CLEANUP_BEAT_SHARDS),
+            'options': {
+                'queue': 'inventory',
+            }
         }
+        for shard in range(CLEANUP_BEAT_SHARDS)
     },
 }
 
 # 导出应用实例
-__all__ = ['app']
\ No newline at end of file
+__all__ = [
+    'app',
+    'CLEANUP_TASK_NAME',
+    'FINISH_CLEANUP_TASK_NAME',
+    'CLEANUP_RUNNING_KEY',
+    'CLEANUP_RUNNING_TTL',
+]
\ No newline at end of file
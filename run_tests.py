@@ -29,7 +29,9 @@ def run_tests(test_pattern=None, verbose=False, coverage=False, parallel=False):
 
     # 并行执行选项
     if parallel:
-        cmd.extend(["-n", "auto"])  # 使用 pytest-xdist 自动并行
+        # 使用 pytest-xdist 自动并行，按文件分发：同一文件的测试留在同一 worker，
+        # 模块级 TestClient 只构建一次，文件内依赖执行顺序的测试也不会被拆开
+        cmd.extend(["-n", "auto", "--dist=loadfile"])
     
     # 如果指定了测试模式
     if test_pattern:
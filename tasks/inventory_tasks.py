@@ -1,13 +1,57 @@
 """库存相关的 Celery 任务（企业级实现）"""
 
-from celery_app import app
-from app.db.session import SessionLocal
-from app.services.inventory_service import InventoryService
-from app.core.redis import redis_client
+from celery_app import (
+    app,
+    CLEANUP_TASK_NAME,
+    FINISH_CLEANUP_TASK_NAME,
+    CLEANUP_RUNNING_KEY,
+)
+from celery.signals import worker_process_init, task_postrun
+from sqlalchemy import create_engine
+from sqlalchemy.orm import scoped_session, sessionmaker
+from app.core.config import settings
+from app.db.session import engine
+from app.services.inventory_service import get_global_cache_service
+from app.core.dependencies import get_inventory_service
+from app.services.inventory_log import InventoryLogService
+from app.core.redis import redis_client, redis_lock
 import logging
 
 logger = logging.getLogger(__name__)
 
+# prefork 子进程一次只执行一个任务，每个子进程保留少量常驻连接即可
+WORKER_DB_POOL_SIZE = 2
+
+# 任务使用的数据库会话：同一线程内复用，任务结束后由 task_postrun 回收
+TaskSession = scoped_session(sessionmaker(
+    bind=engine,
+    autoflush=False,
+    autocommit=False,
+    expire_on_commit=False,
+))
+
+
+@worker_process_init.connect
+def _init_worker_db_pool(**kwargs):
+    """prefork 子进程启动时创建独立的小连接池
+    
+    不复用父进程 fork 过来的连接；定时任务间隔长且没有保活任务，开启 pre_ping 避免拿到已断开的连接。
+    """
+    engine.dispose(close=False)
+    TaskSession.configure(bind=create_engine(
+        settings.database_url,
+        pool_size=WORKER_DB_POOL_SIZE,
+        max_overflow=0,
+        pool_pre_ping=True,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+    ))
+
+
+@task_postrun.connect
+def _remove_task_session(**kwargs):
+    """任务结束后关闭会话，连接归还连接池"""
+    TaskSession.remove()
+
 @app.task(name='tasks.inventory.process_reservation')
 def process_reservation(order_id: str, product_items: list):
     """处理库存预占的异步任务
@@ -16,36 +60,43 @@ def process_reservation(order_id: str, product_items: list):
         order_id: 订单ID
         product_items: 商品项列表 [{"warehouse_id": "WH01", "product_id": 1, "quantity": 2}, ...]
     """
-    db = SessionLocal()
     try:
-        service = InventoryService(db, redis_client)
-        # 调用批量预占逻辑
-        result = service.reserve_batch(order_id, product_items)
-        db.commit()
+        # 复用进程内的库存服务单例（纯 Redis，无需数据库会话）
+        result = get_inventory_service().reserve_batch(order_id, product_items)
         logger.info(f"处理订单预占: {order_id}, result: {result}")
         return {"status": "success", "order_id": order_id, "result": result}
     except Exception as e:
         logger.error(f"处理订单预占失败: {order_id}, error: {str(e)}")
-        db.rollback()
         raise
-    finally:
-        db.close()
 
-@app.task(name='tasks.inventory.cleanup_expired_reservations')  
-def cleanup_expired_reservations(batch_size: int = 500):
+@app.task(name=CLEANUP_TASK_NAME)  
+def cleanup_expired_reservations(batch_size: int = 500, shard: int = 0, shards: int = 1):
     """清理过期的预占记录（企业级实现）
     
     Args:
         batch_size: 批处理大小，默认500条
+        shard: 分片序号，只处理 id % shards == shard 的记录
+        shards: 分片总数，默认1（不分片）
     
     Returns:
         清理的记录数量描述
     """
-    db = SessionLocal()
+    return _run_cleanup(batch_size, shard, shards)
+
+
+@app.task(bind=True, name=FINISH_CLEANUP_TASK_NAME)
+def finish_cleanup(self, results: list):
+    """分片清理全部完成后的汇总回调：合并结果并清除运行标记"""
+    redis_lock.release(CLEANUP_RUNNING_KEY, self.request.id)
+    return f"分片清理完成：{'；'.join(results)}"
+
+
+def _run_cleanup(batch_size: int, shard: int = 0, shards: int = 1) -> str:
+    """执行清理并返回结果描述"""
+    db = TaskSession()
     try:
-        service = InventoryService(db, redis_client)
-        count = service.cleanup_expired_reservations(batch_size)
-        db.commit()
+        service = InventoryLogService(db, get_global_cache_service(redis_client))
+        count = service.cleanup_expired_reservations(batch_size, shard, shards)
         result = f"成功清理 {count} 条过期预占记录"
         logger.info(result)
         return result
@@ -53,8 +104,6 @@ def cleanup_expired_reservations(batch_size: int = 500):
         logger.error(f"清理过期预占任务执行失败: {str(e)}")
         db.rollback()
         raise
-    finally:
-        db.close()
 
 @app.task(name='tasks.inventory.sync_redis_to_db')
 def sync_redis_to_db(warehouse_id: str = None):
@@ -69,10 +118,11 @@ def sync_redis_to_db(warehouse_id: str = None):
     Returns:
         同步结果描述
     """
+    from sqlalchemy import select
     from app.models.product_stocks import ProductStock
     from app.services.inventory_cache import InventoryCacheService
     
-    db = SessionLocal()
+    db = TaskSession()
     try:
         if not redis_client:
             logger.warning("Redis 不可用，跳过同步")
@@ -90,22 +140,24 @@ def sync_redis_to_db(warehouse_id: str = None):
         for wh in warehouses:
             wh_id = wh[0]
             
-            # 查询该仓库的所有库存
-            stocks = db.query(ProductStock).filter(
-                ProductStock.warehouse_id == wh_id
-            ).all()
-            
-            if not stocks:
-                continue
+            # 查询该仓库的所有库存：只取两列，按 1000 行分批流式读取
+            stmt = (
+                select(ProductStock.product_id, ProductStock.available_stock)
+                .where(ProductStock.warehouse_id == wh_id)
+                .execution_options(yield_per=1000)
+            )
             
-            # 构建库存映射
-            stock_map = {s.product_id: s.available_stock for s in stocks}
+            synced = 0
+            for rows in db.execute(stmt).partitions():
+                # 每批一次 MSET 写入 Redis
+                cache_service.batch_set_cached_stocks(wh_id, dict(rows))
+                synced += len(rows)
             
-            # 批量写入 Redis
-            cache_service.batch_set_cached_stocks(wh_id, stock_map)
-            total_synced += len(stock_map)
+            if not synced:
+                continue
+            total_synced += synced
             
-            logger.info(f"仓库 {wh_id} 同步完成: {len(stock_map)} 条记录")
+            logger.info(f"仓库 {wh_id} 同步完成: {synced} 条记录")
         
         result = f"Redis 同步完成，共 {total_synced} 条记录"
         logger.info(result)
@@ -114,8 +166,6 @@ def sync_redis_to_db(warehouse_id: str = None):
     except Exception as e:
         logger.error(f"Redis 同步任务失败: {str(e)}")
         raise
-    finally:
-        db.close()
 
 
 @app.task(name='tasks.inventory.verify_redis_db_consistency')
@@ -132,11 +182,12 @@ def verify_redis_db_consistency(warehouse_id: str = None, sample_size: int = 100
     Returns:
         校验结果
     """
+    from sqlalchemy import select
     from app.models.product_stocks import ProductStock
     from app.services.inventory_cache import InventoryCacheService
     import random
     
-    db = SessionLocal()
+    db = TaskSession()
     try:
         if not redis_client:
             logger.warning("Redis 不可用，跳过校验")
@@ -156,32 +207,33 @@ def verify_redis_db_consistency(warehouse_id: str = None, sample_size: int = 100
         for wh in warehouses:
             wh_id = wh[0]
             
-            # 查询该仓库的库存（可抽样）
+            # 查询该仓库的库存（可抽样），只取两列，跳过 ORM 对象构建
+            stmt = select(ProductStock.product_id, ProductStock.available_stock).where(
+                ProductStock.warehouse_id == wh_id
+            )
             if sample_size > 0:
-                stocks = db.query(ProductStock).filter(
-                    ProductStock.warehouse_id == wh_id
-                ).limit(sample_size).all()
-            else:
-                stocks = db.query(ProductStock).filter(
-                    ProductStock.warehouse_id == wh_id
-                ).all()
+                stmt = stmt.limit(sample_size)
+            db_stocks = dict(db.execute(stmt).all())
+            if not db_stocks:
+                continue
+            
+            # 一次 MGET 取回该仓库全部缓存值，比较一致性
+            redis_stocks = cache_service.batch_get_cached_stocks(wh_id, list(db_stocks))
+            mismatched = {
+                product_id: db_value
+                for product_id, db_value in db_stocks.items()
+                if redis_stocks.get(product_id) != db_value
+            }
+            for product_id, db_value in mismatched.items():
+                logger.warning(
+                    f"发现不一致: warehouse={wh_id}, product={product_id}, "
+                    f"Redis={redis_stocks.get(product_id)}, DB={db_value}"
+                )
             
-            for stock in stocks:
-                # 从 Redis 获取缓存值
-                redis_value = cache_service.get_cached_stock(wh_id, stock.product_id)
-                db_value = stock.available_stock
-                
-                # 比较一致性
-                if redis_value is not None and redis_value != db_value:
-                    inconsistent_count += 1
-                    logger.warning(
-                        f"发现不一致: warehouse={wh_id}, product={stock.product_id}, "
-                        f"Redis={redis_value}, DB={db_value}"
-                    )
-                    
-                    # 自动修复：使用数据库值覆盖 Redis
-                    cache_service.set_cached_stock(wh_id, stock.product_id, db_value)
-                    fixed_count += 1
+            # 自动修复：使用数据库值覆盖 Redis（一次 MSET）
+            cache_service.batch_set_cached_stocks(wh_id, mismatched)
+            inconsistent_count += len(mismatched)
+            fixed_count += len(mismatched)
         
         result = f"一致性校验完成: 发现 {inconsistent_count} 条不一致，已修复 {fixed_count} 条"
         logger.info(result)
@@ -194,8 +246,6 @@ def verify_redis_db_consistency(warehouse_id: str = None, sample_size: int = 100
     except Exception as e:
         logger.error(f"一致性校验任务失败: {str(e)}")
         raise
-    finally:
-        db.close()
 
 # 导出任务
 __all__ = [
@@ -5,22 +5,65 @@ FastAPI Mall 应用综合测试脚本
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import httpx
+import asyncio
 import time
 import json
+import orjson
+import random
 import sys
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 import pytest
 from fastapi import FastAPI
 
 BASE_URL = "http://localhost:8000"
 API_PREFIX = "/api/v1"
 
+# 探测路径和响应头名在模块加载时确定，不在每次请求时重新拼接
+STOCK_PROBE_PATH = f"{API_PREFIX}/inventory/stock/999999"
+CORS_HEADER_KEY = "access-control-allow-origin"
+
+# 离线冒烟测试的预置响应：路径 -> (状态码, JSON 响应体)
+CANNED_RESPONSES = {
+    "/health": (200, {"status": "healthy"}),
+    "/": (200, {"message": "库存微服务 API"}),
+    "/docs": (200, None),
+    "/openapi.json": (200, {"openapi": "3.1.0", "info": {"title": "库存微服务 API", "version": "1.0.0"}}),
+    STOCK_PROBE_PATH: (200, {"success": True, "product_id": 999999, "available_stock": 0}),
+}
+
+
+def canned_transport() -> httpx.MockTransport:
+    """回放预置响应的 httpx 传输层，不需要启动服务"""
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path not in CANNED_RESPONSES:
+            return httpx.Response(404)
+        status_code, body = CANNED_RESPONSES[request.url.path]
+        headers = {CORS_HEADER_KEY: "*"}
+        if body is None:
+            return httpx.Response(status_code, headers=headers, text="<html></html>")
+        return httpx.Response(status_code, headers=headers, content=orjson.dumps(body))
+
+    return httpx.MockTransport(handler)
+
+
 class AppTester:
     """应用测试器类"""
     
-    def __init__(self, base_url: str = BASE_URL):
+    def __init__(self, base_url: str = BASE_URL, transport: Optional[httpx.AsyncBaseTransport] = None):
         self.base_url = base_url
+        # 指定 transport 时（如 canned_transport()）不访问真实服务
+        self.transport = transport
+        self.url_health = f"{base_url}/health"
+        self.openapi_etag = None
         self.session = requests.Session()
+        # 同步会话只用于启动前的就绪探测，各次探测复用同一连接池（requests 默认已带 keep-alive/gzip 请求头）
+        # 重试交给 wait_for_service 控制，适配器本身不重试；各项测试使用 _run_tests 中的异步客户端
+        adapter = HTTPAdapter(pool_connections=20, pool_maxsize=50, max_retries=Retry(total=0, backoff_factor=0))
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
         self.results = []
     
     def log_result(self, test_name: str, success: bool, message: str = ""):
@@ -39,11 +82,12 @@ class AppTester:
     def wait_for_service(self, max_wait: int = 30) -> bool:
         """等待服务启动"""
         print(f"⏳ 等待服务启动 (最多等待 {max_wait} 秒)...")
-        start_time = time.time()
+        deadline = time.monotonic() + max_wait
+        attempt = 0
         
-        while time.time() - start_time < max_wait:
+        while time.monotonic() < deadline:
             try:
-                response = self.session.get(f"{self.base_url}/health", timeout=1)
+                response = self.session.get(self.url_health, timeout=1)
                 if response.status_code == 200:
                     print("✅ 服务已启动")
                     return True
@@ -51,18 +95,21 @@ class AppTester:
                 pass
             
             print(".", end="", flush=True)
-            time.sleep(1)
+            # 指数退避（50ms 起，上限 1s）+ 全抖动：服务很快就绪时不必等满 1 秒
+            delay = min(1.0, 0.05 * (2 ** attempt))
+            time.sleep(random.uniform(0, delay))
+            attempt += 1
         
         print("\n❌ 服务启动超时")
         return False
     
-    def test_health_check(self) -> bool:
+    async def test_health_check(self, client: httpx.AsyncClient) -> bool:
         """测试健康检查接口"""
         print("\n🔍 测试健康检查接口...")
         try:
-            response = self.session.get(f"{self.base_url}/health")
+            response = await client.get("/health")
             if response.status_code == 200:
-                data = response.json()
+                data = orjson.loads(response.content)
                 self.log_result("健康检查", True, f"状态: {data.get('status')}")
                 return True
             else:
@@ -72,13 +119,13 @@ class AppTester:
             self.log_result("健康检查", False, f"异常: {str(e)}")
             return False
     
-    def test_root_endpoint(self) -> bool:
+    async def test_root_endpoint(self, client: httpx.AsyncClient) -> bool:
         """测试根路径接口"""
         print("\n🔍 测试根路径接口...")
         try:
-            response = self.session.get(self.base_url)
+            response = await client.get("/")
             if response.status_code == 200:
-                data = response.json()
+                data = orjson.loads(response.content)
                 self.log_result("根路径访问", True, data.get("message", ""))
                 return True
             else:
@@ -88,11 +135,11 @@ class AppTester:
             self.log_result("根路径访问", False, f"异常: {str(e)}")
             return False
     
-    def test_api_docs(self) -> bool:
+    async def test_api_docs(self, client: httpx.AsyncClient) -> bool:
         """测试 API 文档访问"""
         print("\n🔍 测试 API 文档...")
         try:
-            response = self.session.get(f"{self.base_url}/docs")
+            response = await client.get("/docs")
             if response.status_code == 200:
                 self.log_result("API 文档访问", True)
                 return True
@@ -103,13 +150,19 @@ class AppTester:
             self.log_result("API 文档访问", False, f"异常: {str(e)}")
             return False
     
-    def test_openapi_schema(self) -> bool:
+    async def test_openapi_schema(self, client: httpx.AsyncClient) -> bool:
         """测试 OpenAPI Schema"""
         print("\n🔍 测试 OpenAPI Schema...")
         try:
-            response = self.session.get(f"{self.base_url}/openapi.json")
+            # 携带上次的 ETag 做条件请求，文档未变化时服务端返回 304，不重复传输
+            headers = {"If-None-Match": self.openapi_etag} if self.openapi_etag else None
+            response = await client.get("/openapi.json", headers=headers)
+            if response.status_code == 304:
+                self.log_result("OpenAPI Schema", True, "未变化 (304)")
+                return True
             if response.status_code == 200:
-                schema = response.json()
+                self.openapi_etag = response.headers.get("etag")
+                schema = orjson.loads(response.content)
                 title = schema.get("info", {}).get("title", "Unknown")
                 version = schema.get("info", {}).get("version", "Unknown")
                 self.log_result("OpenAPI Schema", True, f"{title} v{version}")
@@ -121,12 +174,12 @@ class AppTester:
             self.log_result("OpenAPI Schema", False, f"异常: {str(e)}")
             return False
     
-    def test_inventory_routes_exist(self) -> bool:
+    async def test_inventory_routes_exist(self, client: httpx.AsyncClient) -> bool:
         """测试库存路由是否存在"""
         print("\n🔍 测试库存路由注册...")
         try:
             # 测试一个不存在的商品ID，应该返回404而不是405
-            response = self.session.get(f"{self.base_url}{API_PREFIX}/inventory/stock/999999")
+            response = await client.get(STOCK_PROBE_PATH)
             
             if response.status_code in [200, 404, 500]:
                 self.log_result("库存路由注册", True, f"状态码: {response.status_code}")
@@ -141,12 +194,12 @@ class AppTester:
             self.log_result("库存路由注册", False, f"异常: {str(e)}")
             return False
     
-    def test_cors_headers(self) -> bool:
+    async def test_cors_headers(self, client: httpx.AsyncClient) -> bool:
         """测试 CORS 头部"""
         print("\n🔍 测试 CORS 支持...")
         try:
-            response = self.session.get(f"{self.base_url}/health")
-            cors_header = response.headers.get('access-control-allow-origin')
+            response = await client.get("/health")
+            cors_header = response.headers.get(CORS_HEADER_KEY)
             if cors_header is not None:
                 self.log_result("CORS 支持", True, f"Origin: {cors_header}")
                 return True
@@ -157,7 +210,7 @@ class AppTester:
             self.log_result("CORS 支持", False, f"异常: {str(e)}")
             return False
     
-    def test_pydantic_schemas(self) -> bool:
+    async def test_pydantic_schemas(self, client: httpx.AsyncClient) -> bool:
         """测试 Pydantic 模型"""
         print("\n🔍 测试 Pydantic 模型...")
         try:
@@ -194,7 +247,7 @@ class AppTester:
             self.log_result("Pydantic 模型", False, f"模型测试失败: {str(e)}")
             return False
     
-    def test_openapi_documentation(self) -> bool:
+    async def test_openapi_documentation(self, client: httpx.AsyncClient) -> bool:
         """测试 OpenAPI 文档完整性"""
         print("\n🔍 测试 OpenAPI 文档完整性...")
         try:
@@ -244,6 +297,22 @@ class AppTester:
             self.log_result("OpenAPI 文档", False, f"文档测试失败: {str(e)}")
             return False
     
+    def http_probes(self) -> List:
+        """需要访问服务的 HTTP 探测项"""
+        return [
+            self.test_health_check,
+            self.test_root_endpoint,
+            self.test_api_docs,
+            self.test_openapi_schema,
+            self.test_inventory_routes_exist,
+            self.test_cors_headers,
+        ]
+    
+    async def _run_tests(self, tests: List) -> List[bool]:
+        """在同一事件循环内并发执行所有测试，共用一个异步客户端的连接池"""
+        async with httpx.AsyncClient(base_url=self.base_url, timeout=2.0, transport=self.transport) as client:
+            return await asyncio.gather(*(test_func(client) for test_func in tests))
+    
     def run_all_tests(self) -> Dict[str, Any]:
         """运行所有测试"""
         print("🚀 FastAPI Mall 应用综合测试开始")
@@ -259,52 +328,51 @@ class AppTester:
             }
         
         # 执行各项测试
-        tests = [
-            self.test_health_check,
-            self.test_root_endpoint,
-            self.test_api_docs,
-            self.test_openapi_schema,
-            self.test_inventory_routes_exist,
-            self.test_cors_headers,
+        tests = self.http_probes() + [
             self.test_pydantic_schemas,
             self.test_openapi_documentation
         ]
         
-        passed = 0
-        for test_func in tests:
-            if test_func():
-                passed += 1
-            time.sleep(0.3)  # 避免请求过于频繁
+        passed = sum(1 for ok in asyncio.run(self._run_tests(tests)) if ok)
         
         # 生成测试报告
         total = len(tests)
         success_rate = (passed / total) * 100 if total > 0 else 0
         
-        print("\n" + "=" * 60)
-        print(f"📊 测试结果汇总: {passed}/{total} 通过 ({success_rate:.1f}%)")
+        # 报告先拼接成整段文本，最后一次写出
+        lines = [
+            "",
+            "=" * 60,
+            f"📊 测试结果汇总: {passed}/{total} 通过 ({success_rate:.1f}%)",
+        ]
         
         if passed == total:
-            print("🎉 所有测试通过！应用运行正常")
+            lines.append("🎉 所有测试通过！应用运行正常")
             status = "SUCCESS"
         elif passed >= total * 0.8:
-            print("⚠️  大部分测试通过，应用基本可用")
+            lines.append("⚠️  大部分测试通过，应用基本可用")
             status = "PARTIAL_SUCCESS"
         else:
-            print("❌ 多个测试失败，请检查应用状态")
+            lines.append("❌ 多个测试失败，请检查应用状态")
             status = "FAILURE"
         
-        print("\n📋 详细结果:")
+        lines += ["", "📋 详细结果:"]
         for result in self.results:
             icon = "✅" if result["success"] else "❌"
-            print(f"  {icon} {result['test']}")
+            lines.append(f"  {icon} {result['test']}")
             if result["message"]:
-                print(f"     {result['message']}")
+                lines.append(f"     {result['message']}")
         
-        print("\n💡 访问信息:")
-        print(f"   📚 API 文档: {self.base_url}/docs")
-        print(f"   🏥 健康检查: {self.base_url}/health")
-        print(f"   🏠 首页: {self.base_url}/")
-        print(f"   📡 OpenAPI: {self.base_url}/openapi.json")
+        lines += [
+            "",
+            "💡 访问信息:",
+            f"   📚 API 文档: {self.base_url}/docs",
+            f"   🏥 健康检查: {self.url_health}",
+            f"   🏠 首页: {self.base_url}/",
+            f"   📡 OpenAPI: {self.base_url}/openapi.json",
+        ]
+        sys.stdout.write("\n".join(lines) + "\n")
+        sys.stdout.flush()
         
         return {
             "success": status in ["SUCCESS", "PARTIAL_SUCCESS"],
@@ -315,6 +383,26 @@ class AppTester:
             "results": self.results
         }
 
+@pytest.fixture
+def app_tester(request):
+    """默认回放预置响应；传入 --integration 时探测真实服务"""
+    if not request.config.getoption("--integration"):
+        return AppTester(BASE_URL, transport=canned_transport())
+    
+    tester = AppTester(BASE_URL)
+    if not tester.wait_for_service():
+        pytest.skip(f"服务未启动: {BASE_URL}")
+    return tester
+
+
+def test_http_probes(app_tester):
+    """HTTP 冒烟探测：健康检查、首页、文档、OpenAPI、库存路由、CORS"""
+    results = asyncio.run(app_tester._run_tests(app_tester.http_probes()))
+    
+    failed = [r for r in app_tester.results if not r["success"]]
+    assert all(results), failed
+
+
 def main():
     """主函数"""
     # 支持自定义基础URL
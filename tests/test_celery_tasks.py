@@ -1,12 +1,18 @@
 """Celery task unit tests - using real database"""
 import pytest
 from datetime import datetime, timedelta
+from unittest.mock import patch
 import uuid
 
+from sqlalchemy import event, insert
+
 from tasks.inventory_tasks import (
     process_reservation,
     cleanup_expired_reservations
 )
+from app.core.redis import redis_client
+from app.db.session import engine
+from app.services.inventory_service import get_global_cache_service
 from app.models.product import Product
 from app.models.product_stocks import ProductStock
 from app.models.inventory_reservations import InventoryReservation, ReservationStatus
@@ -15,31 +21,43 @@ from app.models.inventory_reservations import InventoryReservation, ReservationS
 class TestInventoryTasks:
     """Inventory Celery task test class - using real database"""
 
-    def test_process_reservation_success(self, real_db_session, real_redis):
+    @pytest.fixture
+    def make_product_stock(self, real_db_session):
+        """Factory fixture: create products with WH01 stock, committed in one transaction
+
+        Returns a callable taking a list of (sku, available_stock, reserved_stock)
+        and returning the matching list of (product, stock).
+        """
+        def _make(specs):
+            products = [Product(sku=sku, name=f"Test Product {sku}") for sku, _, _ in specs]
+            real_db_session.add_all(products)
+            real_db_session.flush()
+
+            stocks = [
+                ProductStock(
+                    warehouse_id="WH01",
+                    product_id=product.id,
+                    available_stock=available,
+                    reserved_stock=reserved
+                )
+                for product, (_, available, reserved) in zip(products, specs)
+            ]
+            real_db_session.add_all(stocks)
+            real_db_session.commit()
+            return list(zip(products, stocks))
+
+        return _make
+
+    def test_process_reservation_success(self, real_db_session, real_redis, make_product_stock):
         """Test successful reservation processing"""
         unique_sku = f"TEST_TASK_{uuid.uuid4().hex[:8]}"
         unique_order_id = f"ORDER_TASK_{uuid.uuid4().hex[:8]}"
         
         # Create products and stock
-        product1 = Product(sku=unique_sku + "_1", name="Test Product 1")
-        product2 = Product(sku=unique_sku + "_2", name="Test Product 2")
-        real_db_session.add_all([product1, product2])
-        real_db_session.flush()
-        
-        stock1 = ProductStock(
-            warehouse_id="WH01",
-            product_id=product1.id,
-            available_stock=50,
-            reserved_stock=0
-        )
-        stock2 = ProductStock(
-            warehouse_id="WH01",
-            product_id=product2.id,
-            available_stock=30,
-            reserved_stock=0
-        )
-        real_db_session.add_all([stock1, stock2])
-        real_db_session.commit()
+        (product1, stock1), (product2, stock2) = make_product_stock([
+            (unique_sku + "_1", 50, 0),
+            (unique_sku + "_2", 30, 0),
+        ])
         
         # Execute task
         result = process_reservation(unique_order_id, [
@@ -65,24 +83,13 @@ class TestInventoryTasks:
         ).all()
         assert len(reservations) == 2
 
-    def test_process_reservation_exception(self, real_db_session, real_redis):
+    def test_process_reservation_exception(self, real_db_session, real_redis, make_product_stock):
         """Test reservation with insufficient stock"""
         unique_sku = f"TEST_TASK_ERR_{uuid.uuid4().hex[:8]}"
         unique_order_id = f"ORDER_TASK_ERR_{uuid.uuid4().hex[:8]}"
         
         # Create product and stock (insufficient)
-        product = Product(sku=unique_sku, name="Test Product")
-        real_db_session.add(product)
-        real_db_session.flush()
-        
-        stock = ProductStock(
-            warehouse_id="WH01",
-            product_id=product.id,
-            available_stock=1,
-            reserved_stock=0
-        )
-        real_db_session.add(stock)
-        real_db_session.commit()
+        [(product, stock)] = make_product_stock([(unique_sku, 1, 0)])
         
         # Try to reserve more than available, should raise exception
         from fastapi import HTTPException
@@ -93,23 +100,12 @@ class TestInventoryTasks:
         
         assert "库存不足" in str(exc_info.value) or "预占失败" in str(exc_info.value)
 
-    def test_cleanup_expired_reservations_success(self, real_db_session, real_redis):
+    def test_cleanup_expired_reservations_success(self, real_db_session, real_redis, make_product_stock):
         """Test successful cleanup of expired reservations"""
         unique_sku = f"TEST_CLEANUP_{uuid.uuid4().hex[:8]}"
         
         # Create product and stock
-        product = Product(sku=unique_sku, name="Test Product")
-        real_db_session.add(product)
-        real_db_session.flush()
-        
-        stock = ProductStock(
-            warehouse_id="WH01",
-            product_id=product.id,
-            available_stock=50,
-            reserved_stock=10
-        )
-        real_db_session.add(stock)
-        real_db_session.commit()
+        [(product, stock)] = make_product_stock([(unique_sku, 50, 10)])
         
         # Create expired reservation
         expired_reservation = InventoryReservation(
@@ -123,11 +119,15 @@ class TestInventoryTasks:
         real_db_session.add(expired_reservation)
         real_db_session.commit()
         
+        # Seed the matching Redis reservation so cleanup can claim it
+        real_redis.sadd(f"reservation:WH01:{product.id}", expired_reservation.order_id)
+        real_redis.hset(f"reservation_order:{expired_reservation.order_id}", f"WH01:{product.id}", 5)
+        
         # Execute cleanup task
         result = cleanup_expired_reservations(batch_size=100)
         
         # Verify result
-        assert "成功清理" in result or "cleaned" in result.lower()
+        assert result == "成功清理 1 条过期预占记录"
         
         # Refresh session to see changes from other session
         real_db_session.expire_all()
@@ -139,23 +139,104 @@ class TestInventoryTasks:
         print(f"Found reservation after cleanup: {deleted_reservation}, status: {deleted_reservation.status}")
         assert deleted_reservation.status == ReservationStatus.RELEASED
 
-    def test_cleanup_expired_reservations_no_expired(self, real_db_session, real_redis):
-        """Test cleanup when no expired reservations exist"""
-        unique_sku = f"TEST_NOT_EXPIRED_{uuid.uuid4().hex[:8]}"
-        
-        # Create product and stock
-        product = Product(sku=unique_sku, name="Test Product")
-        real_db_session.add(product)
-        real_db_session.flush()
+    def test_cleanup_expired_reservations_keeps_unclaimed(self, real_db_session, real_redis, make_product_stock):
+        """Test expired reservations already confirmed in Redis stay RESERVED for the pending CONFIRM event"""
+        unique_sku = f"TEST_CLEANUP_CONFIRMED_{uuid.uuid4().hex[:8]}"
+        [(product, stock)] = make_product_stock([(unique_sku, 50, 5)])
         
-        stock = ProductStock(
+        # Confirmed in Redis (no longer in the reservation set), Kafka event not consumed yet
+        confirmed_reservation = InventoryReservation(
             warehouse_id="WH01",
+            order_id=f"ORDER_CONFIRMED_{uuid.uuid4().hex[:8]}",
             product_id=product.id,
-            available_stock=50,
-            reserved_stock=10
+            quantity=5,
+            status=ReservationStatus.RESERVED,
+            expired_at=datetime.utcnow() - timedelta(minutes=10)
         )
-        real_db_session.add(stock)
+        real_db_session.add(confirmed_reservation)
+        real_db_session.commit()
+        real_redis.set(f"stock:available:WH01:{product.id}", 45)
+        
+        try:
+            result = cleanup_expired_reservations(batch_size=100)
+            
+            assert result == "成功清理 0 条过期预占记录"
+            real_db_session.expire_all()
+            assert real_db_session.get(InventoryReservation, confirmed_reservation.id).status == ReservationStatus.RESERVED
+            assert real_db_session.get(ProductStock, stock.id).reserved_stock == 5
+            # Stock sold to the confirmed order is not handed back
+            assert real_redis.get(f"stock:available:WH01:{product.id}") == "45"
+        finally:
+            # Remove the still-RESERVED row so later cleanup tests do not pick it up
+            real_db_session.rollback()
+            real_db_session.query(InventoryReservation).filter(
+                InventoryReservation.id == confirmed_reservation.id
+            ).delete()
+            real_db_session.commit()
+
+    @pytest.mark.parametrize("reservation_count", [1, 100], ids=["single", "full_batch"])
+    def test_cleanup_expired_reservations_bulk_round_trips(
+        self, real_db_session, real_redis, make_product_stock, reservation_count
+    ):
+        """Test cleanup cost does not grow with the number of expired reservations
+
+        A full batch is one bulk UPDATE ... RETURNING, one stock UPDATE, one log INSERT
+        and a single Lua call; the trailing empty batch adds only the transaction-local
+        SELECT set_config(...) and an empty UPDATE.
+        """
+        unique_sku = f"TEST_CLEANUP_BULK_{uuid.uuid4().hex[:8]}"
+        pairs = make_product_stock([
+            (f"{unique_sku}_{i}", 50, 1) for i in range(reservation_count)
+        ])
+
+        reservations = [
+            {
+                "warehouse_id": "WH01",
+                "order_id": f"ORDER_BULK_{uuid.uuid4().hex[:8]}",
+                "product_id": product.id,
+                "quantity": 1,
+                "status": ReservationStatus.RESERVED,
+                "expired_at": datetime.utcnow() - timedelta(minutes=10),
+            }
+            for product, _ in pairs
+        ]
+        real_db_session.execute(insert(InventoryReservation), reservations)
         real_db_session.commit()
+
+        # Seed the matching Redis reservations so every row is claimed and restored
+        pipe = real_redis.pipeline(transaction=False)
+        for r in reservations:
+            pipe.sadd(f"reservation:WH01:{r['product_id']}", r["order_id"])
+            pipe.hset(f"reservation_order:{r['order_id']}", f"WH01:{r['product_id']}", 1)
+        pipe.execute()
+
+        statements = []
+
+        def count_statement(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        cache_service = get_global_cache_service(redis_client)
+        event.listen(engine, "before_cursor_execute", count_statement)
+        try:
+            with patch.object(
+                cache_service, "atomic_release_expired", wraps=cache_service.atomic_release_expired
+            ) as release_expired:
+                result = cleanup_expired_reservations(batch_size=100)
+        finally:
+            event.remove(engine, "before_cursor_execute", count_statement)
+
+        assert result == f"成功清理 {reservation_count} 条过期预占记录"
+        release_expired.assert_called_once()
+        # Full batch: set_config, UPDATE ... RETURNING, stock UPDATE, log INSERT,
+        # then set_config + empty UPDATE
+        assert len(statements) <= 6
+
+    def test_cleanup_expired_reservations_no_expired(self, real_db_session, real_redis, make_product_stock):
+        """Test cleanup when no expired reservations exist"""
+        unique_sku = f"TEST_NOT_EXPIRED_{uuid.uuid4().hex[:8]}"
+        
+        # Create product and stock
+        [(product, stock)] = make_product_stock([(unique_sku, 50, 10)])
         
         # Create valid (non-expired) reservation
         valid_reservation = InventoryReservation(
@@ -1,5 +1,6 @@
 """Dependency injection unit tests - using real database"""
 import pytest
+from unittest.mock import patch
 from sqlalchemy.orm import Session
 from redis import Redis
 
@@ -37,19 +38,25 @@ class TestDependencies:
         assert value == "test_value"
         real_redis.delete("test_dep_key")
 
-    def test_get_inventory_service(self, real_db_session, real_redis):
-        """Test inventory service dependency injection - using real dependencies"""
-        # Call InventoryService constructor directly
-        service = InventoryService(real_db_session, real_redis)
-        
-        assert isinstance(service, InventoryService)
-        assert service.db == real_db_session
-        assert service.redis == real_redis
+    def test_get_inventory_service(self):
+        """Test inventory service dependency wiring (construction itself is patched out)"""
+        # Singleton is cached; clear before and after so the patched class is used only here
+        get_inventory_service.cache_clear()
+        try:
+            # autospec freezes the attribute set and constructor signature, so typos fail loudly
+            with patch("app.core.dependencies.InventoryService", autospec=True) as mock_service_cls:
+                service = get_inventory_service()
+                
+                assert service is mock_service_cls.return_value
+                assert service is get_inventory_service()
+                mock_service_cls.assert_called_once_with(get_redis())
+        finally:
+            get_inventory_service.cache_clear()
 
     def test_get_inventory_service_with_real_deps(self, real_db_session, real_redis):
         """Test service creation with real dependencies"""
         # Create service instance
-        service = InventoryService(real_db_session, real_redis)
+        service = InventoryService(real_redis)
         
         # Verify service works correctly
         from app.models.product import Product
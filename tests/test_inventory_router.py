@@ -1,48 +1,59 @@
 """库存路由单元测试 - 使用真实数据库和 FastAPI TestClient"""
+import importlib.util
+
+import httpx
 import pytest
 from fastapi import HTTPException
 from fastapi.testclient import TestClient
 
 from app.main import app
+from app.core.errors import InventoryErrorCode
 from app.models.product import Product
 from app.models.product_stocks import ProductStock
 from app.models.inventory_reservations import InventoryReservation, ReservationStatus
 from datetime import datetime, timedelta
 
 
+# 协作式并发的异步测试依赖 pytest-asyncio-cooperative，与 pytest-xdist 一样是可选插件，
+# 未安装时跳过，直接运行 pytest 不会因为 async def 测试无法执行而失败
+requires_cooperative = pytest.mark.skipif(
+    importlib.util.find_spec("pytest_asyncio_cooperative") is None,
+    reason="pytest-asyncio-cooperative 未安装",
+)
+
+
+def async_client() -> httpx.AsyncClient:
+    """进程内 ASGI 异步客户端，不经过网络，协作式并发测试可同时使用"""
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://testserver")
+
+
 class TestInventoryRouter:
     """库存路由测试类 - 使用真实数据库"""
 
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def client(self):
-        """创建测试客户端"""
-        return TestClient(app)
+        """创建测试客户端（模块内共用，应用启动/关闭只执行一次）"""
+        with TestClient(app) as c:
+            yield c
 
-    @pytest.fixture
-    def test_product(self, real_db_session):
-        """创建或获取测试商品和库存"""
-        # 先尝试查询是否已存在
-        product = real_db_session.query(Product).filter(
-            Product.sku == "ROUTER_TEST_001"
-        ).first()
-        
-        if not product:
-            # 不存在才创建
-            product = Product(sku="ROUTER_TEST_001", name="路由测试商品")
-            real_db_session.add(product)
-            real_db_session.flush()
+    @pytest.fixture(scope="module")
+    def router_product(self, real_session_factory):
+        """创建或获取测试商品和库存（模块内只查询/创建一次）"""
+        db = real_session_factory()
+        try:
+            # 先尝试查询是否已存在
+            product = db.query(Product).filter(
+                Product.sku == "ROUTER_TEST_001"
+            ).first()
             
-            stock = ProductStock(
-                warehouse_id="WH01",
-                product_id=product.id,
-                available_stock=100,
-                reserved_stock=0
-            )
-            real_db_session.add(stock)
-            real_db_session.commit()
-        else:
-            # 如果存在，确保有对应的库存记录
-            stock = real_db_session.query(ProductStock).filter(
+            if not product:
+                # 不存在才创建
+                product = Product(sku="ROUTER_TEST_001", name="路由测试商品")
+                db.add(product)
+                db.flush()
+            
+            # 确保有对应的库存记录
+            stock = db.query(ProductStock).filter(
                 ProductStock.product_id == product.id,
                 ProductStock.warehouse_id == "WH01"
             ).first()
@@ -53,10 +64,20 @@ class TestInventoryRouter:
                     available_stock=100,
                     reserved_stock=0
                 )
-                real_db_session.add(stock)
-                real_db_session.commit()
-        
-        yield product
+                db.add(stock)
+            db.commit()
+            
+            # 加载属性后脱离会话，供模块内各测试只读使用
+            db.refresh(product)
+            db.expunge(product)
+            yield product
+        finally:
+            db.close()
+
+    @pytest.fixture
+    def test_product(self, router_product, real_db_session):
+        """每个测试共用模块级商品，结束后清理本测试产生的预占记录"""
+        yield router_product
         
         # 清理（只清理预占记录，保留商品和库存）
         real_db_session.query(InventoryReservation).filter(
@@ -64,41 +85,44 @@ class TestInventoryRouter:
         ).delete()
         real_db_session.commit()
 
-    def test_reserve_stock_success(self, client, test_product, real_redis):
-        """测试成功预占库存"""
+    @pytest.mark.parametrize(
+        "quantity,order_id,expected_status,expected_message",
+        [
+            (2, "ROUTER_TEST_ORDER_001", 200, "预占成功"),
+            (200, "ROUTER_TEST_ORDER_002", 400, "库存不足"),  # 超过可用库存
+        ],
+        ids=["success", "insufficient"],
+    )
+    def test_reserve_stock(self, client, test_product, real_redis, quantity, order_id, expected_status, expected_message):
+        """测试预占库存（成功 / 库存不足）"""
+        # 预占只读写 Redis，先写入可用库存
+        real_redis.set(f"stock:available:WH01:{test_product.id}", 100)
+        
         response = client.post("/api/v1/inventory/reserve", params={
             "warehouse_id": "WH01",
             "product_id": test_product.id,
-            "quantity": 2,
-            "order_id": "ROUTER_TEST_ORDER_001"
+            "quantity": quantity,
+            "order_id": order_id
         })
         
         # 打印详细响应信息以便调试
         print(f"\nResponse Status: {response.status_code}")
         print(f"Response Body: {response.text}")
         
-        assert response.status_code == 200
-        data = response.json()
-        assert data["success"] is True
-        assert data["message"] == "预占成功"
-
-    def test_reserve_stock_insufficient(self, client, test_product):
-        """测试库存不足"""
-        response = client.post("/api/v1/inventory/reserve", params={
-            "warehouse_id": "WH01",
-            "product_id": test_product.id,
-            "quantity": 200,  # 超过可用库存
-            "order_id": "ROUTER_TEST_ORDER_002"
-        })
-        
-        print(f"\nInsufficient stock - Status: {response.status_code}, Body: {response.text}")
-        
-        assert response.status_code == 400
+        assert response.status_code == expected_status
         data = response.json()
-        assert "库存不足" in data.get("message", "") or "库存不足" in data.get("detail", "")
+        if expected_status == 200:
+            assert data["success"] is True
+            assert data["message"] == expected_message
+        else:
+            assert expected_message in data.get("message", "") or expected_message in data.get("detail", "")
+            assert data["code"] == InventoryErrorCode.INSUFFICIENT_STOCK
 
-    def test_reserve_stock_duplicate(self, client, test_product):
+    def test_reserve_stock_duplicate(self, client, test_product, real_redis):
         """测试重复预占（幂等性）"""
+        # 预占只读写 Redis，先写入可用库存
+        real_redis.set(f"stock:available:WH01:{test_product.id}", 100)
+        
         # 第一次预占
         response1 = client.post("/api/v1/inventory/reserve", params={
             "warehouse_id": "WH01",
@@ -121,35 +145,42 @@ class TestInventoryRouter:
         data = response2.json()
         assert data.get("success") == True
 
-    def test_confirm_stock_success(self, client, test_product, real_db_session):
-        """测试成功确认库存"""
-        # 先预占
-        client.post("/api/v1/inventory/reserve", params={
-            "warehouse_id": "WH01",
-            "product_id": test_product.id,
-            "quantity": 2,
-            "order_id": "ROUTER_TEST_ORDER_004"
-        })
+    @pytest.mark.parametrize(
+        "order_id,reserve_first,expected_status,expected_message",
+        [
+            ("ROUTER_TEST_ORDER_004", True, 200, "确认成功"),
+            ("NONEXISTENT_ORDER", False, 404, "未找到有效的预占记录"),
+        ],
+        ids=["success", "not_found"],
+    )
+    def test_confirm_stock(self, client, test_product, real_redis, order_id, reserve_first, expected_status, expected_message):
+        """测试确认库存（成功 / 订单不存在）"""
+        if reserve_first:
+            # 先写入 Redis 可用库存再预占
+            real_redis.set(f"stock:available:WH01:{test_product.id}", 100)
+            reserve_response = client.post("/api/v1/inventory/reserve", params={
+                "warehouse_id": "WH01",
+                "product_id": test_product.id,
+                "quantity": 2,
+                "order_id": order_id
+            })
+            assert reserve_response.status_code == 200
         
         # 确认
-        response = client.post(f"/api/v1/inventory/confirm/ROUTER_TEST_ORDER_004")
+        response = client.post(f"/api/v1/inventory/confirm/{order_id}")
         
-        assert response.status_code == 200
+        assert response.status_code == expected_status
         data = response.json()
-        assert data["success"] is True
-        assert data["message"] == "确认成功"
-
-    def test_confirm_stock_not_found(self, client):
-        """测试确认不存在的订单"""
-        response = client.post("/api/v1/inventory/confirm/NONEXISTENT_ORDER")
-        
-        assert response.status_code == 404
-        data = response.json()
-        assert "未找到有效的预占记录" in data.get("message", "") or "未找到有效的预占记录" in data.get("detail", "")
+        if expected_status == 200:
+            assert data["success"] is True
+            assert data["message"] == expected_message
+        else:
+            assert expected_message in data.get("message", "") or expected_message in data.get("detail", "")
 
-    def test_release_stock_success(self, client, test_product, real_db_session):
+    def test_release_stock_success(self, client, test_product, real_redis):
         """测试成功释放库存"""
-        # 先预占
+        # 先写入 Redis 可用库存再预占
+        real_redis.set(f"stock:available:WH01:{test_product.id}", 100)
         reserve_response = client.post("/api/v1/inventory/reserve", params={
             "warehouse_id": "WH01",
             "product_id": test_product.id,
@@ -157,6 +188,7 @@ class TestInventoryRouter:
             "order_id": "ROUTER_TEST_ORDER_005"
         })
         print(f"\nReserve response: {reserve_response.status_code} - {reserve_response.text}")
+        assert reserve_response.status_code == 200
         
         # 确认释放
         response = client.post(f"/api/v1/inventory/release/ROUTER_TEST_ORDER_005")
@@ -166,31 +198,42 @@ class TestInventoryRouter:
         data = response.json()
         assert data["success"] is True
         assert data["message"] == "释放成功"
+        # 预占的库存已归还
+        assert real_redis.get(f"stock:available:WH01:{test_product.id}") == "100"
 
-    def test_get_stock_success(self, client, test_product):
-        """测试查询库存成功"""
-        response = client.get(f"/api/v1/inventory/stock/{test_product.id}?warehouse_id=WH01")
+    @requires_cooperative
+    @pytest.mark.asyncio_cooperative
+    async def test_get_stock_success(self, test_product):
+        """测试查询库存成功（只读，与其他只读测试并发执行）"""
+        async with async_client() as client:
+            response = await client.get(f"/api/v1/inventory/stock/{test_product.id}?warehouse_id=WH01")
         
         assert response.status_code == 200
         data = response.json()
         assert data["success"] is True
         assert data["product_id"] == test_product.id
 
-    def test_get_stock_not_found(self, client):
-        """测试查询不存在的商品"""
-        response = client.get("/api/v1/inventory/stock/999999?warehouse_id=WH01")
+    @requires_cooperative
+    @pytest.mark.asyncio_cooperative
+    async def test_get_stock_not_found(self):
+        """测试查询不存在的商品（只读，与其他只读测试并发执行）"""
+        async with async_client() as client:
+            response = await client.get("/api/v1/inventory/stock/999999?warehouse_id=WH01")
         
         assert response.status_code == 200
         data = response.json()
         # 返回空库存信息
         assert data["success"] is True
 
-    def test_batch_get_stocks(self, client, test_product):
-        """测试批量查询库存"""
-        response = client.post(
-            f"/api/v1/inventory/stock/batch?warehouse_id=WH01",
-            json={"product_ids": [test_product.id]}
-        )
+    @requires_cooperative
+    @pytest.mark.asyncio_cooperative
+    async def test_batch_get_stocks(self, test_product):
+        """测试批量查询库存（只读，与其他只读测试并发执行）"""
+        async with async_client() as client:
+            response = await client.post(
+                f"/api/v1/inventory/stock/batch?warehouse_id=WH01",
+                json={"product_ids": [test_product.id]}
+            )
         
         assert response.status_code == 200
         data = response.json()
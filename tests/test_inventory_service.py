@@ -1,11 +1,12 @@
 """库存服务单元测试 - 使用真实数据库"""
 import pytest
+from unittest.mock import Mock, patch
 from fastapi import HTTPException
-from datetime import datetime, timedelta
 
+from app.core.errors import InventoryErrorCode
 from app.services.inventory_service import InventoryService
+from app.services.inventory_cache import MGET_CHUNK_SIZE
 from app.models.product_stocks import ProductStock
-from app.models.inventory_reservations import InventoryReservation, ReservationStatus
 from app.models.inventory_logs import InventoryLog, ChangeType
 from app.models.product import Product
 
@@ -13,13 +14,18 @@ from app.models.product import Product
 class TestInventoryService:
     """库存服务测试类 - 使用真实数据库"""
 
-    def test_init_service(self, real_db_session, real_redis):
+    @pytest.fixture(scope="class")
+    def service(self, real_redis_client):
+        """整个测试类共用一个库存服务（服务无状态，只持有 Redis 客户端，与进程内单例一致）"""
+        redis_client, _ = real_redis_client
+        return InventoryService(redis_client)
+
+    def test_init_service(self, service, real_redis):
         """测试服务初始化"""
-        service = InventoryService(real_db_session, real_redis)
-        assert service.db == real_db_session
-        assert service.redis == real_redis
+        assert service.redis is real_redis
+        assert service.cache_service is not None
 
-    def test_get_product_stock_cache_hit(self, real_db_session, real_redis):
+    def test_get_product_stock_cache_hit(self, real_db_session, real_redis, service):
         """测试缓存命中情况下的库存查询"""
         import uuid
         unique_sku = f"TEST_CACHE_HIT_{uuid.uuid4().hex[:8]}"
@@ -42,13 +48,12 @@ class TestInventoryService:
         real_redis.setex("stock:available:WH01:50", 300, 50)
         
         # 查询 - 应该命中缓存
-        service = InventoryService(real_db_session, real_redis)
         result = service.get_product_stock("WH01", product.id)
         
         # 由于 product.id 不同，缓存未命中，从数据库返回
         assert result >= 0
 
-    def test_get_product_stock_cache_miss(self, real_db_session, real_redis):
+    def test_get_product_stock_cache_miss(self, real_db_session, real_redis, service):
         """测试缓存未命中情况下的库存查询"""
         import uuid
         unique_sku = f"TEST_CACHE_MISS_{uuid.uuid4().hex[:8]}"
@@ -71,7 +76,6 @@ class TestInventoryService:
         real_redis.delete(f"stock:available:WH01:{product.id}")
         
         # 查询 - 缓存未命中，从数据库查询
-        service = InventoryService(real_db_session, real_redis)
         result = service.get_product_stock("WH01", product.id)
         
         assert result == 30
@@ -80,171 +84,95 @@ class TestInventoryService:
         cached = real_redis.get(f"stock:available:WH01:{product.id}")
         assert cached == "30"
 
-    def test_get_product_stock_no_stock_record(self, real_db_session, real_redis):
+    def test_get_product_stock_no_stock_record(self, real_db_session, real_redis, service):
         """测试商品无库存记录的情况"""
         # 清空缓存
         real_redis.delete("stock:available:WH01:999999")
         
-        service = InventoryService(real_db_session, real_redis)
         result = service.get_product_stock("WH01", 999999)
         
         assert result == 0
 
-    def test_reserve_stock_success(self, real_db_session, real_redis):
-        """测试成功预占库存"""
-        import uuid
-        unique_sku = f"TEST_RESERVE_OK_{uuid.uuid4().hex[:8]}"
+    @pytest.mark.parametrize(
+        "available_stock,existing_quantity,quantity,order_id,expected_status,expected_code",
+        [
+            (10, 0, 2, "ORDER_TEST_001", None, None),
+            (1, 0, 5, "ORDER_TEST_002", 400, InventoryErrorCode.INSUFFICIENT_STOCK),
+            (10, 2, 2, "ORDER_TEST_003", 400, InventoryErrorCode.DUPLICATE_RESERVATION),  # 同一订单已预占过该商品
+        ],
+        ids=["success", "insufficient", "duplicate"],
+    )
+    def test_reserve_stock(
+        self, real_redis, service,
+        available_stock, existing_quantity, quantity, order_id, expected_status, expected_code,
+    ):
+        """测试预占库存（成功 / 库存不足 / 重复预占）
+        
+        预占只读写 Redis，数据库由 Kafka 消费者异步同步（见消费者测试），这里只校验 Redis 状态。
+        """
+        product_id = 990001
+        stock_key = f"stock:available:WH01:{product_id}"
+        reservation_key = f"reservation:WH01:{product_id}"
+        order_key = f"reservation_order:{order_id}"
+        index_field = f"WH01:{product_id}"
+        
+        # 写入可用库存（按已预占数量扣减），已有预占时写入预占集合和订单索引
+        real_redis.set(stock_key, available_stock - existing_quantity)
+        if existing_quantity:
+            real_redis.sadd(reservation_key, order_id)
+            real_redis.hset(order_key, index_field, existing_quantity)
+        
+        if expected_status is not None:
+            with pytest.raises(HTTPException) as exc_info:
+                service.reserve_stock("WH01", product_id, quantity, order_id)
             
-        # 插入库存数据
-        product = Product(sku=unique_sku, name="测试商品 3")
-        real_db_session.add(product)
-        real_db_session.flush()
-        
-        stock = ProductStock(
-            warehouse_id="WH01",
-            product_id=product.id,
-            available_stock=10,
-            reserved_stock=0
-        )
-        real_db_session.add(stock)
-        real_db_session.commit()
-        
-        service = InventoryService(real_db_session, real_redis)
-        result = service.reserve_stock("WH01", product.id, 2, "ORDER_TEST_001")
-        
-        assert result is True
-        
-        # 验证库存扣减
-        real_db_session.refresh(stock)
-        assert stock.available_stock == 8
-        assert stock.reserved_stock == 2
-        
-        # 验证创建了预占记录
-        reservation = real_db_session.query(InventoryReservation).filter(
-            InventoryReservation.order_id == "ORDER_TEST_001"
-        ).first()
-        assert reservation is not None
-        assert reservation.quantity == 2
-        
-        # 验证缓存失效
-        cached = real_redis.get(f"stock:available:WH01:{product.id}")
-        assert cached is None
-
-    def test_reserve_stock_insufficient_stock(self, real_db_session, real_redis):
-        """测试库存不足的情况"""
-        import uuid
-        unique_sku = f"TEST_INSUFFICIENT_{uuid.uuid4().hex[:8]}"
+            assert exc_info.value.status_code == expected_status
+            assert exc_info.value.code == expected_code
             
-        # 插入库存数据
-        product = Product(sku=unique_sku, name="测试商品 4")
-        real_db_session.add(product)
-        real_db_session.flush()
-        
-        stock = ProductStock(
-            warehouse_id="WH01",
-            product_id=product.id,
-            available_stock=1,
-            reserved_stock=0
-        )
-        real_db_session.add(stock)
-        real_db_session.commit()
-        
-        service = InventoryService(real_db_session, real_redis)
+            # 失败不改变库存和预占
+            assert int(real_redis.get(stock_key)) == available_stock - existing_quantity
+            assert real_redis.sismember(reservation_key, order_id) == bool(existing_quantity)
+            if existing_quantity:
+                assert int(real_redis.hget(order_key, index_field)) == existing_quantity
+            else:
+                assert not real_redis.exists(order_key)
+            return
         
-        with pytest.raises(HTTPException) as exc_info:
-            service.reserve_stock("WH01", product.id, 5, "ORDER_TEST_002")
+        result = service.reserve_stock("WH01", product_id, quantity, order_id)
         
-        assert exc_info.value.status_code == 400
-        assert "库存不足" in str(exc_info.value.detail)
-        real_db_session.rollback()
-
-    def test_reserve_stock_duplicate_reservation(self, real_db_session, real_redis):
-        """测试重复预占的情况"""
-        import uuid
-        unique_sku = f"TEST_DUPLICATE_{uuid.uuid4().hex[:8]}"
-            
-        # 插入库存数据和预占记录
-        product = Product(sku=unique_sku, name="测试商品 5")
-        real_db_session.add(product)
-        real_db_session.flush()
-        
-        stock = ProductStock(
-            warehouse_id="WH01",
-            product_id=product.id,
-            available_stock=10,
-            reserved_stock=0
-        )
-        real_db_session.add(stock)
-        
-        # 第一次预占
-        reservation = InventoryReservation(
-            warehouse_id="WH01",
-            order_id="ORDER_TEST_003",
-            product_id=product.id,
-            quantity=2,
-            status=ReservationStatus.RESERVED,
-            expired_at=datetime.utcnow() + timedelta(minutes=15)
-        )
-        real_db_session.add(reservation)
-        real_db_session.commit()
-        
-        stock.available_stock -= 2
-        stock.reserved_stock += 2
-        real_db_session.commit()
-        
-        service = InventoryService(real_db_session, real_redis)
-        
-        with pytest.raises(HTTPException) as exc_info:
-            service.reserve_stock("WH01", product.id, 2, "ORDER_TEST_003")
+        assert result is True
         
-        assert exc_info.value.status_code == 400
-        assert "该订单已预占此商品" in str(exc_info.value.detail)
+        # 验证库存扣减、预占集合和订单索引
+        assert int(real_redis.get(stock_key)) == available_stock - quantity
+        assert real_redis.sismember(reservation_key, order_id)
+        assert int(real_redis.hget(order_key, index_field)) == quantity
 
-    def test_confirm_stock_success(self, real_db_session, real_redis):
-        """测试成功确认库存"""
-        import uuid
-        unique_sku = f"TEST_CONFIRM_OK_{uuid.uuid4().hex[:8]}"
-            
-        # 插入库存数据和预占记录
-        product = Product(sku=unique_sku, name="测试商品 6")
-        real_db_session.add(product)
-        real_db_session.flush()
+    def test_confirm_stock_success(self, real_redis, service):
+        """测试成功确认库存
         
-        stock = ProductStock(
-            warehouse_id="WH01",
-            product_id=product.id,
-            available_stock=8,
-            reserved_stock=2
-        )
-        real_db_session.add(stock)
+        确认只认领 Redis 中的预占（移出预占集合、删除订单索引），数据库由 Kafka 消费者异步同步。
+        """
+        product_id = 990002
+        stock_key = f"stock:available:WH01:{product_id}"
+        reservation_key = f"reservation:WH01:{product_id}"
+        order_key = "reservation_order:ORDER_TEST_004"
         
-        reservation = InventoryReservation(
-            warehouse_id="WH01",
-            order_id="ORDER_TEST_004",
-            product_id=product.id,
-            quantity=2,
-            status=ReservationStatus.RESERVED,
-            expired_at=datetime.utcnow() + timedelta(minutes=15)
-        )
-        real_db_session.add(reservation)
-        real_db_session.commit()
+        # 写入预占后的 Redis 状态：可用库存已扣减，预占集合和订单索引中有该订单
+        real_redis.set(stock_key, 8)
+        real_redis.sadd(reservation_key, "ORDER_TEST_004")
+        real_redis.hset(order_key, f"WH01:{product_id}", 2)
         
-        service = InventoryService(real_db_session, real_redis)
         result = service.confirm_stock("ORDER_TEST_004")
         
         assert result is True
         
-        # 验证预占状态
-        real_db_session.refresh(reservation)
-        assert reservation.status == ReservationStatus.CONFIRMED
-        
-        # 验证库存
-        real_db_session.refresh(stock)
-        assert stock.reserved_stock == 0
+        # 预占已被认领，可用库存不变（预占时已扣减）
+        assert not real_redis.sismember(reservation_key, "ORDER_TEST_004")
+        assert not real_redis.exists(order_key)
+        assert int(real_redis.get(stock_key)) == 8
 
-    def test_confirm_stock_not_found(self, real_db_session, real_redis):
+    def test_confirm_stock_not_found(self, real_db_session, real_redis, service):
         """测试未找到预占记录"""
-        service = InventoryService(real_db_session, real_redis)
         
         with pytest.raises(HTTPException) as exc_info:
             service.confirm_stock("NONEXISTENT_ORDER")
@@ -252,50 +180,31 @@ class TestInventoryService:
         assert exc_info.value.status_code == 404
         assert "未找到有效的预占记录" in str(exc_info.value.detail)
 
-    def test_release_stock_success(self, real_db_session, real_redis):
-        """测试成功释放库存"""
-        import uuid
-        unique_sku = f"TEST_RELEASE_OK_{uuid.uuid4().hex[:8]}"
-            
-        # 插入库存数据和预占记录
-        product = Product(sku=unique_sku, name="测试商品 7")
-        real_db_session.add(product)
-        real_db_session.flush()
+    def test_release_stock_success(self, real_redis, service):
+        """测试成功释放库存
         
-        stock = ProductStock(
-            warehouse_id="WH01",
-            product_id=product.id,
-            available_stock=8,
-            reserved_stock=2
-        )
-        real_db_session.add(stock)
+        释放认领 Redis 中的预占并归还可用库存，数据库由 Kafka 消费者异步同步。
+        """
+        product_id = 990003
+        stock_key = f"stock:available:WH01:{product_id}"
+        reservation_key = f"reservation:WH01:{product_id}"
+        order_key = "reservation_order:ORDER_TEST_005"
         
-        reservation = InventoryReservation(
-            warehouse_id="WH01",
-            order_id="ORDER_TEST_005",
-            product_id=product.id,
-            quantity=2,
-            status=ReservationStatus.RESERVED,
-            expired_at=datetime.utcnow() + timedelta(minutes=15)
-        )
-        real_db_session.add(reservation)
-        real_db_session.commit()
+        # 写入预占后的 Redis 状态：可用库存已扣减，预占集合和订单索引中有该订单
+        real_redis.set(stock_key, 8)
+        real_redis.sadd(reservation_key, "ORDER_TEST_005")
+        real_redis.hset(order_key, f"WH01:{product_id}", 2)
         
-        service = InventoryService(real_db_session, real_redis)
         result = service.release_stock("ORDER_TEST_005")
         
         assert result is True
         
-        # 验证预占状态
-        real_db_session.refresh(reservation)
-        assert reservation.status == ReservationStatus.RELEASED
-        
-        # 验证库存归还
-        real_db_session.refresh(stock)
-        assert stock.available_stock == 10
-        assert stock.reserved_stock == 0
+        # 预占已被认领，库存归还
+        assert not real_redis.sismember(reservation_key, "ORDER_TEST_005")
+        assert not real_redis.exists(order_key)
+        assert int(real_redis.get(stock_key)) == 10
 
-    def test_batch_get_stocks(self, real_db_session, real_redis):
+    def test_batch_get_stocks(self, real_db_session, real_redis, service):
         """测试批量获取库存"""
         import uuid
         unique_sku1 = f"TEST_BATCH_1_{uuid.uuid4().hex[:8]}"
@@ -322,8 +231,36 @@ class TestInventoryService:
         real_db_session.add_all([stock1, stock2])
         real_db_session.commit()
         
-        service = InventoryService(real_db_session, real_redis)
         result = service.batch_get_stocks("WH01", [product1.id, product2.id])
         
         assert result[product1.id] == 30
         assert result[product2.id] == 25
+
+    def test_batch_get_stocks_single_pipeline(self, real_redis, service):
+        """测试超过单条 MGET 上限的批量查询：分块 MGET 走同一个管道，只执行一次（一次网络往返）"""
+        product_ids = list(range(900001, 900001 + MGET_CHUNK_SIZE * 2 + 1))
+        cached_ids = product_ids[::2]
+        # 缓存服务是进程内单例，直接监视它实际持有的客户端
+        redis_client = service.cache_service.redis
+        redis_client.mset({f"stock:available:WH01:{pid}": 7 for pid in cached_ids})
+
+        pipes = []
+        create_pipeline = redis_client.pipeline
+
+        def spy_pipeline(*args, **kwargs):
+            pipe = create_pipeline(*args, **kwargs)
+            pipe.mget = Mock(wraps=pipe.mget)
+            pipe.execute = Mock(wraps=pipe.execute)
+            pipes.append(pipe)
+            return pipe
+
+        with patch.object(redis_client, "pipeline", side_effect=spy_pipeline), \
+                patch.object(redis_client, "mget", wraps=redis_client.mget) as direct_mget:
+            result = service.cache_service.batch_get_cached_stocks("WH01", product_ids)
+
+        assert len(pipes) == 1
+        assert pipes[0].mget.call_count == 3  # 101 个 key 按 50 拆成 3 条 MGET
+        pipes[0].execute.assert_called_once()
+        direct_mget.assert_not_called()
+        # Redis 是权威数据源，未命中返回 0，不回写缓存
+        assert result == {pid: 7 if pid in cached_ids else 0 for pid in product_ids}